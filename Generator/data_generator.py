@@ -1,102 +1,504 @@
 from faker import Faker
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 import random
-
-fake = Faker()
+import os
+import zlib
+import json
+import shutil
+import argparse
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 
 # Lista przykładowych domen
 domains = ['example.com', 'hospital.com', 'medclinic.org', 'healthcare.net']
 
+specializations = ['Cardiology', 'Neurology', 'Orthopedics', 'Pediatrics', 'Dermatology']
+
+diagnoses = [
+    'Hypertension', 'Type 2 diabetes', 'Cold', 'Pneumonia',
+    'Asthma', 'Migraine', 'Urinary tract infection', 'Depression', 'Rheumatoid arthritis',
+    'Sleep disorders', 'Heart failure', 'Alzheimers disease', 'Bronchitis'
+]
+
+treatments = [
+    'Pharmacological treatment', 'Physiotherapy', 'Psychological consultation',
+    'Surgery', 'Antibiotics', 'Anti-inflammatory drugs', 'Breathing exercises',
+    'Low-sodium diet', 'Painkillers', 'Antihistamines'
+]
+
+# Leczenie właściwe dla diagnozy - używane przy korelacji diagnoza -> leczenie
+diagnosis_treatments = {
+    'Hypertension': ['Pharmacological treatment', 'Low-sodium diet'],
+    'Type 2 diabetes': ['Pharmacological treatment', 'Low-sodium diet'],
+    'Cold': ['Antihistamines', 'Painkillers'],
+    'Pneumonia': ['Antibiotics', 'Breathing exercises'],
+    'Asthma': ['Breathing exercises', 'Antihistamines', 'Pharmacological treatment'],
+    'Migraine': ['Painkillers', 'Pharmacological treatment'],
+    'Urinary tract infection': ['Antibiotics'],
+    'Depression': ['Psychological consultation', 'Pharmacological treatment'],
+    'Rheumatoid arthritis': ['Anti-inflammatory drugs', 'Physiotherapy', 'Painkillers'],
+    'Sleep disorders': ['Psychological consultation', 'Pharmacological treatment'],
+    'Heart failure': ['Pharmacological treatment', 'Low-sodium diet', 'Surgery'],
+    'Alzheimers disease': ['Pharmacological treatment', 'Psychological consultation'],
+    'Bronchitis': ['Antibiotics', 'Breathing exercises', 'Anti-inflammatory drugs']
+}
+
+# Domyślne ziarno generatora i liczba wierszy w jednym pliku częściowym (shardzie)
+SEED = 2024
+SHARD_ROWS = 500000
+# Liczba wierszy generowanych i zapisywanych jednorazowo - ogranicza zużycie pamięci procesu
+CHUNK_ROWS = 100000
+# Formaty plików wynikowych
+OUTPUT_FORMATS = ['csv', 'parquet']
+# Kolejność tabel - wizyty odwołują się do lekarzy i pacjentów
+TABLES = ['doctors', 'patients', 'appointments']
+# Sposoby generowania: faker - wiersz po wierszu, vectorized - całe kolumny w NumPy
+METHODS = ['faker', 'vectorized']
+# Liczba imion i nazwisk wygenerowanych przez Faker, z których losowane są wartości w trybie vectorized
+FAKER_POOL_SIZE = 5000
+# Zakres dat wizyt i data odniesienia dla dat urodzenia (stałe, aby wynik nie zależał od dnia uruchomienia)
+APPOINTMENTS_START = np.datetime64('2024-01-01')
+APPOINTMENTS_END = np.datetime64('2024-12-31')
+BIRTHDATE_REFERENCE = np.datetime64('2024-01-01')
+MAX_AGE_DAYS = 90 * 365
+# Godziny przyjęć w sekundach dnia - wizyty trwają od WORKDAY_START przez WORKDAY_SECONDS sekund
+# (kolumna appointment_date to DATETIME, a klucz UNIQUE obejmuje lekarza, pacjenta i datę z godziną)
+WORKDAY_START = 8 * 3600
+WORKDAY_SECONDS = 10 * 3600
+# Maksymalna liczba ponownych losowań terminów, które powtarzają klucz (doctor_id, patient_id, appointment_date)
+MAX_REDRAWS = 100
+# Mnożnik względnie pierwszy z 10^10 - przekształca identyfikator pacjenta w unikalny numer telefonu
+PHONE_MULTIPLIER = 2654435761
+PHONE_MODULUS = 10 ** 10
+# Parametry rozkładów wizyt (wartości 0 - rozkłady jednostajne):
+# doctor_skew / patient_skew - wykładnik rozkładu Zipfa popularności lekarzy / pacjentów,
+# seasonality - amplituda sezonowości dat wizyt (0-1), szczyt w dniu SEASON_PEAK_DAY roku,
+# treatment_correlation - prawdopodobieństwo leczenia właściwego dla diagnozy (0-1)
+DEFAULT_DISTRIBUTION = {
+    'doctor_skew': 0.0,
+    'patient_skew': 0.0,
+    'seasonality': 0.0,
+    'treatment_correlation': 0.0
+}
+SEASON_PEAK_DAY = 15
+
+
+# Wyliczanie ziarna dla sharda - zależy tylko od ziarna, tabeli i numeru sharda,
+# więc wynik jest taki sam niezależnie od liczby procesów
+def shard_seed(seed, table, shard):
+    return zlib.crc32(f"{seed}-{table}-{shard}".encode())
+
+
+# Dystrybuanta rozkładu Zipfa dla rang 1..n i losowa (zależna od ziarna) permutacja identyfikatorów,
+# aby najpopularniejsze identyfikatory nie leżały obok siebie
+@lru_cache(maxsize=None)
+def popularity_distribution(table, n, skew, seed):
+    cdf = np.cumsum(1.0 / np.arange(1, n + 1) ** skew)
+    cdf /= cdf[-1]
+    ids = np.random.default_rng(shard_seed(seed, f"{table}-popularity", n)).permutation(n) + 1
+    return cdf, ids
+
+
+# Dystrybuanta rozkładu dni wizyt z sezonowością (kosinus z maksimum w dniu SEASON_PEAK_DAY)
+@lru_cache(maxsize=None)
+def season_distribution(seasonality):
+    days = int((APPOINTMENTS_END - APPOINTMENTS_START).astype(int)) + 1
+    weights = 1 + seasonality * np.cos(2 * np.pi * (np.arange(days) - SEASON_PEAK_DAY) / 365.25)
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+
+# Losowanie indeksów z dystrybuanty (value - liczba lub tablica liczb z przedziału [0, 1))
+def sample_cdf(cdf, value):
+    return np.minimum(np.searchsorted(cdf, value, side='right'), len(cdf) - 1)
+
+
+# Losowanie identyfikatorów lekarzy / pacjentów - jednostajnie lub z rozkładu Zipfa
+def draw_ids(table, n, skew, seed, rng, size):
+    if not skew:
+        return rng.integers(1, n + 1, size)
+    cdf, ids = popularity_distribution(table, n, skew, seed)
+    return ids[sample_cdf(cdf, rng.random(size))]
+
+
+# Sekundy godzin przyjęć należące do części partition z partitions rozłącznych części (co partitions-ta sekunda).
+# Każda porcja wizyt (we wszystkich shardach) dostaje własną część, więc klucze (doctor_id, patient_id,
+# appointment_date) różnych porcji nie mogą się powtórzyć, a powtórzenia sprawdzane są tylko w obrębie porcji
+def partition_seconds(partition, partitions):
+    return range(partition, WORKDAY_SECONDS, partitions)
+
 
 # Generowanie lekarzy z emailami opartymi o imię i nazwisk
-def generate_doctors(n):
+def generate_doctors(start, end, fake, rng):
     doctors = []
-    specializations = ['Cardiology', 'Neurology', 'Orthopedics', 'Pediatrics', 'Dermatology']
 
-    for i in range(1, n + 1):
+    for i in range(start, end + 1):
         first_name = fake.first_name()
         last_name = fake.last_name()
 
         # Tworzenie emaila na podstawie imienia, nazwiska i losowej domeny
-        email = f"{first_name.lower()}.{last_name.lower()}@{random.choice(domains)}"
+        email = f"{first_name.lower()}.{last_name.lower()}@{rng.choice(domains)}"
 
         doctors.append({
             'doctor_id': i,
             'first_name': first_name,
             'last_name': last_name,
             'email': email,
-            'specialization': random.choice(specializations)
+            'specialization': rng.choice(specializations)
         })
 
     return doctors
 
 
-# Generowanie pacjentów
-def generate_patients(n):
+# Generowanie pacjentów - daty urodzenia liczone wstecz od BIRTHDATE_REFERENCE (jak w trybie vectorized)
+def generate_patients(start, end, fake, rng):
     patients = []
-    for i in range(1, n + 1):
+    for i in range(start, end + 1):
         patients.append({
             'patient_id': i,
             'first_name': fake.first_name(),
             'last_name': fake.last_name(),
-            'birthdate': fake.date_of_birth(minimum_age=0, maximum_age=90),
+            'birthdate': (BIRTHDATE_REFERENCE - np.timedelta64(rng.randrange(MAX_AGE_DAYS), 'D')).item(),
             'phone_number': fake.phone_number()
         })
     return patients
 
 
-# Generowanie wizyt pacjentów u lekarzy
-def generate_appointments(n, doctor_ids, patient_ids):
-    diagnoses = [
-        'Hypertension', 'Type 2 diabetes', 'Cold', 'Pneumonia',
-        'Asthma', 'Migraine', 'Urinary tract infection', 'Depression', 'Rheumatoid arthritis',
-        'Sleep disorders', 'Heart failure', 'Alzheimers disease', 'Bronchitis'    
-    ]
-
-    treatments = [
-        'Pharmacological treatment', 'Physiotherapy', 'Psychological consultation',
-        'Surgery', 'Antibiotics', 'Anti-inflammatory drugs', 'Breathing exercises',
-        'Low-sodium diet', 'Painkillers', 'Antihistamines'
-    ]
-
+# Generowanie wizyt pacjentów u lekarzy (identyfikatory lekarzy i pacjentów to 1..n).
+# Godziny wizyt pochodzą z części partition godzin przyjęć (patrz partition_seconds). Termin powtarzający
+# klucz wcześniejszej wizyty porcji jest losowany ponownie, aby dane spełniały klucz UNIQUE idx_doctor_patient_date
+def generate_appointments(start, end, num_doctors, num_patients, fake, rng, seed=SEED, distribution=None,
+                          partition=0, partitions=1):
+    distribution = {**DEFAULT_DISTRIBUTION, **(distribution or {})}
+    seen = set()
+    days = int((APPOINTMENTS_END - APPOINTMENTS_START).astype(int)) + 1
+    seconds = partition_seconds(partition, partitions)
     appointments = []
-    for i in range(1, n + 1):
-        doctor_id = random.choice(doctor_ids)
-        patient_id = random.choice(patient_ids)
+    for i in range(start, end + 1):
+        if distribution['doctor_skew']:
+            cdf, ids = popularity_distribution('doctors', num_doctors, distribution['doctor_skew'], seed)
+            doctor_id = int(ids[sample_cdf(cdf, rng.random())])
+        else:
+            doctor_id = rng.randint(1, num_doctors)
+        if distribution['patient_skew']:
+            cdf, ids = popularity_distribution('patients', num_patients, distribution['patient_skew'], seed)
+            patient_id = int(ids[sample_cdf(cdf, rng.random())])
+        else:
+            patient_id = rng.randint(1, num_patients)
+        for _ in range(MAX_REDRAWS):
+            if distribution['seasonality']:
+                day = int(sample_cdf(season_distribution(distribution['seasonality']), rng.random()))
+            else:
+                day = rng.randrange(days)
+            second = WORKDAY_START + seconds[rng.randrange(len(seconds))]
+            appointment_date = (APPOINTMENTS_START + np.timedelta64(day, 'D') + np.timedelta64(second, 's')).item()
+            if (doctor_id, patient_id, appointment_date) not in seen:
+                break
+        else:
+            raise ValueError(f"No free appointment date for doctor {doctor_id} and patient {patient_id} "
+                             f"after {MAX_REDRAWS} draws - too many appointments for the number of doctors and patients")
+        seen.add((doctor_id, patient_id, appointment_date))
+        diagnosis = rng.choice(diagnoses)
+        treatment = rng.choice(treatments)
+        if distribution['treatment_correlation'] and rng.random() < distribution['treatment_correlation']:
+            treatment = rng.choice(diagnosis_treatments[diagnosis])
         appointments.append({
             'appointment_id': i,
             'doctor_id': doctor_id,
             'patient_id': patient_id,
-            'appointment_date': fake.date_this_year(),
-            'diagnosis': random.choice(diagnoses),
-            'treatment': random.choice(treatments)
+            'appointment_date': appointment_date,
+            'diagnosis': diagnosis,
+            'treatment': treatment
         })
     return appointments
 
 
-# Zapis danych do plików CSV
-def save_to_csv(data, filename):
-    df = pd.DataFrame(data)
-    df.to_csv(filename, index=False)
+# Pule imion i nazwisk z Faker dla trybu vectorized - tworzone raz na proces dla danego ziarna
+@lru_cache(maxsize=None)
+def faker_pools(seed):
+    fake = Faker()
+    fake.seed_instance(seed)
+    first_names = np.array([fake.first_name() for _ in range(FAKER_POOL_SIZE)], dtype=object)
+    last_names = np.array([fake.last_name() for _ in range(FAKER_POOL_SIZE)], dtype=object)
+    return first_names, last_names
+
+
+# Generowanie lekarzy całymi kolumnami - email zawiera identyfikator, aby był unikalny (UNIQUE w schemacie)
+def generate_doctors_vectorized(start, end, pools, rng):
+    first_names, last_names = pools
+    n = end - start + 1
+    ids = np.arange(start, end + 1)
+    first = pd.Series(first_names[rng.integers(0, len(first_names), n)])
+    last = pd.Series(last_names[rng.integers(0, len(last_names), n)])
+    domain = pd.Series(np.array(domains, dtype=object)[rng.integers(0, len(domains), n)])
+
+    return pd.DataFrame({
+        'doctor_id': ids,
+        'first_name': first,
+        'last_name': last,
+        'email': first.str.lower() + '.' + last.str.lower() + '.' + pd.Series(ids).astype(str) + '@' + domain,
+        'specialization': np.array(specializations, dtype=object)[rng.integers(0, len(specializations), n)]
+    })
+
+
+# Generowanie pacjentów całymi kolumnami - numer telefonu wyliczany z identyfikatora, aby był unikalny
+def generate_patients_vectorized(start, end, pools, rng):
+    first_names, last_names = pools
+    n = end - start + 1
+    ids = np.arange(start, end + 1)
+    phones = pd.Series((ids.astype(np.int64) * PHONE_MULTIPLIER) % PHONE_MODULUS).astype(str).str.zfill(10)
+
+    return pd.DataFrame({
+        'patient_id': ids,
+        'first_name': first_names[rng.integers(0, len(first_names), n)],
+        'last_name': last_names[rng.integers(0, len(last_names), n)],
+        'birthdate': BIRTHDATE_REFERENCE - rng.integers(0, MAX_AGE_DAYS, n).astype('timedelta64[D]'),
+        'phone_number': phones.str[:3] + '-' + phones.str[3:6] + '-' + phones.str[6:]
+    })
 
 
-# Główna funkcja do generowania danych
-def generate_database(num_doctors, num_patients, num_appointments):
-    doctors = generate_doctors(num_doctors)
-    patients = generate_patients(num_patients)
-    appointments = generate_appointments(num_appointments, [d['doctor_id'] for d in doctors],
-                                         [p['patient_id'] for p in patients])
+# Generowanie wizyt całymi kolumnami (identyfikatory lekarzy i pacjentów to 1..n).
+# Godziny wizyt pochodzą z części partition godzin przyjęć (patrz partition_seconds). Terminy powtarzające
+# klucz (doctor_id, patient_id, appointment_date) w obrębie porcji są losowane ponownie
+def generate_appointments_vectorized(start, end, num_doctors, num_patients, rng, seed=SEED, distribution=None,
+                                     partition=0, partitions=1):
+    distribution = {**DEFAULT_DISTRIBUTION, **(distribution or {})}
+    n = end - start + 1
+    days = (APPOINTMENTS_END - APPOINTMENTS_START).astype(int) + 1
+    seconds = np.array(partition_seconds(partition, partitions))
 
-    # Zapisanie danych do plików CSV
-    save_to_csv(doctors, 'doctors.csv')
-    save_to_csv(patients, 'patients.csv')
-    save_to_csv(appointments, 'appointments.csv')
+    # termin wizyty jako numer w roku: dzień * len(seconds) + numer sekundy z części partition
+    def draw_slots(size):
+        if distribution['seasonality']:
+            day = sample_cdf(season_distribution(distribution['seasonality']), rng.random(size))
+        else:
+            day = rng.integers(0, days, size)
+        return day * len(seconds) + rng.integers(0, len(seconds), size)
+
+    doctor_ids = draw_ids('doctors', num_doctors, distribution['doctor_skew'], seed, rng, n)
+    patient_ids = draw_ids('patients', num_patients, distribution['patient_skew'], seed, rng, n)
+    slots = draw_slots(n)
+    pairs = doctor_ids.astype(np.int64) * (num_patients + 1) + patient_ids
+    for _ in range(MAX_REDRAWS):
+        keys = pairs * (days * len(seconds)) + slots
+        duplicate = pd.Series(keys).duplicated().to_numpy()
+        if not duplicate.any():
+            break
+        slots[duplicate] = draw_slots(int(duplicate.sum()))
+    else:
+        raise ValueError(f"No free appointment dates for {int(duplicate.sum())} appointments after {MAX_REDRAWS} "
+                         f"draws - too many appointments for the number of doctors and patients")
+    day, second = np.divmod(slots, len(seconds))
+
+    diagnosis = rng.integers(0, len(diagnoses), n)
+    treatment = rng.integers(0, len(treatments), n)
+
+    if distribution['treatment_correlation']:
+        # leczenie właściwe dla diagnozy - losowy element listy diagnosis_treatments[diagnoza]
+        suited = [[treatments.index(name) for name in diagnosis_treatments[name]] for name in diagnoses]
+        offsets = np.cumsum([0] + [len(names) for names in suited])
+        flat = np.array([index for names in suited for index in names])
+        lengths = np.diff(offsets)
+        choice = offsets[diagnosis] + (rng.random(n) * lengths[diagnosis]).astype(int)
+        correlated = rng.random(n) < distribution['treatment_correlation']
+        treatment = np.where(correlated, flat[choice], treatment)
+
+    return pd.DataFrame({
+        'appointment_id': np.arange(start, end + 1),
+        'doctor_id': doctor_ids,
+        'patient_id': patient_ids,
+        'appointment_date': (APPOINTMENTS_START + day.astype('timedelta64[D]')
+                             + (WORKDAY_START + seconds[second]).astype('timedelta64[s]')),
+        'diagnosis': np.array(diagnoses, dtype=object)[diagnosis],
+        'treatment': np.array(treatments, dtype=object)[treatment]
+    })
+
+
+# Otwarty plik wyjściowy sharda - CSV dopisywany porcjami lub Parquet z jedną grupą wierszy na porcję
+class ChunkWriter:
+    def __init__(self, filename, output_format):
+        self.filename = filename
+        self.output_format = output_format
+        self.file = None
+
+    def write(self, data):
+        df = pd.DataFrame(data)
+        if self.output_format == 'parquet':
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self.file is None:
+                self.file = pq.ParquetWriter(self.filename, table.schema)
+            self.file.write_table(table)
+        else:
+            if self.file is None:
+                self.file = open(self.filename, 'w', newline='')
+                df.to_csv(self.file, index=False)
+            else:
+                df.to_csv(self.file, index=False, header=False)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+
+# Nazwa pliku częściowego dla tabeli i numeru sharda
+def shard_filename(output_dir, table, shard, output_format='csv'):
+    return os.path.join(output_dir, f"{table}_part{shard:04d}.{output_format}")
+
+
+# Generowanie jednego sharda tabeli w osobnym procesie - każdy shard ma własne ziarno,
+# a każda porcja wizyt - własną część godzin przyjęć: partition + numer porcji w shardzie z partitions części
+# (patrz partition_seconds).
+# Wiersze generowane i zapisywane są porcjami po chunk_rows, więc pamięć zależy od rozmiaru porcji, a nie sharda
+def generate_shard(table, shard, start, end, counts, seed, output_dir, method='faker', chunk_rows=CHUNK_ROWS,
+                   output_format='csv', distribution=None, partition=0, partitions=1):
+    if method == 'vectorized':
+        rng = np.random.default_rng(shard_seed(seed, table, shard))
+    else:
+        fake = Faker()
+        fake.seed_instance(shard_seed(seed, table, shard))
+        rng = random.Random(shard_seed(seed, table, shard))
+
+    filename = shard_filename(output_dir, table, shard, output_format)
+    writer = ChunkWriter(filename, output_format)
+    try:
+        for chunk, chunk_start in enumerate(range(start, end + 1, chunk_rows)):
+            chunk_end = min(chunk_start + chunk_rows - 1, end)
+            if method == 'vectorized' and table == 'doctors':
+                data = generate_doctors_vectorized(chunk_start, chunk_end, faker_pools(seed), rng)
+            elif method == 'vectorized' and table == 'patients':
+                data = generate_patients_vectorized(chunk_start, chunk_end, faker_pools(seed), rng)
+            elif method == 'vectorized':
+                data = generate_appointments_vectorized(chunk_start, chunk_end, counts['doctors'],
+                                                        counts['patients'], rng, seed, distribution,
+                                                        partition + chunk, partitions)
+            elif table == 'doctors':
+                data = generate_doctors(chunk_start, chunk_end, fake, rng)
+            elif table == 'patients':
+                data = generate_patients(chunk_start, chunk_end, fake, rng)
+            else:
+                data = generate_appointments(chunk_start, chunk_end, counts['doctors'], counts['patients'],
+                                             fake, rng, seed, distribution, partition + chunk, partitions)
+            writer.write(data)
+    finally:
+        writer.close()
+    return filename
+
+
+# Podział zakresu identyfikatorów 1..n na shardy po shard_rows wierszy
+def split_shards(n, shard_rows):
+    return [(shard, start, min(start + shard_rows - 1, n))
+            for shard, start in enumerate(range(1, n + 1, shard_rows))]
+
+
+# Scalanie plików częściowych w jeden plik CSV (nagłówek tylko z pierwszego sharda)
+def merge_shards(filenames, filename):
+    with open(filename, 'wb') as output:
+        for index, shard_file in enumerate(filenames):
+            with open(shard_file, 'rb') as shard:
+                header = shard.readline()
+                if index == 0:
+                    output.write(header)
+                shutil.copyfileobj(shard, output)
+            os.remove(shard_file)
+
+
+# Scalanie plików częściowych Parquet - kopiowanie po jednej grupie wierszy, bez wczytywania całych plików
+def merge_parquet_shards(filenames, filename):
+    writer = None
+    try:
+        for shard_file in filenames:
+            shard = pq.ParquetFile(shard_file)
+            if writer is None:
+                writer = pq.ParquetWriter(filename, shard.schema_arrow)
+            for group in range(shard.num_row_groups):
+                writer.write_table(shard.read_row_group(group))
+            shard.close()
+            os.remove(shard_file)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+# Główna funkcja do generowania danych - shardy wszystkich tabel generowane są równolegle w puli procesów
+def generate_database(num_doctors, num_patients, num_appointments, workers=None, seed=SEED,
+                      shard_rows=SHARD_ROWS, output_dir='.', merge=True, method='faker',
+                      chunk_rows=CHUNK_ROWS, output_format='csv', distribution=None):
+    counts = {'doctors': num_doctors, 'patients': num_patients, 'appointments': num_appointments}
+    distribution = {**DEFAULT_DISTRIBUTION, **(distribution or {})}
+    # każda porcja wizyt potrzebuje co najmniej jednej własnej sekundy godzin przyjęć
+    shard_chunks = -(-shard_rows // chunk_rows)
+    partitions = len(split_shards(num_appointments, shard_rows)) * shard_chunks
+    if partitions > WORKDAY_SECONDS:
+        raise ValueError(f"{partitions} appointment chunks exceed {WORKDAY_SECONDS} appointment seconds per day, "
+                         f"increase --chunk-rows")
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Zapis parametrów generowania - pozwala odtworzyć i opisać zbiór danych w wynikach testów
+    with open(os.path.join(output_dir, 'generation.json'), 'w') as file:
+        json.dump({'counts': counts, 'seed': seed, 'method': method, 'shard_rows': shard_rows,
+                   'chunk_rows': chunk_rows, 'distribution': distribution}, file, indent=4)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            table: [
+                executor.submit(generate_shard, table, shard, start, end, counts, seed, output_dir, method,
+                                chunk_rows, output_format, distribution, shard * shard_chunks, partitions)
+                for shard, start, end in split_shards(counts[table], shard_rows)
+            ]
+            for table in TABLES
+        }
+        shard_files = {table: [future.result() for future in table_futures]
+                       for table, table_futures in futures.items()}
+
+    # Scalenie shardów w jeden plik na tabelę
+    if merge:
+        for table in TABLES:
+            filename = os.path.join(output_dir, f"{table}.{output_format}")
+            if output_format == 'parquet':
+                merge_parquet_shards(shard_files[table], filename)
+            else:
+                merge_shards(shard_files[table], filename)
 
 
 if __name__ == "__main__":
-    num_doctors = int(input("How many doctors to generate? "))
-    num_patients = int(input("How many patients to generate? "))
-    num_appointments = int(input("How many appointments to generate? "))
+    parser = argparse.ArgumentParser(description="Generate Doctors_Appointments datasets")
+    parser.add_argument('--doctors', type=int, help="number of doctors")
+    parser.add_argument('--patients', type=int, help="number of patients")
+    parser.add_argument('--appointments', type=int, help="number of appointments")
+    parser.add_argument('--workers', type=int, default=None, help="number of processes (default: CPU count)")
+    parser.add_argument('--seed', type=int, default=SEED, help="random seed - the same seed gives the same data")
+    parser.add_argument('--shard-rows', type=int, default=SHARD_ROWS, help="rows per shard")
+    parser.add_argument('--method', choices=METHODS, default='vectorized',
+                        help="vectorized - NumPy columns with names from Faker pools (fast), faker - row by row")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS,
+                        help="rows generated and written at once - memory is bounded by chunk size")
+    parser.add_argument('--format', dest='output_format', choices=OUTPUT_FORMATS, default='csv',
+                        help="output file format")
+    parser.add_argument('--output-dir', default='.', help="directory for output files")
+    parser.add_argument('--doctor-skew', type=float, default=0.0,
+                        help="Zipf exponent of doctor popularity in appointments (0 - uniform, e.g. 1.1 - hot doctors)")
+    parser.add_argument('--patient-skew', type=float, default=0.0,
+                        help="Zipf exponent of patient popularity in appointments (0 - uniform)")
+    parser.add_argument('--seasonality', type=float, default=0.0,
+                        help="amplitude (0-1) of the yearly cycle of appointment dates, peak in January")
+    parser.add_argument('--treatment-correlation', type=float, default=0.0,
+                        help="probability (0-1) that the treatment matches the diagnosis")
+    parser.add_argument('--no-merge', dest='merge', action='store_false',
+                        help="keep <table>_partNNNN shards instead of merging them into one file per table")
+    args = parser.parse_args()
+
+    # Bez parametrów liczby wierszy pobierane są interaktywnie
+    num_doctors = args.doctors or int(input("How many doctors to generate? "))
+    num_patients = args.patients or int(input("How many patients to generate? "))
+    num_appointments = args.appointments or int(input("How many appointments to generate? "))
 
-    generate_database(num_doctors, num_patients, num_appointments)
-    print("Data was generated and saved to CSV files.")
+    generate_database(num_doctors, num_patients, num_appointments, workers=args.workers, seed=args.seed,
+                      shard_rows=args.shard_rows, output_dir=args.output_dir, merge=args.merge,
+                      method=args.method, chunk_rows=args.chunk_rows, output_format=args.output_format,
+                      distribution={'doctor_skew': args.doctor_skew, 'patient_skew': args.patient_skew,
+                                    'seasonality': args.seasonality,
+                                    'treatment_correlation': args.treatment_correlation})
+    print(f"Data was generated and saved to {args.output_format.upper()} files.")
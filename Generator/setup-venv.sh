@@ -27,7 +27,7 @@ source .venv/bin/activate
 # Instalacja zależności
 echo "Instalacja zależności..."
 pip install --upgrade pip
-pip install faker pandas
+pip install faker pandas numpy pyarrow
 
 # Sprawdzenie instalacji zależności
 if [ $? -eq 0 ]; then
@@ -0,0 +1,58 @@
+"""
+Testy generatora danych - unikalność klucza (doctor_id, patient_id, appointment_date) z idx_doctor_patient_date
+"""
+
+import os
+import pandas as pd
+import pytest
+from data_generator import generate_database
+
+KEY = ['doctor_id', 'patient_id', 'appointment_date']
+# Mało lekarzy i pacjentów przy dużym skosie - bez ponownych losowań terminy wielokrotnie powtarzają klucz
+SKEWED = {'doctor_skew': 1.1, 'patient_skew': 1.1, 'seasonality': 0.5}
+# Skrajny skos - prawie wszystkie wizyty jednej pary lekarz-pacjent w kilku dniach
+EXTREME = {'doctor_skew': 3.0, 'patient_skew': 3.0, 'seasonality': 1.0}
+
+
+@pytest.mark.parametrize('method, appointments', [('vectorized', 200000), ('faker', 20000)])
+@pytest.mark.parametrize('distribution', [None, SKEWED])
+def test_appointment_keys_unique(tmp_path, method, appointments, distribution):
+    # kilka shardów i porcji, aby sprawdzić także klucze z różnych porcji i procesów
+    generate_database(5, 5, appointments, workers=2, shard_rows=appointments // 3,
+                      chunk_rows=appointments // 7, output_dir=str(tmp_path), method=method,
+                      distribution=distribution)
+    data = pd.read_csv(os.path.join(tmp_path, 'appointments.csv'))
+
+    assert len(data) == appointments
+    assert not data.duplicated(KEY).any()
+
+
+@pytest.mark.parametrize('method', ['vectorized', 'faker'])
+def test_appointment_keys_unique_many_shards(tmp_path, method):
+    # ponad 60 shardów - klucze z różnych procesów rozdzielają rozłączne części godzin przyjęć
+    generate_database(3, 3, 61 * 200, workers=2, shard_rows=200, chunk_rows=100, output_dir=str(tmp_path),
+                      method=method, distribution=EXTREME)
+    data = pd.read_csv(os.path.join(tmp_path, 'appointments.csv'))
+
+    assert len(data) == 61 * 200
+    assert not data.duplicated(KEY).any()
+
+
+@pytest.mark.parametrize('method', ['vectorized', 'faker'])
+def test_appointment_dates_in_range(tmp_path, method):
+    # daty wizyt nie zależą od dnia uruchomienia - ten sam zakres z sezonowością i bez niej
+    for distribution in (None, {'seasonality': 0.5}):
+        generate_database(3, 3, 1000, workers=1, output_dir=str(tmp_path), method=method, distribution=distribution)
+        dates = pd.to_datetime(pd.read_csv(os.path.join(tmp_path, 'appointments.csv'))['appointment_date'])
+
+        assert dates.min() >= pd.Timestamp('2024-01-01 08:00:00')
+        assert dates.max() < pd.Timestamp('2025-01-01')
+
+
+def test_faker_birthdates_reproducible(tmp_path):
+    # daty urodzenia liczone od BIRTHDATE_REFERENCE - ten sam seed daje te same dane każdego dnia
+    generate_database(3, 50, 10, workers=1, output_dir=str(tmp_path), method='faker')
+    birthdates = pd.to_datetime(pd.read_csv(os.path.join(tmp_path, 'patients.csv'))['birthdate'])
+
+    assert birthdates.max() <= pd.Timestamp('2024-01-01')
+    assert birthdates.min() > pd.Timestamp('2024-01-01') - pd.Timedelta(days=90 * 365)
@@ -0,0 +1,179 @@
+"""
+Moduł budujący w MongoDB kolekcje z osadzonymi dokumentami (denormalizacja) zamiast referencji
+"""
+
+import time
+import argparse
+from pymongo import MongoClient, ASCENDING, InsertOne, UpdateOne
+from data_loader import MONGODB_URI, save_to_csv
+
+# Osadzane dokumenty dla każdej bazy: kolekcja źródłowa i pola, pod którymi
+# zapisywany jest dokument z kolekcji from, którego pole foreign równa się polu local
+EMBEDDINGS = {
+    'Doctors_Appointments': {
+        'collection': 'Appointments',
+        'embed': [
+            {'field': 'doctor', 'from': 'Doctors', 'local': 'doctor_id', 'foreign': 'doctor_id'},
+            {'field': 'patient', 'from': 'Patients', 'local': 'patient_id', 'foreign': 'patient_id'}
+        ]
+    },
+    'Bikes': {
+        'collection': 'TripUsers',
+        'embed': [
+            {'field': 'start_station', 'from': 'Stations', 'local': 'start_station_id', 'foreign': 'station_id'},
+            {'field': 'end_station', 'from': 'Stations', 'local': 'end_station_id', 'foreign': 'station_id'}
+        ]
+    },
+    'Airports': {
+        'collection': 'Flights',
+        'embed': [
+            {'field': 'airline', 'from': 'Airlines', 'local': 'AIRLINE', 'foreign': 'IATA_CODE'},
+            {'field': 'origin', 'from': 'Airports', 'local': 'ORIGIN_AIRPORT', 'foreign': 'IATA_CODE'},
+            {'field': 'destination', 'from': 'Airports', 'local': 'DESTINATION_AIRPORT', 'foreign': 'IATA_CODE'}
+        ]
+    }
+}
+METHODS = ['pipeline', 'bulk']
+# Liczba dokumentów źródłowych w jednym bulk_write (metoda bulk)
+BULK_BATCH_SIZE = 10000
+EMBED_CSV = "embed_report.csv"
+
+def ensure_foreign_indexes(db, embeddings):
+    """
+    Funkcja tworząca indeksy na polach, po których wyszukiwane są osadzane
+    dokumenty - bez nich każdy $lookup przegląda całą kolekcję. Pole, które
+    jest już początkiem istniejącego indeksu (np. pk_* z index_parity), jest
+    pomijane. Zwraca czas tworzenia indeksów w sekundach.
+    """
+    start = time.perf_counter()
+    for embed in embeddings:
+        collection = db[embed['from']]
+        existing = [info['key'] for info in collection.index_information().values()]
+        if not any(key[0][0] == embed['foreign'] for key in existing):
+            collection.create_index([(embed['foreign'], ASCENDING)])
+    return time.perf_counter() - start
+
+def embed_pipeline(embeddings, source, target):
+    """
+    Funkcja zwracająca potok agregacji budujący dokumenty z osadzeniami po stronie
+    serwera ($lookup + $merge). Przy budowie w miejscu (target == source)
+    pola osadzeń są dopisywane do istniejących dokumentów.
+    """
+    pipeline = []
+    for embed in embeddings:
+        pipeline += [
+            {'$lookup': {'from': embed['from'], 'localField': embed['local'],
+                         'foreignField': embed['foreign'], 'as': embed['field']}},
+            {'$unwind': {'path': f"${embed['field']}", 'preserveNullAndEmptyArrays': True}}
+        ]
+    pipeline.append({'$unset': [f"{embed['field']}._id" for embed in embeddings]})
+    pipeline.append({'$merge': {'into': target, 'on': '_id',
+                                'whenMatched': 'merge' if target == source else 'replace',
+                                'whenNotMatched': 'insert'}})
+    return pipeline
+
+def build_with_pipeline(db, embeddings, source, target):
+    """Funkcja budująca osadzenia jednym potokiem agregacji wykonywanym przez serwer"""
+    db[source].aggregate(embed_pipeline(embeddings, source, target), allowDiskUse=True)
+
+def build_with_bulk(db, embeddings, source, target, batch_size=BULK_BATCH_SIZE):
+    """
+    Funkcja budująca osadzenia po stronie klienta: dokumenty źródłowe czytane są
+    paczkami, osadzane dokumenty pobierane jednym zapytaniem $in na paczkę
+    i kolekcję, a wynik zapisywany przez bulk_write(ordered=False) -
+    InsertOne do nowej kolekcji lub UpdateOne z $set przy budowie w miejscu.
+    """
+    def flush(batch):
+        related = {}
+        for embed in embeddings:
+            values = list({document[embed['local']] for document in batch if embed['local'] in document})
+            related[embed['field']] = {
+                document[embed['foreign']]: document for document in
+                db[embed['from']].find({embed['foreign']: {'$in': values}}, {'_id': 0})
+            }
+        requests = []
+        for document in batch:
+            embedded = {}
+            for embed in embeddings:
+                match = related[embed['field']].get(document.get(embed['local']))
+                if match is not None:
+                    embedded[embed['field']] = match
+            if target == source:
+                if embedded:
+                    requests.append(UpdateOne({'_id': document['_id']}, {'$set': embedded}))
+            else:
+                requests.append(InsertOne({**document, **embedded}))
+        if requests:
+            db[target].bulk_write(requests, ordered=False)
+
+    batch = []
+    for document in db[source].find({}, batch_size=batch_size):
+        batch.append(document)
+        if len(batch) == batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+def build_embedded(database_name, target=None, method='pipeline', batch_size=BULK_BATCH_SIZE):
+    """
+    Funkcja budująca kolekcję z osadzonymi dokumentami dla bazy database_name
+    (patrz EMBEDDINGS). Domyślnie wynik trafia do nowej kolekcji
+    <kolekcja>_embedded (usuwanej przed budową), a kolekcja z referencjami
+    pozostaje bez zmian. Czas budowy, liczba dokumentów i rozmiar wyniku
+    wypisywane są na ekranie i zapisywane w pliku EMBED_CSV.
+    """
+    spec = EMBEDDINGS.get(database_name)
+    if spec is None:
+        raise ValueError(f"No embeddings defined for database {database_name}")
+    source = spec['collection']
+    target = target or f"{source}_embedded"
+
+    client = MongoClient(MONGODB_URI)
+    db = client[database_name]
+    if target != source:
+        db.drop_collection(target)
+    index_time = ensure_foreign_indexes(db, spec['embed'])
+
+    print(f"MongoDB: embedding {', '.join(embed['from'] for embed in spec['embed'])} "
+          f"into {database_name}.{target} ({method})")
+    start = time.perf_counter()
+    if method == 'bulk':
+        build_with_bulk(db, spec['embed'], source, target, batch_size)
+    else:
+        build_with_pipeline(db, spec['embed'], source, target)
+    build_time = time.perf_counter() - start
+
+    documents = db[target].estimated_document_count()
+    stats = db.command('collStats', target)
+    report = {
+        'database': database_name,
+        'source': source,
+        'target': target,
+        'method': method,
+        'documents': documents,
+        'index_time': index_time,
+        'build_time': build_time,
+        'documents_per_s': documents / build_time if build_time > 0 else None,
+        'data_bytes': stats.get('size'),
+        'storage_bytes': stats.get('storageSize')
+    }
+    client.close()
+    print(f"MongoDB: {documents} documents in {build_time:.2f} s "
+          f"({report['documents_per_s'] or 0:.0f} documents/s), {report['data_bytes']} bytes")
+    save_to_csv(report, EMBED_CSV)
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Budowa kolekcji z osadzonymi dokumentami w MongoDB")
+    parser.add_argument('database', choices=list(EMBEDDINGS), help="nazwa bazy")
+    parser.add_argument('--target', default=None,
+                        help="kolekcja wynikowa (domyślnie <kolekcja>_embedded, nazwa kolekcji źródłowej - budowa w miejscu)")
+    parser.add_argument('--method', choices=METHODS, default='pipeline',
+                        help="pipeline - $lookup + $merge na serwerze, bulk - paczki bulk_write z klienta")
+    parser.add_argument('--batch-size', type=int, default=BULK_BATCH_SIZE, help="dokumenty w jednym bulk_write")
+    args = parser.parse_args()
+    build_embedded(args.database, args.target, args.method, args.batch_size)
+
+if __name__ == "__main__":
+    main()
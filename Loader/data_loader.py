@@ -0,0 +1,387 @@
+"""
+Moduł wczytujący pliki CSV do MariaDB (LOAD DATA) i MongoDB (równoległe insert_many) z pomiarem czasu importu
+"""
+
+import os
+import csv
+import re
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import mysql.connector
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+from schema_parser import parse_schema, fk_backing_indexes, key_parts_sql
+from index_parity import mongodb_index_specs, create_mongodb_index
+
+# Stałe parametry połączeń
+MARIADB_CONFIG = {
+    'host': 'localhost',
+    'user': 'bot',
+    'password': 'P@ssw0rd'
+}
+MONGODB_URI = 'mongodb://localhost:27017/'
+# Liczba dokumentów w jednym insert_many i liczba równoległych wątków wstawiających
+MONGODB_BATCH_SIZE = 10000
+MONGODB_WORKERS = 4
+LOAD_CSV = "load_report.csv"
+# Liczba ostrzeżeń LOAD DATA wypisywanych na ekranie (wszystkie liczone są w raporcie)
+SHOWN_WARNINGS = 5
+ENGINES = ['mariadb', 'mongodb']
+
+def save_to_csv(data, filename=LOAD_CSV):
+    """Funkcja dopisująca wiersz raportu do pliku CSV"""
+    with open(filename, mode='a', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=data.keys())
+        if file.tell() == 0:
+            writer.writeheader()
+        writer.writerow(data)
+
+def normalize_name(name):
+    """Funkcja sprowadzająca nazwę kolumny z nagłówka CSV do postaci porównywalnej z nazwą w schemacie"""
+    return name.strip().strip('"').lower().replace(' ', '_').replace('-', '_')
+
+def read_header(path):
+    """Funkcja zwracająca nagłówek pliku CSV i znak końca linii (\\n lub \\r\\n)"""
+    with open(path, newline='', encoding='utf-8') as file:
+        line = file.readline()
+    header = next(csv.reader([line]))
+    return header, '\r\n' if line.endswith('\r\n') else '\n'
+
+def map_header(table, header):
+    """
+    Funkcja przypisująca kolumnom pliku CSV kolumny tabeli (bez rozróżniania
+    wielkości liter, spacje i myślniki jako podkreślenia). Kolumny pliku
+    bez odpowiednika w tabeli mają wartość None i są pomijane.
+    """
+    columns = {normalize_name(column['name']): column for column in table['columns']}
+    mapped = [columns.get(normalize_name(name)) for name in header]
+    for name, column in zip(header, mapped):
+        if column is None:
+            print(f"{table['name']}: CSV column '{name}' has no table column, skipped")
+    return mapped
+
+def find_data_files(schema, data_dir, overrides=None):
+    """
+    Funkcja wyszukująca plik CSV dla każdej tabeli schematu: <tabela>.csv
+    w katalogu data_dir (bez rozróżniania wielkości liter) lub plik podany
+    w overrides ({tabela: ścieżka}). Tabele bez pliku są pomijane.
+    """
+    overrides = overrides or {}
+    files = {name.lower(): os.path.join(data_dir, name) for name in os.listdir(data_dir)}
+    data_files = {}
+    for table in schema['tables']:
+        path = overrides.get(table['name']) or files.get(f"{table['name'].lower()}.csv")
+        if path:
+            data_files[table['name']] = path
+        else:
+            print(f"{table['name']}: no CSV file found, skipped")
+    return data_files
+
+def mariadb_connect(database=None):
+    """Funkcja otwierająca połączenie MariaDB z włączonym LOAD DATA LOCAL"""
+    return mysql.connector.connect(allow_local_infile=True, database=database, **MARIADB_CONFIG)
+
+def if_not_exists(statement):
+    """Funkcja dopisująca IF NOT EXISTS do polecenia CREATE DATABASE / TABLE / INDEX bez tej klauzuli"""
+    return re.sub(r'^(CREATE\s+(?:DATABASE|TABLE|(?:UNIQUE\s+|FULLTEXT\s+|SPATIAL\s+)?INDEX))\s+(?!IF\s+NOT\s+EXISTS)',
+                  r'\1 IF NOT EXISTS ', statement, flags=re.I)
+
+def create_mariadb_schema(schema, recreate=False):
+    """
+    Funkcja tworząca bazę i tabele poleceniami z pliku struktury.
+    Przy recreate=True istniejąca baza jest najpierw usuwana. Bez recreate
+    polecenia wykonywane są z IF NOT EXISTS - brakujące tabele i indeksy są
+    tworzone, a wiersze dopisywane do istniejących tabel.
+    """
+    conn = mariadb_connect()
+    cursor = conn.cursor()
+    if recreate:
+        cursor.execute(f"DROP DATABASE IF EXISTS `{schema['database']}`")
+    else:
+        cursor.execute("SELECT 1 FROM information_schema.SCHEMATA WHERE schema_name = %s", (schema['database'],))
+        if cursor.fetchall():
+            print(f"MariaDB: database {schema['database']} exists, rows are appended to existing tables "
+                  f"(use --recreate to load into an empty database)")
+    for statement in schema['statements']:
+        cursor.execute(if_not_exists(statement))
+    cursor.close()
+    conn.close()
+
+def count_csv_rows(path):
+    """Funkcja zwracająca liczbę wierszy danych pliku CSV (bez nagłówka, pola w cudzysłowach mogą zawierać \\n)"""
+    with open(path, newline='', encoding='utf-8') as file:
+        return sum(1 for _ in csv.reader(file)) - 1
+
+def mariadb_table_size(cursor, database, table_name):
+    """Funkcja zwracająca rozmiar danych i indeksów tabeli na dysku (po ANALYZE TABLE)"""
+    cursor.execute(f"ANALYZE TABLE `{table_name}`")
+    cursor.fetchall()
+    cursor.execute(
+        "SELECT data_length, index_length FROM information_schema.TABLES WHERE table_schema = %s AND table_name = %s",
+        (database, table_name)
+    )
+    data_bytes, index_bytes = cursor.fetchone()
+    return data_bytes, index_bytes
+
+def load_mariadb_table(database, table, path, drop_indexes=True):
+    """
+    Funkcja wczytująca plik CSV do tabeli MariaDB poleceniem LOAD DATA LOCAL INFILE.
+    Sprawdzanie kluczy obcych jest wyłączone na czas importu, unikalności - nie:
+    przy LOCAL wiersze powtarzające klucz UNIQUE są pomijane z ostrzeżeniem,
+    a ich liczba i liczba ostrzeżeń trafiają do raportu.
+    InnoDB ignoruje ALTER TABLE ... DISABLE KEYS, dlatego indeksy pomocnicze
+    (poza UNIQUE i indeksami kluczy obcych) są usuwane przed importem
+    i budowane ponownie po nim - czas budowy mierzony jest osobno.
+    Puste pola wczytywane są jako NULL. Zwraca wiersz raportu.
+    """
+    header, line_terminator = read_header(path)
+    mapped = map_header(table, header)
+    variables = [f"@c{index}" for index in range(len(header))]
+    assignments = [f"`{column['name']}` = NULLIF({variable}, '')"
+                   for variable, column in zip(variables, mapped) if column is not None]
+
+    rebuilt = []
+    if drop_indexes:
+        backing = fk_backing_indexes(table)
+        rebuilt = [index for index in table['indexes']
+                   if not index['unique'] and index['kind'] == 'btree' and index['name'] not in backing]
+
+    conn = mariadb_connect(database)
+    cursor = conn.cursor()
+    cursor.execute("SET SESSION foreign_key_checks = 0")
+    if rebuilt:
+        cursor.execute(f"ALTER TABLE `{table['name']}` " +
+                       ', '.join(f"DROP INDEX `{index['name']}`" for index in rebuilt))
+
+    print(f"MariaDB: loading {path} into {table['name']}")
+    start = time.perf_counter()
+    cursor.execute(
+        f"LOAD DATA LOCAL INFILE %s INTO TABLE `{table['name']}` CHARACTER SET utf8mb4 "
+        f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' LINES TERMINATED BY %s IGNORE 1 LINES "
+        f"({', '.join(variables)}) SET {', '.join(assignments)}",
+        (os.path.abspath(path), line_terminator)
+    )
+    rows = cursor.rowcount
+    load_time = time.perf_counter() - start
+    # ostrzeżenia LOAD DATA (m.in. pominięte wiersze) - odczytywane przed kolejnym poleceniem, poza pomiarem
+    cursor.execute("SHOW COUNT(*) WARNINGS")
+    warnings = cursor.fetchone()[0]
+    cursor.execute(f"SHOW WARNINGS LIMIT {SHOWN_WARNINGS}")
+    messages = [message for _, _, message in cursor.fetchall()]
+    start = time.perf_counter()
+    conn.commit()
+    load_time += time.perf_counter() - start
+
+    csv_rows = count_csv_rows(path)
+    if csv_rows != rows or warnings:
+        print(f"MariaDB Warning: {table['name']}: {rows} of {csv_rows} CSV rows loaded, "
+              f"{csv_rows - rows} skipped, {warnings} warnings")
+        for message in messages:
+            print(f"  {message}")
+
+    start = time.perf_counter()
+    if rebuilt:
+        cursor.execute(f"ALTER TABLE `{table['name']}` " + ', '.join(
+            f"ADD INDEX `{index['name']}` ({key_parts_sql(index)})"
+            for index in rebuilt
+        ))
+    index_time = time.perf_counter() - start
+
+    cursor.execute("SET SESSION foreign_key_checks = 1")
+    data_bytes, index_bytes = mariadb_table_size(cursor, database, table['name'])
+    cursor.close()
+    conn.close()
+
+    return {
+        'engine': 'MariaDB',
+        'database': database,
+        'table': table['name'],
+        'csv_rows': csv_rows,
+        'rows': rows,
+        'skipped_rows': csv_rows - rows,
+        'warnings': warnings,
+        'load_time': load_time,
+        'rows_per_s': rows / load_time if load_time > 0 else None,
+        'indexes_built': len(rebuilt),
+        'index_errors': '',
+        'index_build_time': index_time,
+        'data_bytes': data_bytes,
+        'index_bytes': index_bytes,
+        'total_bytes': data_bytes + index_bytes
+    }
+
+def convert_value(value, kind):
+    """
+    Funkcja zamieniająca pole CSV na liczbę zgodnie z typem kolumny w schemacie
+    (jak mongoimport, daty pozostają tekstem). Wartości, których nie da się
+    zamienić, pozostają tekstem.
+    """
+    try:
+        if kind == 'int':
+            return int(value)
+        if kind == 'float':
+            return float(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    return value
+
+def csv_documents(table, path):
+    """
+    Generator dokumentów MongoDB z pliku CSV. Pola puste są pomijane
+    (w MariaDB mają wartość NULL). Gdy klucz główny z AUTO_INCREMENT nie
+    występuje w pliku, dokument dostaje numer wiersza - taki sam identyfikator,
+    jaki nada MariaDB przy imporcie tego pliku do pustej tabeli.
+    """
+    header, _ = read_header(path)
+    mapped = map_header(table, header)
+    auto_key = None
+    if len(table['primary_key']) == 1 and table['primary_key'][0] not in {c['name'] for c in mapped if c}:
+        column = next(c for c in table['columns'] if c['name'] == table['primary_key'][0])
+        if column['auto_increment']:
+            auto_key = column['name']
+
+    with open(path, newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        next(reader)
+        for row_number, row in enumerate(reader, start=1):
+            document = {auto_key: row_number} if auto_key else {}
+            for value, column in zip(row, mapped):
+                if column is not None and value != '':
+                    document[column['name']] = convert_value(value, column['kind'])
+            yield document
+
+def mongodb_collection_size(db, name):
+    """Funkcja zwracająca rozmiar danych i indeksów kolekcji na dysku"""
+    for stats in db[name].aggregate([{'$collStats': {'storageStats': {}}}]):
+        storage = stats['storageStats']
+        return storage.get('storageSize', 0), storage.get('totalIndexSize', 0)
+    return 0, 0
+
+def load_mongodb_collection(db, table, path, workers=MONGODB_WORKERS, batch_size=MONGODB_BATCH_SIZE):
+    """
+    Funkcja wczytująca plik CSV do kolekcji MongoDB o nazwie tabeli.
+    Dokumenty wysyłane są paczkami batch_size przez insert_many(ordered=False)
+    z workers wątków. Liczba paczek w pamięci jest ograniczona do 2 * workers.
+    Po imporcie budowane są indeksy odpowiadające indeksom tabeli w MariaDB
+    (patrz index_parity), a czas ich budowy mierzony jest osobno. Indeks, którego
+    nie udało się utworzyć (np. UNIQUE na powtarzających się wartościach), nie
+    przerywa importu - błąd trafia do raportu. Zwraca wiersz raportu.
+    """
+    collection = db[table['name']]
+    print(f"MongoDB: loading {path} into {table['name']}")
+    start = time.perf_counter()
+    rows = csv_rows = 0
+    pending = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        batch = []
+        for document in csv_documents(table, path):
+            csv_rows += 1
+            batch.append(document)
+            if len(batch) == batch_size:
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    rows += sum(len(future.result().inserted_ids) for future in done)
+                pending.add(executor.submit(collection.insert_many, batch, ordered=False))
+                batch = []
+        if batch:
+            pending.add(executor.submit(collection.insert_many, batch, ordered=False))
+        rows += sum(len(future.result().inserted_ids) for future in pending)
+    load_time = time.perf_counter() - start
+
+    indexes, skipped = mongodb_index_specs(table)
+    for name, reason in skipped:
+        print(f"MongoDB Warning: index {table['name']}.{name} not created: {reason}")
+    built, errors = 0, []
+    start = time.perf_counter()
+    for index in indexes:
+        try:
+            create_mongodb_index(collection, index)
+            built += 1
+        except PyMongoError as e:
+            errors.append(f"{index['name']}: {e}")
+            print(f"MongoDB Warning: index {table['name']}.{index['name']} not created: {e}")
+    index_time = time.perf_counter() - start
+
+    data_bytes, index_bytes = mongodb_collection_size(db, table['name'])
+    return {
+        'engine': 'MongoDB',
+        'database': db.name,
+        'table': table['name'],
+        'csv_rows': csv_rows,
+        'rows': rows,
+        'skipped_rows': csv_rows - rows,
+        'warnings': None,
+        'load_time': load_time,
+        'rows_per_s': rows / load_time if load_time > 0 else None,
+        'indexes_built': built,
+        'index_errors': '; '.join(errors),
+        'index_build_time': index_time,
+        'data_bytes': data_bytes,
+        'index_bytes': index_bytes,
+        'total_bytes': data_bytes + index_bytes
+    }
+
+def save_load_report(report):
+    """Funkcja wypisująca raport tabeli lub kolekcji i dopisująca go do pliku LOAD_CSV"""
+    print(f"{report['engine']} {report['table']}: {report['rows']} of {report['csv_rows']} rows in "
+          f"{report['load_time']:.2f} s ({report['rows_per_s'] or 0:.0f} rows/s), "
+          f"indexes {report['index_build_time']:.2f} s, {report['total_bytes']} bytes on disk")
+    save_to_csv(report)
+
+def load_database(schema_path, data_dir, engines=ENGINES, recreate=False, overrides=None,
+                  workers=MONGODB_WORKERS, batch_size=MONGODB_BATCH_SIZE, drop_indexes=True):
+    """
+    Funkcja wczytująca wszystkie pliki CSV bazy do wybranych silników.
+    Tabele wczytywane są w kolejności ze schematu. Raport każdej tabeli
+    i kolekcji (wiersze/s, czas budowy indeksów, rozmiar na dysku)
+    wypisywany jest na ekranie i zapisywany w pliku LOAD_CSV zaraz po
+    wczytaniu, więc błąd w kolejnej tabeli nie usuwa wcześniejszych raportów.
+    """
+    schema = parse_schema(schema_path)
+    data_files = find_data_files(schema, data_dir, overrides)
+    reports = []
+
+    if 'mariadb' in engines:
+        create_mariadb_schema(schema, recreate)
+        for table in schema['tables']:
+            if table['name'] in data_files:
+                reports.append(load_mariadb_table(schema['database'], table, data_files[table['name']], drop_indexes))
+                save_load_report(reports[-1])
+
+    if 'mongodb' in engines:
+        client = MongoClient(MONGODB_URI)
+        if recreate:
+            client.drop_database(schema['database'])
+        db = client[schema['database']]
+        for table in schema['tables']:
+            if table['name'] in data_files:
+                reports.append(load_mongodb_collection(db, table, data_files[table['name']], workers, batch_size))
+                save_load_report(reports[-1])
+        client.close()
+
+    return reports
+
+def main():
+    parser = argparse.ArgumentParser(description="Import plików CSV do MariaDB i MongoDB z pomiarem czasu")
+    parser.add_argument('schema', help="plik struktury bazy (Databases/DB-structures/*/*.sql)")
+    parser.add_argument('data_dir', help="katalog z plikami <tabela>.csv")
+    parser.add_argument('--engine', nargs='+', choices=ENGINES, default=ENGINES, help="silniki do importu")
+    parser.add_argument('--recreate', action='store_true', help="usuń istniejącą bazę przed importem")
+    parser.add_argument('--file', nargs='+', default=[], metavar='TABLE=PATH',
+                        help="plik CSV dla tabeli o innej nazwie niż <tabela>.csv")
+    parser.add_argument('--workers', type=int, default=MONGODB_WORKERS, help="wątki insert_many w MongoDB")
+    parser.add_argument('--batch-size', type=int, default=MONGODB_BATCH_SIZE, help="dokumenty w jednym insert_many")
+    parser.add_argument('--keep-indexes', dest='drop_indexes', action='store_false',
+                        help="nie usuwaj indeksów pomocniczych MariaDB na czas importu")
+    args = parser.parse_args()
+
+    overrides = dict(item.split('=', 1) for item in args.file)
+    load_database(args.schema, args.data_dir, engines=args.engine, recreate=args.recreate, overrides=overrides,
+                  workers=args.workers, batch_size=args.batch_size, drop_indexes=args.drop_indexes)
+
+if __name__ == "__main__":
+    main()
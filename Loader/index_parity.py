@@ -0,0 +1,173 @@
+"""
+Moduł tworzący w MongoDB indeksy odpowiadające indeksom z plików struktury MariaDB (DB-structures/*.sql)
+"""
+
+import time
+import argparse
+from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
+from schema_parser import parse_schema
+
+PARITY_CSV = "index_parity.csv"
+
+def implicit_fk_indexes(table):
+    """
+    Funkcja zwracająca indeksy, które InnoDB tworzy samodzielnie dla kluczy
+    obcych bez pasującego indeksu (kolumny klucza nie są początkiem żadnego
+    indeksu ani klucza głównego). Indeks dostaje nazwę pierwszej kolumny klucza.
+    """
+    keys = [table['primary_key']] + [index['columns'] for index in table['indexes']]
+    indexes = []
+    for foreign_key in table['foreign_keys']:
+        columns = foreign_key['columns']
+        if not any(key[:len(columns)] == columns for key in keys):
+            indexes.append({
+                'name': columns[0],
+                'columns': columns,
+                'parts': [{'name': column, 'length': None, 'descending': False} for column in columns],
+                'unique': False,
+                'kind': 'btree'
+            })
+            keys.append(columns)
+    return indexes
+
+def translate_index(table, index, primary=False):
+    """
+    Funkcja tłumacząca indeks MariaDB na indeks MongoDB. Zwraca krotkę
+    (specyfikacja, uwaga) - specyfikacja to słownik {'name', 'keys', 'unique',
+    'partial'} lub None, gdy indeksu nie da się odwzorować, a uwaga opisuje
+    przyczynę lub przybliżenie. Indeksy UNIQUE na kolumnach dopuszczających
+    NULL są częściowe (tylko dokumenty z tymi polami) - MariaDB dopuszcza
+    wiele wierszy z NULL, a import pomija puste pola. Częściowy jest też
+    klucz główny z AUTO_INCREMENT - dokumenty wstawiane później bez tego
+    pola (np. przez testy zapisu) identyfikowane są przez _id.
+    """
+    if index['kind'] != 'btree':
+        return None, f"{index['kind'].upper()} index has no MongoDB equivalent"
+    prefixed = [part['name'] for part in index['parts'] if part['length']]
+    if prefixed and index['unique']:
+        return None, f"unique prefix index on {', '.join(prefixed)} is stricter than a unique index on whole values"
+
+    columns = {column['name']: column for column in table['columns']}
+    if primary:
+        nullable = [name for name in index['columns'] if columns.get(name, {}).get('auto_increment')]
+    else:
+        nullable = [name for name in index['columns'] if not columns.get(name, {}).get('not_null')]
+    spec = {
+        'name': index['name'],
+        'keys': [(part['name'], DESCENDING if part['descending'] else ASCENDING) for part in index['parts']],
+        'unique': index['unique'],
+        'partial': {name: {'$exists': True} for name in nullable} if index['unique'] and nullable else None
+    }
+    note = f"prefix length dropped on {', '.join(prefixed)}" if prefixed else ''
+    return spec, note
+
+def table_indexes(table):
+    """
+    Funkcja zwracająca wszystkie indeksy tabeli MariaDB: klucz główny (jako
+    indeks unikalny, MongoDB indeksuje tylko _id), indeksy ze schematu
+    i indeksy tworzone przez InnoDB dla kluczy obcych.
+    """
+    indexes = []
+    if table['primary_key']:
+        indexes.append(({
+            'name': 'pk_' + '_'.join(table['primary_key']),
+            'columns': table['primary_key'],
+            'parts': [{'name': column, 'length': None, 'descending': False} for column in table['primary_key']],
+            'unique': True,
+            'kind': 'btree'
+        }, True))
+    indexes += [(index, False) for index in table['indexes'] + implicit_fk_indexes(table)]
+    return indexes
+
+def mongodb_index_specs(table):
+    """
+    Funkcja zwracająca krotkę (specyfikacje indeksów MongoDB, nieprzetłumaczone
+    indeksy) dla tabeli - nieprzetłumaczone jako lista krotek (nazwa, przyczyna).
+    """
+    specs, skipped = [], []
+    for index, primary in table_indexes(table):
+        spec, note = translate_index(table, index, primary)
+        if spec is None:
+            skipped.append((index['name'], note))
+        else:
+            specs.append(spec)
+    return specs, skipped
+
+def create_mongodb_index(collection, spec):
+    """Funkcja tworząca indeks MongoDB ze specyfikacji (patrz translate_index)"""
+    options = {'name': spec['name'], 'unique': spec['unique']}
+    if spec['partial']:
+        options['partialFilterExpression'] = spec['partial']
+    collection.create_index(spec['keys'], **options)
+
+def apply_index_parity(schema_path, dry_run=False):
+    """
+    Funkcja tworząca w MongoDB indeksy odpowiadające indeksom tabel z pliku
+    struktury (kolekcja o nazwie tabeli). Indeks o tym samym kluczu, który już
+    istnieje, jest pomijany. Wynik dla każdego indeksu (created, exists,
+    untranslated, missing_collection, error) wypisywany jest na ekranie
+    i zapisywany w pliku PARITY_CSV. Zwraca listę wierszy raportu.
+    """
+    # import wewnątrz funkcji - data_loader korzysta z tłumaczenia indeksów tego modułu
+    from data_loader import MONGODB_URI, save_to_csv
+
+    schema = parse_schema(schema_path)
+    client = MongoClient(MONGODB_URI)
+    db = client[schema['database']]
+    collections = set(db.list_collection_names())
+    report = []
+    for table in schema['tables']:
+        existing = {}
+        if table['name'] in collections:
+            existing = {tuple(info['key']): name for name, info in db[table['name']].index_information().items()}
+        for index, primary in table_indexes(table):
+            spec, note = translate_index(table, index, primary)
+            row = {
+                'database': schema['database'],
+                'table': table['name'],
+                'index': index['name'],
+                'mongodb_keys': ', '.join(f"{field}: {direction}" for field, direction in spec['keys']) if spec else '',
+                'unique': index['unique'],
+                'status': None,
+                'build_time': None,
+                'note': note
+            }
+            if spec is None:
+                row['status'] = 'untranslated'
+            elif table['name'] not in collections:
+                row['status'] = 'missing_collection'
+            elif tuple(spec['keys']) in existing:
+                row['status'] = 'exists'
+                row['note'] = f"as {existing[tuple(spec['keys'])]}"
+            elif dry_run:
+                row['status'] = 'planned'
+            else:
+                start = time.perf_counter()
+                try:
+                    create_mongodb_index(db[table['name']], spec)
+                    row['status'] = 'created'
+                    row['build_time'] = time.perf_counter() - start
+                except PyMongoError as e:
+                    row['status'] = 'error'
+                    row['note'] = str(e)
+            print(f"{table['name']}.{index['name']}: {row['status']} {row['mongodb_keys']} {row['note']}".rstrip())
+            save_to_csv(row, PARITY_CSV)
+            report.append(row)
+    client.close()
+
+    problems = [row for row in report if row['status'] in ('untranslated', 'missing_collection', 'error')]
+    for row in problems:
+        print(f"Not created: {row['table']}.{row['index']} ({row['status']}) {row['note']}".rstrip())
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Tworzenie w MongoDB indeksów odpowiadających strukturze MariaDB")
+    parser.add_argument('schema', nargs='+', help="pliki struktury baz (Databases/DB-structures/*/*.sql)")
+    parser.add_argument('--dry-run', action='store_true', help="tylko wypisz indeksy, bez ich tworzenia")
+    args = parser.parse_args()
+    for schema_path in args.schema:
+        apply_index_parity(schema_path, args.dry_run)
+
+if __name__ == "__main__":
+    main()
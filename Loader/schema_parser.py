@@ -0,0 +1,191 @@
+"""
+Moduł odczytujący struktury baz z plików DB-structures/*.sql (tabele, kolumny, klucze i indeksy)
+"""
+
+import re
+
+# Typy kolumn MariaDB zamieniane przy imporcie do MongoDB na liczby całkowite i zmiennoprzecinkowe
+INTEGER_TYPES = ('TINYINT', 'SMALLINT', 'MEDIUMINT', 'INT', 'INTEGER', 'BIGINT')
+FLOAT_TYPES = ('DECIMAL', 'NUMERIC', 'FLOAT', 'DOUBLE', 'REAL')
+
+def strip_comments(sql):
+    """Funkcja usuwająca komentarze -- oraz /* */ z tekstu SQL"""
+    sql = re.sub(r'/\*.*?\*/', '', sql, flags=re.S)
+    return re.sub(r'--[^\n]*', '', sql)
+
+def split_statements(sql):
+    """Funkcja dzieląca skrypt SQL na polecenia (bez komentarzy i pustych poleceń)"""
+    return [statement.strip() for statement in strip_comments(sql).split(';') if statement.strip()]
+
+def split_top_level(body):
+    """Funkcja dzieląca treść CREATE TABLE po przecinkach leżących poza nawiasami"""
+    items, depth, current = [], 0, ''
+    for char in body:
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        if char == ',' and depth == 0:
+            items.append(current.strip())
+            current = ''
+        else:
+            current += char
+    if current.strip():
+        items.append(current.strip())
+    return items
+
+def parse_columns(columns):
+    """
+    Funkcja zamieniająca listę kolumn z nawiasu (np. "last_name, first_name(10) DESC")
+    na listę nazw - bez długości prefiksu i kierunku sortowania.
+    """
+    names = []
+    for column in split_top_level(columns):
+        name = re.sub(r'\(\d+\)', '', column).split()[0]
+        names.append(name.strip('`'))
+    return names
+
+def parse_key_parts(columns):
+    """
+    Funkcja zwracająca części klucza indeksu z nawiasu jako listę słowników
+    {'name', 'length' (długość prefiksu lub None), 'descending'}.
+    """
+    parts = []
+    for column in split_top_level(columns):
+        match = re.match(r'`?(\w+)`?\s*(?:\((\d+)\))?\s*(ASC|DESC)?', column.strip(), re.I)
+        parts.append({
+            'name': match.group(1),
+            'length': int(match.group(2)) if match.group(2) else None,
+            'descending': (match.group(3) or '').upper() == 'DESC'
+        })
+    return parts
+
+def make_index(name, columns, unique=False, kind='btree'):
+    """
+    Funkcja tworząca opis indeksu: nazwa, kolumny, części klucza (patrz
+    parse_key_parts), UNIQUE i rodzaj (btree, fulltext lub spatial).
+    """
+    parts = parse_key_parts(columns)
+    return {
+        'name': name or parts[0]['name'],
+        'columns': [part['name'] for part in parts],
+        'parts': parts,
+        'unique': unique,
+        'kind': kind
+    }
+
+def column_kind(column_type):
+    """Funkcja zwracająca rodzaj wartości kolumny: int, float lub str"""
+    base = column_type.upper().split('(')[0]
+    if base in INTEGER_TYPES:
+        return 'int'
+    if base in FLOAT_TYPES:
+        return 'float'
+    return 'str'
+
+def parse_table(name, body):
+    """
+    Funkcja odczytująca definicję tabeli. Zwraca słownik z kolumnami,
+    kluczem głównym, indeksami (także UNIQUE, patrz make_index) i kluczami obcymi.
+    """
+    table = {'name': name, 'columns': [], 'primary_key': [], 'indexes': [], 'foreign_keys': []}
+    for item in split_top_level(body):
+        upper = item.upper()
+        match = re.match(r'(?:CONSTRAINT\s+\S+\s+)?FOREIGN\s+KEY\s*\((.*?)\)\s*REFERENCES\s+`?(\w+)`?\s*\((.*?)\)',
+                         item, re.I | re.S)
+        if match:
+            table['foreign_keys'].append({
+                'columns': parse_columns(match.group(1)),
+                'ref_table': match.group(2),
+                'ref_columns': parse_columns(match.group(3))
+            })
+            continue
+
+        match = re.match(r'(?:CONSTRAINT\s+\S+\s+)?PRIMARY\s+KEY\s*\((.*)\)', item, re.I | re.S)
+        if match:
+            table['primary_key'] = parse_columns(match.group(1))
+            continue
+
+        match = re.match(r'(?:CONSTRAINT\s+\S+\s+)?(UNIQUE\s+|FULLTEXT\s+|SPATIAL\s+)?(?:INDEX|KEY)\s*`?(\w*)`?\s*\((.*)\)',
+                         item, re.I | re.S)
+        if not match:
+            match = re.match(r'(?:CONSTRAINT\s+\S+\s+)?(UNIQUE|FULLTEXT|SPATIAL)()\s*\((.*)\)', item, re.I | re.S)
+        if match:
+            modifier = (match.group(1) or '').strip().upper()
+            table['indexes'].append(make_index(
+                match.group(2), match.group(3), unique=modifier == 'UNIQUE',
+                kind=modifier.lower() if modifier in ('FULLTEXT', 'SPATIAL') else 'btree'
+            ))
+            continue
+
+        parts = item.split()
+        column = {
+            'name': parts[0].strip('`'),
+            'type': parts[1],
+            'kind': column_kind(parts[1]),
+            'auto_increment': 'AUTO_INCREMENT' in upper,
+            'not_null': 'NOT NULL' in upper
+        }
+        table['columns'].append(column)
+        if 'PRIMARY KEY' in upper:
+            table['primary_key'] = [column['name']]
+        elif re.search(r'\bUNIQUE\b', upper):
+            # MariaDB nadaje indeksowi UNIQUE zdefiniowanemu przy kolumnie nazwę kolumny
+            table['indexes'].append(make_index(column['name'], column['name'], unique=True))
+    return table
+
+def parse_schema(path):
+    """
+    Funkcja odczytująca plik struktury bazy. Zwraca słownik:
+    {'database': nazwa bazy, 'statements': polecenia SQL pliku,
+     'tables': lista tabel w kolejności definicji (patrz parse_table)}.
+    Indeksy z osobnych poleceń CREATE INDEX dopisywane są do swoich tabel.
+    """
+    with open(path, encoding='utf-8') as file:
+        statements = split_statements(file.read())
+
+    schema = {'database': None, 'statements': statements, 'tables': []}
+    tables = {}
+    for statement in statements:
+        match = re.match(r'CREATE\s+DATABASE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?(\w+)`?', statement, re.I)
+        if match:
+            schema['database'] = match.group(1)
+            continue
+
+        match = re.match(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?(\w+)`?\s*\((.*)\)', statement, re.I | re.S)
+        if match:
+            table = parse_table(match.group(1), match.group(2))
+            tables[table['name']] = table
+            schema['tables'].append(table)
+            continue
+
+        match = re.match(r'CREATE\s+(UNIQUE\s+|FULLTEXT\s+|SPATIAL\s+)?INDEX\s+`?(\w+)`?\s+ON\s+`?(\w+)`?\s*\((.*)\)',
+                         statement, re.I | re.S)
+        if match:
+            modifier = (match.group(1) or '').strip().upper()
+            tables[match.group(3)]['indexes'].append(make_index(
+                match.group(2), match.group(4), unique=modifier == 'UNIQUE',
+                kind=modifier.lower() if modifier in ('FULLTEXT', 'SPATIAL') else 'btree'
+            ))
+    return schema
+
+def key_parts_sql(index):
+    """Funkcja zwracająca listę kolumn indeksu w postaci SQL (z długością prefiksu i kierunkiem)"""
+    return ', '.join(
+        f"`{part['name']}`" + (f"({part['length']})" if part['length'] else '') + (' DESC' if part['descending'] else '')
+        for part in index['parts']
+    )
+
+def fk_backing_indexes(table):
+    """
+    Funkcja zwracająca nazwy indeksów, na których opierają się klucze obce
+    tabeli (kolumny klucza są początkiem kolumn indeksu). InnoDB nie pozwala
+    usunąć takiego indeksu, dopóki istnieje klucz obcy.
+    """
+    names = set()
+    for foreign_key in table['foreign_keys']:
+        for index in table['indexes']:
+            if index['columns'][:len(foreign_key['columns'])] == foreign_key['columns']:
+                names.add(index['name'])
+                break
+    return names
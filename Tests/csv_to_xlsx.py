@@ -1,8 +1,14 @@
+import os
+import sqlite3
+import argparse
 import pandas as pd
 
 # Stałe ścieżki dla plików
 CSV_FILE_PATH = "./system_stats.csv"
 XLSX_FILE_PATH = "./system_stats.xlsx"
+RESULTS_DB_PATH = "./benchmark_results.sqlite"
+# Tabele metadanych bazy wyników (pozostałe tabele zawierają wyniki pomiarów)
+METADATA_TABLES = ('runs', 'run_engines')
 
 def csv_to_xlsx():
     """
@@ -24,5 +30,48 @@ def csv_to_xlsx():
     except Exception as e:
         print(f"Wystąpił nieoczekiwany błąd: {e}")
 
+def results_to_xlsx(run_ids=None, since=None):
+    """
+    Zapisuje wyniki z bazy wyników do pliku XLSX - jeden arkusz na tabelę.
+    Eksportowane są przebiegi run_ids, przebiegi rozpoczęte od chwili since
+    (czas w formacie ISO), a gdy nie podano żadnego z nich - ostatni przebieg.
+    """
+
+    try:
+        connection = sqlite3.connect(RESULTS_DB_PATH)
+        runs = pd.read_sql_query("SELECT * FROM runs ORDER BY started_at", connection)
+        if run_ids is None and since is not None:
+            run_ids = runs.loc[runs['started_at'] >= since, 'run_id'].tolist()
+        elif run_ids is None:
+            run_ids = runs['run_id'].tail(1).tolist()
+        print(f"Eksport przebiegów: {', '.join(run_ids)}")
+
+        tables = [name for (name,) in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )]
+        placeholders = ', '.join('?' for _ in run_ids)
+        with pd.ExcelWriter(XLSX_FILE_PATH, engine='openpyxl') as writer:
+            for table in tables:
+                data = pd.read_sql_query(
+                    f'SELECT * FROM "{table}" WHERE run_id IN ({placeholders})', connection, params=run_ids
+                )
+                # usunięcie kolumn pustych dla wybranych przebiegów
+                if table not in METADATA_TABLES:
+                    data = data.dropna(axis=1, how='all')
+                data.to_excel(writer, sheet_name=table[:31], index=False)
+        connection.close()
+        print("Konwersja zakończona sukcesem!")
+
+    except Exception as e:
+        print(f"Wystąpił nieoczekiwany błąd: {e}")
+
 if __name__ == "__main__":
-    csv_to_xlsx()
+    parser = argparse.ArgumentParser(description="Eksport wyników testów do pliku XLSX")
+    parser.add_argument('--run-id', nargs='+', help="identyfikatory przebiegów z bazy wyników")
+    parser.add_argument('--since', help="eksport przebiegów rozpoczętych od podanego czasu (YYYY-MM-DDTHH:MM:SS)")
+    args = parser.parse_args()
+
+    if os.path.exists(RESULTS_DB_PATH):
+        results_to_xlsx(args.run_id, args.since)
+    else:
+        csv_to_xlsx()
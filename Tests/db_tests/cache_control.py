@@ -0,0 +1,112 @@
+"""
+Moduł sterujący stanem pamięci podręcznych silników i systemu przed pomiarem (tryby cold / warm)
+"""
+
+import os
+import time
+import subprocess
+import mysql.connector
+from db_connections import get_mariadb_connection, get_mongodb_database, close_all
+
+# warm - przed pomiarami zapytanie wykonywane jest warmup razy,
+# cold - przed każdym pomiarem silnik jest restartowany, a cache stron systemu opróżniany
+CACHE_MODES = ['warm', 'cold']
+# Polecenia restartujące serwery (wymagają uprawnień roota)
+RESTART_COMMANDS = {
+    'MariaDB': ['systemctl', 'restart', 'mariadb'],
+    'MongoDB': ['systemctl', 'restart', 'mongod']
+}
+DROP_CACHES_PATH = '/proc/sys/vm/drop_caches'
+# Maksymalny czas oczekiwania na gotowość serwera po restarcie (w sekundach)
+READY_TIMEOUT = 120
+READY_POLL_INTERVAL = 0.5
+
+def _mariadb_set_global(database_name, statement):
+    """
+    Funkcja wykonująca polecenie SET GLOBAL w MariaDB. Brak uprawnień
+    nie przerywa testu - wypisywane jest tylko ostrzeżenie.
+    """
+    conn = None
+    try:
+        conn, _ = get_mariadb_connection(database_name)
+        cursor = conn.cursor()
+        cursor.execute(statement)
+        cursor.close()
+    except mysql.connector.Error as err:
+        print(f"MariaDB Warning: {statement} failed: {err}")
+    finally:
+        if conn is not None:
+            conn.close()
+
+def wait_until_ready(engine, database_name, timeout=READY_TIMEOUT):
+    """
+    Funkcja czekająca, aż serwer po restarcie zacznie przyjmować połączenia.
+    Nawiązane połączenie zostaje w puli, więc pomiar nie obejmuje jego otwarcia.
+    Zwraca czas oczekiwania w sekundach.
+    """
+    start = time.perf_counter()
+    while True:
+        try:
+            if engine == 'MariaDB':
+                conn, _ = get_mariadb_connection(database_name)
+                conn.close()
+            else:
+                get_mongodb_database(database_name)
+            return time.perf_counter() - start
+        except Exception as e:
+            if time.perf_counter() - start > timeout:
+                raise RuntimeError(f"{engine} not ready after {timeout} s: {e}")
+            time.sleep(READY_POLL_INTERVAL)
+
+def drop_page_cache():
+    """Funkcja zapisująca brudne strony na dysk i opróżniająca cache stron systemu Linux"""
+    os.sync()
+    with open(DROP_CACHES_PATH, 'w') as file:
+        file.write('3\n')
+
+def make_cold(engine, database_name):
+    """
+    Funkcja przygotowująca zimny start przed pomiarem: restartuje serwer
+    (opróżniając buffer pool InnoDB lub cache WiredTiger), opróżnia cache
+    stron systemu i czeka na gotowość serwera. MariaDB domyślnie zapisuje
+    zawartość buffer poola przy zamknięciu i wczytuje ją przy starcie,
+    dlatego zapis jest wyłączany przed restartem, a wczytywanie przerywane po nim.
+    Błąd restartu lub opróżniania cache przerywa test, aby ciepłe wyniki
+    nie zostały zapisane jako zimne. Zwraca czas przygotowania w sekundach.
+    """
+    start = time.perf_counter()
+    if engine == 'MariaDB':
+        _mariadb_set_global(database_name, "SET GLOBAL innodb_buffer_pool_dump_at_shutdown = OFF")
+    # połączenia z pul nie przetrwają restartu serwera
+    close_all()
+    subprocess.run(RESTART_COMMANDS[engine], check=True)
+    drop_page_cache()
+    wait_until_ready(engine, database_name)
+    if engine == 'MariaDB':
+        _mariadb_set_global(database_name, "SET GLOBAL innodb_buffer_pool_load_abort = ON")
+    return time.perf_counter() - start
+
+def engine_cache_size(engine, database_name):
+    """
+    Funkcja zwracająca rozmiar pamięci podręcznej silnika w bajtach:
+    innodb_buffer_pool_size w MariaDB i maksymalny rozmiar cache WiredTiger w MongoDB.
+    Przy błędzie zwraca None.
+    """
+    conn = None
+    try:
+        if engine == 'MariaDB':
+            conn, _ = get_mariadb_connection(database_name)
+            cursor = conn.cursor()
+            cursor.execute("SELECT @@innodb_buffer_pool_size")
+            size = int(cursor.fetchone()[0])
+            cursor.close()
+            return size
+        db, _ = get_mongodb_database(database_name)
+        status = db.command('serverStatus')
+        return int(status['wiredTiger']['cache']['maximum bytes configured'])
+    except Exception as e:
+        print(f"{engine}: cannot read cache size: {e}")
+        return None
+    finally:
+        if conn is not None:
+            conn.close()
@@ -0,0 +1,180 @@
+"""
+Moduł porównujący czasy zapytań z dwóch przebiegów zapisanych w bazie wyników (wykrywanie regresji)
+"""
+
+import sys
+import json
+import math
+import sqlite3
+import argparse
+import statistics
+from latency_stats import mann_whitney_u, cliffs_delta
+from results_store import RESULTS_DB
+from testing_functions import save_to_csv
+
+# Domyślny próg zmiany mediany (względem przebiegu bazowego) i poziom istotności
+REGRESSION_THRESHOLD = 0.10
+SIGNIFICANCE_LEVEL = 0.05
+COMPARE_CSV = "compare_runs.csv"
+
+def resolve_run_id(connection, run_id):
+    """
+    Funkcja zwracająca pełny identyfikator przebiegu na podstawie jego
+    początku (jak skrót commita) lub słów 'last' / 'previous'.
+    """
+    if run_id in ('last', 'previous'):
+        offset = 0 if run_id == 'last' else 1
+        row = connection.execute(
+            "SELECT run_id FROM runs ORDER BY started_at DESC LIMIT 1 OFFSET ?", (offset,)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"No {run_id} run in the results store")
+        return row[0]
+
+    matches = [row[0] for row in connection.execute(
+        "SELECT run_id FROM runs WHERE run_id LIKE ?", (f"{run_id}%",)
+    )]
+    if len(matches) != 1:
+        raise ValueError(f"Run id '{run_id}' matches {len(matches)} runs")
+    return matches[0]
+
+def load_samples(connection, run_id):
+    """
+    Funkcja zwracająca czasy poprawnych pomiarów przebiegu pogrupowane
+    według (silnik, identyfikator zapytania).
+    """
+    samples = {}
+    rows = connection.execute(
+        "SELECT database, query_id, query_time FROM system_stats "
+        "WHERE run_id = ? AND query_time IS NOT NULL", (run_id,)
+    )
+    for engine, query_id, query_time in rows:
+        samples.setdefault((engine, query_id), []).append(query_time)
+    return samples
+
+def config_changes(connection, baseline_id, candidate_id):
+    """
+    Funkcja zwracająca listę różnic wersji i konfiguracji silników między
+    przebiegami, aby zmiana czasów mogła być powiązana ze zmianą ustawień.
+    """
+    def engines(run_id):
+        return {
+            engine: (version, json.loads(config) if config else {})
+            for engine, version, config in connection.execute(
+                "SELECT engine, version, config FROM run_engines WHERE run_id = ?", (run_id,)
+            )
+        }
+
+    baseline, candidate = engines(baseline_id), engines(candidate_id)
+    changes = []
+    for engine in sorted(set(baseline) & set(candidate)):
+        base_version, base_config = baseline[engine]
+        cand_version, cand_config = candidate[engine]
+        if base_version != cand_version:
+            changes.append(f"{engine} version: {base_version} -> {cand_version}")
+        for name in sorted(set(base_config) | set(cand_config)):
+            if base_config.get(name) != cand_config.get(name):
+                changes.append(f"{engine} {name}: {base_config.get(name)} -> {cand_config.get(name)}")
+    return changes
+
+def compare_samples(baseline, candidate, threshold=REGRESSION_THRESHOLD, alpha=SIGNIFICANCE_LEVEL):
+    """
+    Funkcja porównująca czasy jednego zapytania z dwóch przebiegów.
+    Zmiana to względna różnica median. Status regression / improvement
+    nadawany jest, gdy test Manna-Whitneya jest istotny na poziomie alpha,
+    a zmiana mediany przekracza threshold; w pozostałych przypadkach
+    status to no_change.
+    """
+    baseline_median = statistics.median(baseline)
+    candidate_median = statistics.median(candidate)
+    change = candidate_median / baseline_median - 1 if baseline_median else None
+    u_statistic, p_value = mann_whitney_u(candidate, baseline)
+    # delta dodatnia - kandydat wolniejszy
+    delta = cliffs_delta(candidate, baseline)
+
+    status = 'no_change'
+    if change is not None and p_value < alpha:
+        if change > threshold:
+            status = 'regression'
+        elif change < -threshold:
+            status = 'improvement'
+
+    return {
+        'baseline_samples': len(baseline),
+        'candidate_samples': len(candidate),
+        'baseline_median': baseline_median,
+        'candidate_median': candidate_median,
+        'change': change,
+        'mann_whitney_u': u_statistic,
+        'p_value': p_value,
+        'cliffs_delta': delta,
+        'status': status
+    }
+
+def compare_runs(baseline_id, candidate_id, threshold=REGRESSION_THRESHOLD, alpha=SIGNIFICANCE_LEVEL,
+                 path=RESULTS_DB):
+    """
+    Funkcja porównująca wszystkie zapytania wykonane w obu przebiegach.
+    Wynik dla każdego zapytania wypisywany jest na ekranie i zapisywany
+    w pliku COMPARE_CSV. Zwraca listę wierszy porównania.
+    """
+    connection = sqlite3.connect(path)
+    try:
+        baseline_id = resolve_run_id(connection, baseline_id)
+        candidate_id = resolve_run_id(connection, candidate_id)
+        print(f"Baseline run {baseline_id}, candidate run {candidate_id}")
+        for change in config_changes(connection, baseline_id, candidate_id):
+            print(f"Changed: {change}")
+
+        baseline_samples = load_samples(connection, baseline_id)
+        candidate_samples = load_samples(connection, candidate_id)
+    finally:
+        connection.close()
+
+    results = []
+    for key in sorted(set(baseline_samples) & set(candidate_samples)):
+        engine, query_id = key
+        row = {
+            'baseline_run_id': baseline_id,
+            'candidate_run_id': candidate_id,
+            'database': engine,
+            'query_id': query_id,
+            'threshold': threshold,
+            'alpha': alpha
+        }
+        row.update(compare_samples(baseline_samples[key], candidate_samples[key], threshold, alpha))
+        # najmniejsze możliwe p testu dla tej liczby pomiarów
+        if 2 / math.comb(row['baseline_samples'] + row['candidate_samples'], row['baseline_samples']) >= alpha:
+            print(f"{engine} {query_id}: too few samples for significance at alpha={alpha}, "
+                  f"use more --repetitions")
+        change = f"{row['change']:+.1%}" if row['change'] is not None else "n/a"
+        print(f"{engine} {query_id}: {row['baseline_median']:.6f} s -> {row['candidate_median']:.6f} s "
+              f"({change}, p={row['p_value']:.4f}, delta={row['cliffs_delta']:+.2f}) {row['status']}")
+        save_to_csv(row, COMPARE_CSV)
+        results.append(row)
+
+    for key in sorted(set(baseline_samples) ^ set(candidate_samples)):
+        print(f"{key[0]} {key[1]}: measured in only one of the runs, skipped")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Porównanie czasów zapytań z dwóch przebiegów testów")
+    parser.add_argument('baseline', help="run_id przebiegu bazowego (lub jego początek, 'last', 'previous')")
+    parser.add_argument('candidate', help="run_id przebiegu porównywanego (lub jego początek, 'last', 'previous')")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="minimalna względna zmiana mediany uznawana za regresję (domyślnie 0.10 = 10%%)")
+    parser.add_argument('--alpha', type=float, default=SIGNIFICANCE_LEVEL,
+                        help="poziom istotności testu Manna-Whitneya")
+    parser.add_argument('--db', default=RESULTS_DB, help="plik bazy wyników")
+    args = parser.parse_args()
+
+    results = compare_runs(args.baseline, args.candidate, args.threshold, args.alpha, args.db)
+    regressions = [row for row in results if row['status'] == 'regression']
+    improvements = [row for row in results if row['status'] == 'improvement']
+    print(f"{len(regressions)} regressions, {len(improvements)} improvements, "
+          f"{len(results) - len(regressions) - len(improvements)} unchanged")
+    # niezerowy kod wyjścia pozwala przerwać skrypt przy regresji
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
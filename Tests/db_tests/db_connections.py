@@ -0,0 +1,76 @@
+"""
+Moduł utrzymujący współdzielone połączenia do baz danych na czas całego testu
+"""
+
+import time
+import threading
+from mysql.connector import pooling
+from pymongo import MongoClient
+
+# Stałe parametry połączeń
+MARIADB_CONFIG = {
+    'host': 'localhost',
+    'user': 'bot',
+    'password': 'P@ssw0rd'
+}
+MARIADB_POOL_SIZE = 4
+MONGODB_URI = 'mongodb://localhost:27017/'
+
+_mariadb_pools = {}
+_mongodb_clients = {}
+# Blokada tworzenia pul i klientów - pierwsze wywołania mogą nastąpić równocześnie w wielu wątkach
+# (np. klienci testu obciążeniowego), a bez niej każdy wątek utworzyłby własnego klienta
+_init_lock = threading.Lock()
+
+def get_mariadb_connection(database_name, pool_name=None, pool_size=MARIADB_POOL_SIZE):
+    """
+    Funkcja pobierająca połączenie z puli MariaDB dla danej bazy.
+    Pula tworzona jest przy pierwszym wywołaniu. Domyślnie jest jedna pula
+    na bazę, a pool_name pozwala utworzyć pule wydzielone (np. dla wątków
+    testu obciążeniowego). Zwraca krotkę
+    (połączenie, czas uzyskania połączenia w nanosekundach).
+    Połączenie należy oddać do puli przez conn.close().
+    """
+    start_ns = time.perf_counter_ns()
+    pool_name = pool_name or database_name
+    pool = _mariadb_pools.get(pool_name)
+    if pool is None:
+        with _init_lock:
+            pool = _mariadb_pools.get(pool_name)
+            if pool is None:
+                pool = pooling.MySQLConnectionPool(
+                    pool_name=f"bench_{pool_name}",
+                    pool_size=pool_size,
+                    database=database_name,
+                    **MARIADB_CONFIG
+                )
+                _mariadb_pools[pool_name] = pool
+    conn = pool.get_connection()
+    return conn, time.perf_counter_ns() - start_ns
+
+def get_mongodb_database(database_name):
+    """
+    Funkcja zwracająca bazę MongoDB ze współdzielonego klienta.
+    Klient tworzony jest raz na bazę (także przy równoczesnym pierwszym
+    wywołaniu w wielu wątkach), a pierwsze połączenie wymuszane
+    komendą ping. Zwraca krotkę (baza, czas uzyskania połączenia w nanosekundach).
+    """
+    start_ns = time.perf_counter_ns()
+    client = _mongodb_clients.get(database_name)
+    if client is None:
+        with _init_lock:
+            client = _mongodb_clients.get(database_name)
+            if client is None:
+                client = MongoClient(MONGODB_URI, serverSelectionTimeoutMS=5000)
+                client.admin.command('ping')
+                _mongodb_clients[database_name] = client
+    return client[database_name], time.perf_counter_ns() - start_ns
+
+def close_all():
+    """Funkcja zamykająca wszystkie współdzielone połączenia"""
+    for client in _mongodb_clients.values():
+        client.close()
+    _mongodb_clients.clear()
+    # MySQLConnectionPool nie udostępnia zamknięcia puli - połączenia
+    # zamykane są po zwolnieniu referencji
+    _mariadb_pools.clear()
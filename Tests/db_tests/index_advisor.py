@@ -0,0 +1,415 @@
+"""
+Moduł doradcy indeksów - propozycje indeksów na podstawie planów zapytań i ich pomiar (z indeksem i bez)
+"""
+
+import re
+import json
+import time
+import statistics
+import mysql.connector
+from db_connections import get_mariadb_connection, get_mongodb_database
+from testing_functions import test_mariadb_query, run_mongodb_query_set, save_to_csv
+from query_registry import engine_queries
+
+# Maksymalna liczba kolumn indeksu złożonego
+MAX_INDEX_COLUMNS = 3
+# Przedrostek nazw indeksów tworzonych przez doradcę (MariaDB ogranicza nazwy do 64 znaków)
+INDEX_PREFIX = 'advisor_'
+MAX_INDEX_NAME = 64
+# Rodzaje dostępu do tabeli w MariaDB oznaczające przegląd całej tabeli lub całego indeksu
+FULL_SCAN_ACCESS = ('ALL', 'index')
+# Słowa, które po nazwie tabeli w FROM / JOIN nie są jej aliasem
+SQL_KEYWORDS = {'WHERE', 'JOIN', 'ON', 'GROUP', 'ORDER', 'LEFT', 'RIGHT', 'INNER', 'OUTER', 'CROSS',
+                'NATURAL', 'LIMIT', 'HAVING', 'UNION', 'USING', 'STRAIGHT_JOIN'}
+# Operatory MongoDB traktowane jak równość (pole może być początkiem indeksu złożonego)
+MONGODB_EQUALITY_OPERATORS = ('$eq', '$in')
+ADVICE_CSV = "index_advice.csv"
+
+def index_name(columns):
+    """Funkcja zwracająca nazwę indeksu doradcy dla listy kolumn"""
+    name = INDEX_PREFIX + '_'.join(column.replace('.', '_') for column in columns)
+    return name[:MAX_INDEX_NAME]
+
+def propose_columns(equality, other, order=()):
+    """
+    Funkcja zwracająca listy kolumn proponowanych indeksów dla predykatów
+    jednej tabeli: indeks jednokolumnowy dla każdej kolumny warunku oraz
+    indeks złożony - kolumny porównywane przez równość, a za nimi kolumny
+    sortowania / grupowania lub pierwsza kolumna zakresu.
+    """
+    candidates = [[column] for column in dict.fromkeys(list(equality) + list(other))]
+    compound = list(dict.fromkeys(list(equality) + (list(order) or list(other)[:1])))[:MAX_INDEX_COLUMNS]
+    if len(compound) > 1:
+        candidates.append(compound)
+    elif not candidates and order:
+        candidates.append(list(dict.fromkeys(order))[:MAX_INDEX_COLUMNS])
+    return candidates
+
+def covered(columns, existing):
+    """Funkcja sprawdzająca, czy istniejący indeks zaczyna się od podanych kolumn"""
+    return any(index[:len(columns)] == columns for index in existing)
+
+def add_candidate(candidates, engine, table, columns, query_id):
+    """Funkcja dopisująca propozycję indeksu (lub zapytanie do istniejącej propozycji)"""
+    key = (engine, table, tuple(columns))
+    if key not in candidates:
+        candidates[key] = {'engine': engine, 'table': table, 'columns': list(columns),
+                           'name': index_name(columns), 'queries': []}
+    if query_id not in candidates[key]['queries']:
+        candidates[key]['queries'].append(query_id)
+
+def mariadb_aliases(sql):
+    """Funkcja zwracająca słownik alias -> tabela dla tabel z klauzul FROM i JOIN zapytania"""
+    aliases = {}
+    for match in re.finditer(r'\b(?:FROM|JOIN)\s+`?(\w+)`?(?:\s+(?:AS\s+)?`?(\w+)`?)?', sql, re.I):
+        table, alias = match.group(1), match.group(2)
+        if table.upper() == 'SELECT':
+            continue
+        aliases[table] = table
+        if alias and alias.upper() not in SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+def _walk_mariadb_plan(node, scans, conditions, sort_keys):
+    """
+    Funkcja przechodząca plan EXPLAIN FORMAT=JSON i zbierająca aliasy tabel
+    przeglądanych w całości, warunki (attached_condition) i klucze sortowania.
+    """
+    if isinstance(node, list):
+        for item in node:
+            _walk_mariadb_plan(item, scans, conditions, sort_keys)
+        return
+    if not isinstance(node, dict):
+        return
+    if node.get('access_type') in FULL_SCAN_ACCESS and 'table_name' in node:
+        scans.add(node['table_name'])
+    for key, value in node.items():
+        if key == 'attached_condition' and isinstance(value, str):
+            conditions.append(value)
+        elif key == 'sort_key' and isinstance(value, str):
+            sort_keys.append(value)
+        else:
+            _walk_mariadb_plan(value, scans, conditions, sort_keys)
+
+def mariadb_predicates(text):
+    """
+    Funkcja zwracająca listę krotek (alias, kolumna, rodzaj) dla kolumn
+    występujących w warunku z planu MariaDB. Rodzaj to eq dla porównania
+    z wartością (= lub IN), join dla porównania z kolumną innej tabeli
+    i range dla pozostałych operatorów.
+    """
+    predicates = []
+    for match in re.finditer(r'`?(\w+)`?\.`?(\w+)`?(?!`?\.)', text):
+        rest = text[match.end():]
+        if re.match(r'\s*(=|<=>)\s*`?\w+`?\.`?\w+', rest) or \
+                re.search(r'`?\w+`?\.`?\w+`?\s*(=|<=>)\s*$', text[:match.start()]):
+            kind = 'join'
+        elif re.match(r'\s*(=|<=>)|\s+in\s*\(', rest, re.I):
+            kind = 'eq'
+        else:
+            kind = 'range'
+        predicates.append((match.group(1), match.group(2), kind))
+    return predicates
+
+def mariadb_existing_indexes(cursor, table):
+    """Funkcja zwracająca listę kolumn istniejących indeksów tabeli MariaDB"""
+    cursor.execute(f"SHOW INDEX FROM `{table}`")
+    names = [column[0] for column in cursor.description]
+    indexes = {}
+    for row in cursor.fetchall():
+        row = dict(zip(names, row))
+        indexes.setdefault(row['Key_name'], []).append((row['Seq_in_index'], row['Column_name']))
+    return [[column for _, column in sorted(columns)] for columns in indexes.values()]
+
+def mariadb_explain(cursor, sql):
+    """Funkcja zwracająca plan zapytania MariaDB (EXPLAIN FORMAT=JSON) jako słownik"""
+    cursor.execute(f"EXPLAIN FORMAT=JSON {sql.strip().rstrip(';')}")
+    return json.loads(cursor.fetchone()[0])
+
+def mariadb_candidates(database_name, queries, candidates):
+    """
+    Funkcja proponująca indeksy MariaDB. Dla każdego zapytania wykonywany jest
+    EXPLAIN, a dla tabel przeglądanych w całości proponowane są indeksy na
+    kolumnach warunków, złączeń i sortowania (patrz propose_columns),
+    o ile nie pokrywa ich istniejący indeks.
+    """
+    conn, _ = get_mariadb_connection(database_name)
+    cursor = conn.cursor()
+    existing = {}
+    try:
+        for entry in engine_queries(queries, 'MariaDB'):
+            sql = entry['MariaDB']
+            try:
+                plan = mariadb_explain(cursor, sql)
+            except mysql.connector.Error as err:
+                print(f"MariaDB: EXPLAIN failed for {entry['id']}: {err}")
+                continue
+            scans, conditions, sort_keys = set(), [], []
+            _walk_mariadb_plan(plan, scans, conditions, sort_keys)
+            aliases = mariadb_aliases(sql)
+
+            for alias in scans:
+                table = aliases.get(alias)
+                if table is None:
+                    continue
+                if table not in existing:
+                    existing[table] = mariadb_existing_indexes(cursor, table)
+                predicates = [p for text in conditions for p in mariadb_predicates(text) if p[0] == alias]
+                equality = [column for _, column, kind in predicates if kind in ('eq', 'join')]
+                other = [column for _, column, kind in predicates if kind == 'range']
+                order = [column for text in sort_keys for a, column, _ in mariadb_predicates(text) if a == alias]
+                for columns in propose_columns(equality, other, order):
+                    if not covered(columns, existing[table]):
+                        add_candidate(candidates, 'MariaDB', table, columns, entry['id'])
+    finally:
+        cursor.close()
+        conn.close()
+
+def mongodb_filter_fields(query):
+    """
+    Funkcja zwracająca pola filtra MongoDB podzielone na porównywane przez
+    równość i pozostałe. Warunki $and są rozwijane, a $or, $nor i $expr pomijane.
+    """
+    equality, other = [], []
+    for field, value in (query or {}).items():
+        if field == '$and':
+            for condition in value:
+                sub_equality, sub_other = mongodb_filter_fields(condition)
+                equality += sub_equality
+                other += sub_other
+        elif field.startswith('$'):
+            continue
+        elif isinstance(value, dict) and any(key.startswith('$') for key in value):
+            if all(key in MONGODB_EQUALITY_OPERATORS for key in value):
+                equality.append(field)
+            else:
+                other.append(field)
+        else:
+            equality.append(field)
+    return equality, other
+
+def mongodb_lookups(pipeline):
+    """Funkcja zwracająca etapy $lookup potoku (także zagnieżdżone w $lookup i $facet)"""
+    lookups = []
+    for stage in pipeline or []:
+        for name, body in stage.items():
+            if name == '$lookup':
+                lookups.append(body)
+                lookups += mongodb_lookups(body.get('pipeline'))
+            elif name == '$facet':
+                for sub_pipeline in body.values():
+                    lookups += mongodb_lookups(sub_pipeline)
+    return lookups
+
+def _has_collscan(node):
+    """Funkcja sprawdzająca, czy wybrany plan MongoDB zawiera etap COLLSCAN"""
+    if isinstance(node, list):
+        return any(_has_collscan(item) for item in node)
+    if not isinstance(node, dict):
+        return False
+    if node.get('stage') == 'COLLSCAN':
+        return True
+    return any(_has_collscan(value) for key, value in node.items() if key != 'rejectedPlans')
+
+def mongodb_plan(db, query_set):
+    """Funkcja zwracająca plan zapytania MongoDB (explain queryPlanner - bez wykonania)"""
+    if query_set.get('pipeline'):
+        command = {'aggregate': query_set['collection'], 'pipeline': query_set['pipeline'], 'cursor': {}}
+    else:
+        command = {'find': query_set['collection'], 'filter': query_set.get('query') or {}}
+    return db.command({'explain': command, 'verbosity': 'queryPlanner'})
+
+def mongodb_existing_indexes(db, collection):
+    """Funkcja zwracająca listę pól istniejących indeksów kolekcji MongoDB"""
+    return [[field for field, _ in index['key']] for index in db[collection].index_information().values()]
+
+def mongodb_candidates(database_name, queries, candidates):
+    """
+    Funkcja proponująca indeksy MongoDB. Gdy plan zapytania zawiera COLLSCAN,
+    proponowane są indeksy na polach filtra find lub pierwszego etapu $match.
+    Dla każdego $lookup bez indeksu na foreignField proponowany jest indeks
+    w kolekcji from - bez niego każdy dokument wejściowy przegląda całą kolekcję.
+    """
+    db, _ = get_mongodb_database(database_name)
+    existing = {}
+    for entry in engine_queries(queries, 'MongoDB'):
+        query_set = entry['MongoDB']
+        pipeline = query_set.get('pipeline')
+        try:
+            plan = mongodb_plan(db, query_set)
+        except Exception as e:
+            print(f"MongoDB: explain failed for {entry['id']}: {e}")
+            continue
+
+        proposals = []
+        if _has_collscan(plan):
+            if pipeline:
+                query = pipeline[0].get('$match') if pipeline else None
+            else:
+                query = query_set.get('query')
+            equality, other = mongodb_filter_fields(query)
+            proposals += [(query_set['collection'], columns) for columns in propose_columns(equality, other)]
+        for lookup in mongodb_lookups(pipeline):
+            if 'from' in lookup and 'foreignField' in lookup:
+                proposals.append((lookup['from'], [lookup['foreignField']]))
+
+        for collection, columns in proposals:
+            if collection not in existing:
+                existing[collection] = mongodb_existing_indexes(db, collection)
+            if not covered(columns, existing[collection]):
+                add_candidate(candidates, 'MongoDB', collection, columns, entry['id'])
+
+def median_query_time(engine, database_name, entry, warmup, repetitions):
+    """Funkcja zwracająca medianę czasu zapytania z repetitions pomiarów (po warmup przebiegach)"""
+    times = []
+    for run in range(warmup + repetitions):
+        if engine == 'MariaDB':
+            timings = test_mariadb_query(database_name, entry['MariaDB'], verbose=False)
+        else:
+            timings = run_mongodb_query_set(database_name, entry['MongoDB'], verbose=False)
+        if run >= warmup and timings['query_time'] is not None:
+            times.append(timings['query_time'])
+    return statistics.median(times) if times else None
+
+def mariadb_index_length(cursor, database_name, table):
+    """Funkcja zwracająca łączny rozmiar indeksów tabeli po odświeżeniu statystyk"""
+    cursor.execute(f"ANALYZE TABLE `{table}`")
+    cursor.fetchall()
+    cursor.execute("SELECT index_length FROM information_schema.TABLES WHERE table_schema = %s AND table_name = %s",
+                   (database_name, table))
+    return cursor.fetchone()[0]
+
+def build_mariadb_index(database_name, candidate):
+    """
+    Funkcja tworząca indeks MariaDB. Rozmiar indeksu to przyrost index_length
+    tabeli. Zwraca krotkę (czas budowy w sekundach, rozmiar w bajtach).
+    """
+    conn, _ = get_mariadb_connection(database_name)
+    cursor = conn.cursor()
+    try:
+        before = mariadb_index_length(cursor, database_name, candidate['table'])
+        start = time.perf_counter()
+        cursor.execute(f"CREATE INDEX `{candidate['name']}` ON `{candidate['table']}` "
+                       f"({', '.join(f'`{column}`' for column in candidate['columns'])})")
+        build_time = time.perf_counter() - start
+        return build_time, mariadb_index_length(cursor, database_name, candidate['table']) - before
+    finally:
+        cursor.close()
+        conn.close()
+
+def drop_mariadb_index(database_name, candidate):
+    """Funkcja usuwająca indeks doradcy z tabeli MariaDB"""
+    conn, _ = get_mariadb_connection(database_name)
+    cursor = conn.cursor()
+    cursor.execute(f"DROP INDEX `{candidate['name']}` ON `{candidate['table']}`")
+    cursor.close()
+    conn.close()
+
+def mariadb_uses_index(database_name, entry, candidate):
+    """Funkcja sprawdzająca, czy plan zapytania MariaDB korzysta z indeksu doradcy"""
+    conn, _ = get_mariadb_connection(database_name)
+    cursor = conn.cursor()
+    try:
+        return f'"{candidate["name"]}"' in json.dumps(mariadb_explain(cursor, entry['MariaDB']))
+    finally:
+        cursor.close()
+        conn.close()
+
+def build_mongodb_index(database_name, candidate):
+    """Funkcja tworząca indeks MongoDB. Zwraca krotkę (czas budowy w sekundach, rozmiar w bajtach)"""
+    db, _ = get_mongodb_database(database_name)
+    start = time.perf_counter()
+    db[candidate['table']].create_index([(field, 1) for field in candidate['columns']], name=candidate['name'])
+    build_time = time.perf_counter() - start
+    sizes = db.command('collStats', candidate['table']).get('indexSizes', {})
+    return build_time, sizes.get(candidate['name'])
+
+def drop_mongodb_index(database_name, candidate):
+    """Funkcja usuwająca indeks doradcy z kolekcji MongoDB"""
+    db, _ = get_mongodb_database(database_name)
+    db[candidate['table']].drop_index(candidate['name'])
+
+def mongodb_uses_index(database_name, entry, candidate):
+    """Funkcja sprawdzająca, czy plan zapytania MongoDB korzysta z indeksu doradcy"""
+    db, _ = get_mongodb_database(database_name)
+    return f'"{candidate["name"]}"' in json.dumps(mongodb_plan(db, entry['MongoDB']), default=str)
+
+def benchmark_candidate(database_name, candidate, entries, baselines, warmup, repetitions):
+    """
+    Funkcja mierząca jedną propozycję: tworzy indeks, ponownie mierzy zapytania,
+    których dotyczy, sprawdza, czy plan z niego korzysta, i usuwa indeks.
+    Zwraca listę wierszy wyników (po jednym na zapytanie).
+    """
+    engine = candidate['engine']
+    build, drop, uses_index = {
+        'MariaDB': (build_mariadb_index, drop_mariadb_index, mariadb_uses_index),
+        'MongoDB': (build_mongodb_index, drop_mongodb_index, mongodb_uses_index)
+    }[engine]
+
+    try:
+        build_time, index_bytes = build(database_name, candidate)
+    except Exception as e:
+        print(f"{engine}: cannot build index {candidate['name']} on {candidate['table']}: {e}")
+        return []
+
+    rows = []
+    try:
+        for query_id in candidate['queries']:
+            indexed = median_query_time(engine, database_name, entries[query_id], warmup, repetitions)
+            baseline = baselines[(engine, query_id)]
+            gain = baseline - indexed if baseline is not None and indexed is not None else None
+            rows.append({
+                'database': engine,
+                'database_name': database_name,
+                'table': candidate['table'],
+                'index_columns': ', '.join(candidate['columns']),
+                'query_id': query_id,
+                'index_used': uses_index(database_name, entries[query_id], candidate),
+                'baseline_median': baseline,
+                'indexed_median': indexed,
+                'latency_gain': gain,
+                'speedup': baseline / indexed if gain is not None and indexed > 0 else None,
+                'build_time': build_time,
+                'index_bytes': index_bytes
+            })
+    finally:
+        drop(database_name, candidate)
+    return rows
+
+def test_index_advice(queries, database_name, warmup=1, repetitions=5):
+    """
+    Funkcja doradcy indeksów. Na podstawie planów zapytań obu silników
+    proponuje indeksy (mariadb_candidates, mongodb_candidates), mierzy
+    zapytania bez nich, a następnie dla każdej propozycji tworzy indeks,
+    mierzy zapytania ponownie i usuwa indeks. Zysk czasu każdego zapytania,
+    czas budowy i rozmiar indeksu zapisywane są w pliku ADVICE_CSV.
+    """
+    candidates = {}
+    mariadb_candidates(database_name, queries, candidates)
+    mongodb_candidates(database_name, queries, candidates)
+    if not candidates:
+        print("No index candidates - every scanned table already has matching indexes")
+        return []
+
+    entries = {entry['id']: entry for entry in queries}
+    baselines = {}
+    for candidate in candidates.values():
+        for query_id in candidate['queries']:
+            key = (candidate['engine'], query_id)
+            if key not in baselines:
+                baselines[key] = median_query_time(candidate['engine'], database_name, entries[query_id],
+                                                   warmup, repetitions)
+
+    results = []
+    for candidate in candidates.values():
+        print(f"{candidate['engine']}: testing index on {candidate['table']}({', '.join(candidate['columns'])}) "
+              f"for {', '.join(candidate['queries'])}")
+        rows = benchmark_candidate(database_name, candidate, entries, baselines, warmup, repetitions)
+        for row in rows:
+            save_to_csv(row, ADVICE_CSV)
+        if rows:
+            gain = sum(row['latency_gain'] or 0 for row in rows)
+            print(f"{candidate['engine']}: total gain {gain:.6f} s per run of affected queries, "
+                  f"build {rows[0]['build_time']:.2f} s, size {rows[0]['index_bytes']} bytes")
+        results += rows
+    return results
@@ -0,0 +1,146 @@
+"""
+Moduł zawierający funkcje statystyczne dla powtarzanych pomiarów czasu zapytań
+"""
+
+import math
+import statistics
+
+# Wartości krytyczne rozkładu t-Studenta dla dwustronnego przedziału 95%
+# (indeks = liczba stopni swobody), powyżej 30 stosowane jest przybliżenie normalne
+T_CRITICAL_95 = [
+    None, 12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042
+]
+Z_CRITICAL_95 = 1.960
+# Maksymalna łączna liczba pomiarów, dla której p testu Manna-Whitneya liczone jest dokładnie
+EXACT_U_LIMIT = 40
+
+def percentile(samples, p):
+    """
+    Funkcja zwracająca percentyl p (0-100) z interpolacją liniową
+    między najbliższymi pomiarami.
+    """
+    ordered = sorted(samples)
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * p / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def confidence_interval(samples):
+    """
+    Funkcja zwracająca 95% przedział ufności dla średniej jako krotkę (dolna, górna).
+    Dla pojedynczego pomiaru przedział jest zdegenerowany do tej wartości.
+    """
+    mean = statistics.fmean(samples)
+    n = len(samples)
+    if n < 2:
+        return mean, mean
+    critical = T_CRITICAL_95[n - 1] if n - 1 < len(T_CRITICAL_95) else Z_CRITICAL_95
+    margin = critical * statistics.stdev(samples) / math.sqrt(n)
+    return mean - margin, mean + margin
+
+def summarize(samples):
+    """
+    Funkcja wyliczająca statystyki opisowe dla listy czasów zapytań.
+    Pomiary zakończone błędem (None) są pomijane i zliczane osobno.
+    Gdy brak poprawnych pomiarów, statystyki mają wartość None.
+    """
+    valid = [s for s in samples if s is not None]
+    summary = {
+        'samples': len(valid),
+        'errors': len(samples) - len(valid)
+    }
+    if not valid:
+        summary.update(dict.fromkeys(
+            ['min', 'median', 'mean', 'p95', 'p99', 'max', 'stddev', 'ci95_low', 'ci95_high']
+        ))
+        return summary
+
+    ci_low, ci_high = confidence_interval(valid)
+    summary.update({
+        'min': min(valid),
+        'median': statistics.median(valid),
+        'mean': statistics.fmean(valid),
+        'p95': percentile(valid, 95),
+        'p99': percentile(valid, 99),
+        'max': max(valid),
+        'stddev': statistics.stdev(valid) if len(valid) > 1 else 0.0,
+        'ci95_low': ci_low,
+        'ci95_high': ci_high
+    })
+    return summary
+
+def _exact_u_distribution(n1, n2):
+    """
+    Funkcja zwracająca liczby układów rang dla każdej wartości statystyki U
+    (bez remisów), wyliczane rekurencyjnie: c(n1, n2, u) = c(n1 - 1, n2, u - n2) + c(n1, n2 - 1, u).
+    """
+    counts = [[[1] for _ in range(n2 + 1)] for _ in range(n1 + 1)]
+    for i in range(1, n1 + 1):
+        for j in range(1, n2 + 1):
+            size = i * j + 1
+            row = [0] * size
+            for u, count in enumerate(counts[i - 1][j]):
+                row[u + j] += count
+            for u, count in enumerate(counts[i][j - 1]):
+                row[u] += count
+            counts[i][j] = row
+    return counts[n1][n2]
+
+def mann_whitney_u(first, second):
+    """
+    Funkcja wykonująca dwustronny test Manna-Whitneya dla dwóch prób czasów.
+    Zwraca krotkę (U pierwszej próby, p). Dla małych prób bez remisów
+    (do EXACT_U_LIMIT pomiarów łącznie) p liczone jest dokładnie,
+    w pozostałych przypadkach z przybliżenia normalnego z poprawką
+    na remisy i ciągłość.
+    """
+    n1, n2 = len(first), len(second)
+    combined = sorted([(value, 0) for value in first] + [(value, 1) for value in second])
+
+    # rangi średnie dla remisów
+    ranks = [0.0] * len(combined)
+    tie_groups = []
+    start = 0
+    while start < len(combined):
+        end = start
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[start][0]:
+            end += 1
+        for index in range(start, end + 1):
+            ranks[index] = (start + end) / 2 + 1
+        tie_groups.append(end - start + 1)
+        start = end + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u1 = rank_sum - n1 * (n1 + 1) / 2
+    mean_u = n1 * n2 / 2
+    has_ties = any(size > 1 for size in tie_groups)
+
+    if not has_ties and n1 + n2 <= EXACT_U_LIMIT:
+        distribution = _exact_u_distribution(n1, n2)
+        total = sum(distribution)
+        u_low = int(min(u1, n1 * n2 - u1))
+        p_value = 2 * sum(distribution[:u_low + 1]) / total
+        return u1, min(1.0, p_value)
+
+    n = n1 + n2
+    tie_term = sum(size ** 3 - size for size in tie_groups) / (n * (n - 1))
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term)
+    if variance == 0:
+        return u1, 1.0
+    z = (abs(u1 - mean_u) - 0.5) / math.sqrt(variance)
+    p_value = math.erfc(max(z, 0.0) / math.sqrt(2))
+    return u1, min(1.0, p_value)
+
+def cliffs_delta(first, second):
+    """
+    Funkcja zwracająca wielkość efektu delta Cliffa: P(x > y) - P(x < y)
+    dla x z pierwszej i y z drugiej próby. Wartość z przedziału [-1, 1],
+    |delta| < 0.147 - efekt pomijalny, < 0.33 - mały, < 0.474 - średni, powyżej - duży.
+    """
+    greater = sum(1 for x in first for y in second if x > y)
+    smaller = sum(1 for x in first for y in second if x < y)
+    return (greater - smaller) / (len(first) * len(second))
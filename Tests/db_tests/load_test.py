@@ -0,0 +1,118 @@
+"""
+Moduł testu obciążeniowego - wielu równoległych klientów wykonujących zestaw zapytań
+"""
+
+import time
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from db_connections import get_mariadb_connection, get_mongodb_database, close_all
+from testing_functions import test_mariadb_query, run_mongodb_query_set, save_to_csv
+from latency_stats import summarize
+from query_registry import engine_queries
+
+# Domyślne liczby równoległych klientów i czas trwania pomiaru dla każdej z nich
+CLIENT_COUNTS = [1, 4, 16, 64]
+LOAD_DURATION = 30
+# Czas na otwarcie połączeń przez wszystkich klientów przed startem pomiaru
+STARTUP_DELAY = 5
+LOAD_CSV = "load_stats.csv"
+
+def load_worker(engine, database_name, query_mix, worker_id, start_at, deadline):
+    """
+    Funkcja klienta testu obciążeniowego (pętla zamknięta).
+    Klient otwiera własne połączenie, czeka na wspólny moment startu,
+    a następnie wykonuje kolejne zapytania z zestawu aż do upływu czasu.
+    Zwraca słownik z czasami zapytań, liczbą błędów i czasem ostatniego wyniku.
+    """
+    pool_name = f"{database_name}_load_{worker_id}"
+    if engine == 'MariaDB':
+        conn, _ = get_mariadb_connection(database_name, pool_name, pool_size=1)
+        conn.close()
+    else:
+        get_mongodb_database(database_name)
+
+    latencies = []
+    errors = 0
+    finished_at = start_at
+    # klienci zaczynają od różnych zapytań, aby nie wykonywać ich w tej samej kolejności
+    query_index = worker_id % len(query_mix)
+
+    time.sleep(max(0, start_at - time.time()))
+    while time.time() < deadline:
+        query = query_mix[query_index]
+        if engine == 'MariaDB':
+            timings = test_mariadb_query(database_name, query, pool_name, verbose=False)
+        else:
+            timings = run_mongodb_query_set(database_name, query, verbose=False)
+        finished_at = time.time()
+
+        if timings['query_time'] is None:
+            errors += 1
+        else:
+            latencies.append(timings['query_time'])
+        query_index = (query_index + 1) % len(query_mix)
+
+    return {'latencies': latencies, 'errors': errors, 'finished_at': finished_at}
+
+def _process_worker(*args):
+    """Funkcja uruchamiająca klienta w osobnym procesie i zamykająca jego połączenia"""
+    try:
+        return load_worker(*args)
+    finally:
+        close_all()
+
+def run_load_level(engine, database_name, query_mix, clients, duration, worker_type='thread'):
+    """
+    Funkcja wykonująca test obciążeniowy dla jednej liczby klientów.
+    Klienci uruchamiani są jako wątki (worker_type='thread') lub procesy
+    (worker_type='process'). Zwraca słownik z przepustowością (QPS)
+    i rozkładem czasów zapytań.
+    """
+    start_at = time.time() + STARTUP_DELAY
+    deadline = start_at + duration
+    args = [(engine, database_name, query_mix, worker_id, start_at, deadline)
+            for worker_id in range(clients)]
+
+    if worker_type == 'process':
+        executor = ProcessPoolExecutor(max_workers=clients, mp_context=multiprocessing.get_context('spawn'))
+        worker = _process_worker
+    else:
+        executor = ThreadPoolExecutor(max_workers=clients)
+        worker = load_worker
+
+    with executor:
+        results = list(executor.map(worker, *zip(*args)))
+
+    latencies = [latency for result in results for latency in result['latencies']]
+    errors = sum(result['errors'] for result in results)
+    elapsed = max(result['finished_at'] for result in results) - start_at
+
+    stats = {
+        'database': engine,
+        'database_name': database_name,
+        'worker_type': worker_type,
+        'clients': clients,
+        'duration': elapsed,
+        'completed': len(latencies),
+        'qps': len(latencies) / elapsed if elapsed > 0 else 0.0
+    }
+    stats.update(summarize(latencies))
+    stats['errors'] += errors
+    return stats
+
+def test_load_performance(queries, database_name, client_counts=CLIENT_COUNTS,
+                          duration=LOAD_DURATION, worker_type='thread'):
+    """
+    Funkcja do testowania wydajności baz danych pod obciążeniem.
+    Dla każdego silnika i każdej liczby klientów wykonuje zestaw zapytań
+    przez duration sekund i zapisuje przepustowość oraz rozkład czasów
+    zapytań w pliku LOAD_CSV.
+    """
+    for engine in ('MariaDB', 'MongoDB'):
+        for clients in client_counts:
+            print(f"{engine}: running load test with {clients} clients ({worker_type}s) for {duration} s")
+            query_mix = [entry[engine] for entry in engine_queries(queries, engine)]
+            stats = run_load_level(engine, database_name, query_mix, clients, duration, worker_type)
+            print(f"{engine}: {stats['qps']:.2f} queries/s, p95 {stats['p95']} s, errors {stats['errors']}")
+            save_to_csv(stats, LOAD_CSV)
+            close_all()
@@ -0,0 +1,397 @@
+"""
+Moduł mieszanego obciążenia OLTP bazy Doctors_Appointments - równoległe transakcje odczytu i zapisu
+"""
+
+import time
+import random
+import datetime
+import mysql.connector
+from mysql.connector import errorcode
+from concurrent.futures import ThreadPoolExecutor
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError, PyMongoError
+from pymongo.read_concern import ReadConcern
+from pymongo.write_concern import WriteConcern
+from db_connections import get_mariadb_connection, get_mongodb_database, close_all
+from testing_functions import save_to_csv
+from latency_stats import summarize, percentile
+from write_benchmark import WRITE_MARKER, REFERENCE_LIMIT, WRITE_SEED, WRITE_WORKLOADS, generate_rows
+from load_test import STARTUP_DELAY, LOAD_DURATION
+
+OLTP_DATABASE = 'Doctors_Appointments'
+# Domyślne udziały transakcji odczytu (historia pacjenta) - reszta to zapisy
+READ_RATIOS = [0.5, 0.8, 0.95]
+# Udział rezerwacji wśród zapisów (pozostałe zapisy to zmiany statusu wizyty)
+BOOKING_SHARE = 0.5
+# Liczba wizyt wstawianych przed pomiarem, których status jest zmieniany (im mniej, tym większa rywalizacja)
+HOT_APPOINTMENTS = 1000
+# Rezerwacje dotyczą BOOKING_PAIRS par (lekarz, pacjent) i BOOKING_SLOTS terminów (minut od WRITE_MARKER),
+# więc ten sam klucz idx_doctor_patient_date jest rezerwowany wielokrotnie, także równolegle
+BOOKING_PAIRS = 100
+BOOKING_SLOTS = 100
+HISTORY_LIMIT = 20
+APPOINTMENT_STATUSES = ['scheduled', 'completed', 'cancelled', 'no_show']
+# Maksymalna liczba ponowień transakcji po zakleszczeniu lub konflikcie zapisu
+MAX_RETRIES = 5
+RETRY_BACKOFF = 0.002
+# Błędy MariaDB, po których transakcja jest ponawiana
+MARIADB_RETRY_ERRORS = (errorcode.ER_LOCK_DEADLOCK, errorcode.ER_LOCK_WAIT_TIMEOUT)
+# Indeksy MongoDB odpowiadające kluczowi unikalnemu i indeksowi klucza obcego patient_id w MariaDB
+MONGODB_INDEXES = [
+    {'keys': [('doctor_id', ASCENDING), ('patient_id', ASCENDING), ('appointment_date', ASCENDING)],
+     'name': 'idx_doctor_patient_date', 'unique': True},
+    {'keys': [('patient_id', ASCENDING)], 'name': 'patient_id', 'unique': False}
+]
+TRANSACTION_TYPES = ['history', 'book', 'status']
+OLTP_CSV = "oltp_stats.csv"
+
+class SlotTaken(Exception):
+    """Wyjątek przerywający rezerwację zajętego terminu (transakcja wycofana, bez ponowienia)"""
+
+def slot_date(slot):
+    """Funkcja zwracająca datę terminu rezerwacji w formacie zapisywanym w obu silnikach"""
+    return (WRITE_MARKER + datetime.timedelta(minutes=slot)).strftime('%Y-%m-%d %H:%M:%S')
+
+def choose_transaction(rng, read_ratio):
+    """Funkcja losująca rodzaj kolejnej transakcji zgodnie z udziałem odczytów"""
+    if rng.random() < read_ratio:
+        return 'history'
+    return 'book' if rng.random() < BOOKING_SHARE else 'status'
+
+def mariadb_history(cursor, rng, context):
+    """Transakcja odczytu: ostatnie wizyty pacjenta z danymi lekarzy i liczba wszystkich jego wizyt"""
+    patient_id = rng.choice(context['patient_id'])
+    cursor.execute(
+        "SELECT a.appointment_id, a.appointment_date, a.appointment_status, a.diagnosis, a.treatment, "
+        "d.first_name, d.last_name, d.specialization FROM Appointments a "
+        "JOIN Doctors d ON d.doctor_id = a.doctor_id WHERE a.patient_id = %s "
+        f"ORDER BY a.appointment_date DESC LIMIT {HISTORY_LIMIT}", (patient_id,)
+    )
+    cursor.fetchall()
+    cursor.execute("SELECT COUNT(*) FROM Appointments WHERE patient_id = %s", (patient_id,))
+    cursor.fetchall()
+
+def mariadb_book(cursor, rng, context):
+    """
+    Transakcja rezerwacji: sprawdza z blokadą (SELECT ... FOR UPDATE), czy
+    termin pary lekarz-pacjent jest wolny, i wstawia wizytę. Zajęty termin
+    lub naruszenie idx_doctor_patient_date kończy transakcję wyjątkiem SlotTaken.
+    """
+    doctor_id, patient_id = rng.choice(context['pairs'])
+    appointment_date = slot_date(rng.randrange(BOOKING_SLOTS))
+    cursor.execute(
+        "SELECT appointment_id FROM Appointments "
+        "WHERE doctor_id = %s AND patient_id = %s AND appointment_date = %s FOR UPDATE",
+        (doctor_id, patient_id, appointment_date)
+    )
+    if cursor.fetchall():
+        raise SlotTaken()
+    try:
+        cursor.execute(
+            "INSERT INTO Appointments (doctor_id, patient_id, appointment_date, appointment_status, diagnosis) "
+            "VALUES (%s, %s, %s, 'scheduled', 'Benchmark')",
+            (doctor_id, patient_id, appointment_date)
+        )
+    except mysql.connector.Error as err:
+        if err.errno == errorcode.ER_DUP_ENTRY:
+            raise SlotTaken()
+        raise
+
+def mariadb_status(cursor, rng, context):
+    """Transakcja zmiany statusu: odczyt wizyty z blokadą i zapis nowego statusu"""
+    appointment_id = rng.choice(context['hot'])
+    cursor.execute("SELECT appointment_status FROM Appointments WHERE appointment_id = %s FOR UPDATE",
+                   (appointment_id,))
+    cursor.fetchall()
+    cursor.execute("UPDATE Appointments SET appointment_status = %s WHERE appointment_id = %s",
+                   (rng.choice(APPOINTMENT_STATUSES), appointment_id))
+
+def run_mariadb_transaction(conn, body, rng, context):
+    """
+    Funkcja wykonująca transakcję MariaDB z ponowieniami po zakleszczeniu
+    lub przekroczeniu czasu oczekiwania na blokadę.
+    Zwraca krotkę (wynik: committed / rejected / aborted, liczba ponowień).
+    """
+    cursor = conn.cursor()
+    retries = 0
+    try:
+        while True:
+            try:
+                conn.start_transaction()
+                body(cursor, rng, context)
+                conn.commit()
+                return 'committed', retries
+            except SlotTaken:
+                conn.rollback()
+                return 'rejected', retries
+            except mysql.connector.Error as err:
+                conn.rollback()
+                if err.errno not in MARIADB_RETRY_ERRORS or retries == MAX_RETRIES:
+                    return 'aborted', retries
+                retries += 1
+                time.sleep(rng.uniform(0, RETRY_BACKOFF * retries))
+    finally:
+        cursor.close()
+
+def mongodb_history(db, session, rng, context):
+    """Transakcja odczytu: ostatnie wizyty pacjenta z danymi lekarzy i liczba wszystkich jego wizyt"""
+    patient_id = rng.choice(context['patient_id'])
+    appointments = list(db.Appointments.find({'patient_id': patient_id}, session=session)
+                        .sort('appointment_date', DESCENDING).limit(HISTORY_LIMIT))
+    doctor_ids = list({appointment['doctor_id'] for appointment in appointments})
+    list(db.Doctors.find({'doctor_id': {'$in': doctor_ids}},
+                         {'first_name': 1, 'last_name': 1, 'specialization': 1}, session=session))
+    db.Appointments.count_documents({'patient_id': patient_id}, session=session)
+
+def mongodb_book(db, session, rng, context):
+    """
+    Transakcja rezerwacji (jak mariadb_book). Równoległe rezerwacje tego samego
+    klucza kończą się konfliktem zapisu (ponowienie) lub DuplicateKeyError.
+    """
+    doctor_id, patient_id = rng.choice(context['pairs'])
+    appointment_date = slot_date(rng.randrange(BOOKING_SLOTS))
+    if db.Appointments.find_one({'doctor_id': doctor_id, 'patient_id': patient_id,
+                                 'appointment_date': appointment_date}, {'_id': 1}, session=session):
+        raise SlotTaken()
+    try:
+        db.Appointments.insert_one({
+            'doctor_id': doctor_id,
+            'patient_id': patient_id,
+            'appointment_date': appointment_date,
+            'appointment_status': 'scheduled',
+            'diagnosis': 'Benchmark'
+        }, session=session)
+    except DuplicateKeyError:
+        raise SlotTaken()
+
+def mongodb_status(db, session, rng, context):
+    """Transakcja zmiany statusu: odczyt wizyty i zapis nowego statusu"""
+    appointment_id = rng.choice(context['hot'])
+    db.Appointments.find_one({'_id': appointment_id}, {'appointment_status': 1}, session=session)
+    db.Appointments.update_one({'_id': appointment_id},
+                               {'$set': {'appointment_status': rng.choice(APPOINTMENT_STATUSES)}}, session=session)
+
+def run_mongodb_transaction(client, db, body, rng, context):
+    """
+    Funkcja wykonująca transakcję MongoDB (snapshot, write concern majority)
+    z ponowieniami po błędach oznaczonych jako TransientTransactionError
+    (np. konflikt zapisu) i ponowieniem samego zatwierdzenia po
+    UnknownTransactionCommitResult. Zwraca krotkę jak run_mariadb_transaction.
+    """
+    retries = 0
+    with client.start_session() as session:
+        while True:
+            try:
+                session.start_transaction(read_concern=ReadConcern('snapshot'),
+                                          write_concern=WriteConcern(w='majority'))
+                body(db, session, rng, context)
+                while True:
+                    try:
+                        session.commit_transaction()
+                        return 'committed', retries
+                    except PyMongoError as e:
+                        if not e.has_error_label('UnknownTransactionCommitResult') or retries == MAX_RETRIES:
+                            raise
+                        retries += 1
+            except SlotTaken:
+                session.abort_transaction()
+                return 'rejected', retries
+            except PyMongoError as e:
+                if session.in_transaction:
+                    session.abort_transaction()
+                if not e.has_error_label('TransientTransactionError') or retries == MAX_RETRIES:
+                    return 'aborted', retries
+                retries += 1
+                time.sleep(rng.uniform(0, RETRY_BACKOFF * retries))
+
+def booking_pairs(context):
+    """Funkcja losująca pary (lekarz, pacjent), dla których rezerwowane są wizyty"""
+    rng = random.Random(WRITE_SEED)
+    return [(rng.choice(context['doctor_id']), rng.choice(context['patient_id'])) for _ in range(BOOKING_PAIRS)]
+
+MARIADB_TRANSACTIONS = {'history': mariadb_history, 'book': mariadb_book, 'status': mariadb_status}
+MONGODB_TRANSACTIONS = {'history': mongodb_history, 'book': mongodb_book, 'status': mongodb_status}
+
+def oltp_worker(engine, database_name, context, read_ratio, worker_id, start_at, deadline):
+    """
+    Funkcja klienta obciążenia OLTP (pętla zamknięta). Klient losuje kolejne
+    transakcje zgodnie z read_ratio i wykonuje je aż do upływu czasu.
+    Czas transakcji obejmuje jej ponowienia. Zwraca słownik z czasami
+    zatwierdzonych transakcji każdego rodzaju i licznikami wyników.
+    """
+    rng = random.Random(WRITE_SEED + worker_id)
+    if engine == 'MariaDB':
+        conn, _ = get_mariadb_connection(database_name, f"{database_name}_oltp_{worker_id}", pool_size=1)
+    else:
+        db, _ = get_mongodb_database(database_name)
+
+    result = {'latencies': {kind: [] for kind in TRANSACTION_TYPES},
+              'rejected': 0, 'aborted': 0, 'retries': 0, 'finished_at': start_at}
+    time.sleep(max(0, start_at - time.time()))
+    while time.time() < deadline:
+        kind = choose_transaction(rng, read_ratio)
+        start = time.perf_counter()
+        if engine == 'MariaDB':
+            outcome, retries = run_mariadb_transaction(conn, MARIADB_TRANSACTIONS[kind], rng, context)
+        else:
+            outcome, retries = run_mongodb_transaction(db.client, db, MONGODB_TRANSACTIONS[kind], rng, context)
+        latency = time.perf_counter() - start
+        result['finished_at'] = time.time()
+        result['retries'] += retries
+        if outcome == 'committed':
+            result['latencies'][kind].append(latency)
+        else:
+            result[outcome] += 1
+
+    if engine == 'MariaDB':
+        conn.close()
+    return result
+
+def mariadb_prepare(database_name, hot_rows):
+    """
+    Funkcja przygotowująca MariaDB: usuwa wizyty pozostałe po poprzednim
+    pomiarze, wstawia hot_rows wizyt, których status będzie zmieniany,
+    i zwraca kontekst transakcji (identyfikatory lekarzy, pacjentów i tych wizyt).
+    """
+    workload = WRITE_WORKLOADS[OLTP_DATABASE]
+    conn, _ = get_mariadb_connection(database_name)
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM Appointments WHERE appointment_date >= %s", (WRITE_MARKER,))
+    context = {}
+    for key, (table, column) in workload['references'].items():
+        cursor.execute(f"SELECT `{column}` FROM `{table}` LIMIT {REFERENCE_LIMIT}")
+        context[key] = [row[0] for row in cursor.fetchall()]
+        if not context[key]:
+            raise ValueError(f"MariaDB: table {table} is empty, load the data first")
+    context['pairs'] = booking_pairs(context)
+    # wizyty do zmian statusu mają terminy po BOOKING_SLOTS, aby nie kolidowały z rezerwacjami
+    rows = generate_rows(workload, context, BOOKING_SLOTS + hot_rows)[BOOKING_SLOTS:]
+    cursor.executemany(
+        "INSERT INTO Appointments (doctor_id, patient_id, appointment_date, appointment_status, diagnosis, treatment) "
+        "VALUES (%(doctor_id)s, %(patient_id)s, %(appointment_date)s, %(appointment_status)s, "
+        "%(diagnosis)s, %(treatment)s)", rows
+    )
+    conn.commit()
+    cursor.execute("SELECT appointment_id FROM Appointments WHERE appointment_date >= %s", (WRITE_MARKER,))
+    context['hot'] = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    conn.close()
+    return context
+
+def mongodb_prepare(database_name, hot_rows):
+    """
+    Funkcja przygotowująca MongoDB jak mariadb_prepare. Dodatkowo tworzy
+    indeksy MONGODB_INDEXES - bez unikalnego indeksu idx_doctor_patient_date
+    rezerwacje nie respektowałyby klucza unikalnego tabeli Appointments.
+    Gdy dane zawierają powtórzone klucze, indeksu nie da się utworzyć
+    i test jest przerywany z opisem przyczyny. Serwer bez replica setu
+    nie obsługuje transakcji - test jest przerywany.
+    """
+    workload = WRITE_WORKLOADS[OLTP_DATABASE]
+    db, _ = get_mongodb_database(database_name)
+    hello = db.client.admin.command('hello')
+    if 'setName' not in hello and hello.get('msg') != 'isdbgrid':
+        raise RuntimeError("MongoDB transactions require a replica set, start mongod with --replSet "
+                           "and run rs.initiate()")
+    marker = WRITE_MARKER.strftime('%Y-%m-%d %H:%M:%S')
+    db.Appointments.delete_many({'appointment_date': {'$gte': marker}})
+    for index in MONGODB_INDEXES:
+        try:
+            db.Appointments.create_index(index['keys'], name=index['name'], unique=index['unique'])
+        except DuplicateKeyError as e:
+            raise RuntimeError(f"MongoDB: cannot create unique index {index['name']} - Appointments contains "
+                               f"duplicate (doctor_id, patient_id, appointment_date) keys, remove them or "
+                               f"regenerate the data: {e}") from e
+    context = {}
+    for key, (collection, field) in workload['references'].items():
+        context[key] = [document[field] for document in
+                        db[collection].find({}, {field: 1, '_id': 0}).limit(REFERENCE_LIMIT) if field in document]
+        if not context[key]:
+            raise ValueError(f"MongoDB: collection {collection} is empty, load the data first")
+    context['pairs'] = booking_pairs(context)
+    rows = generate_rows(workload, context, BOOKING_SLOTS + hot_rows)[BOOKING_SLOTS:]
+    context['hot'] = db.Appointments.insert_many(rows).inserted_ids
+    return context
+
+def mariadb_cleanup(database_name):
+    """Funkcja usuwająca wizyty wstawione przez obciążenie OLTP"""
+    conn, _ = get_mariadb_connection(database_name)
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM Appointments WHERE appointment_date >= %s", (WRITE_MARKER,))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+def mongodb_cleanup(database_name):
+    """Funkcja usuwająca wizyty wstawione przez obciążenie OLTP"""
+    db, _ = get_mongodb_database(database_name)
+    db.Appointments.delete_many({'appointment_date': {'$gte': WRITE_MARKER.strftime('%Y-%m-%d %H:%M:%S')}})
+
+def run_oltp_level(engine, database_name, clients, read_ratio, duration, hot_rows=HOT_APPOINTMENTS):
+    """
+    Funkcja wykonująca obciążenie OLTP dla jednej liczby klientów i jednego
+    udziału odczytów. Zwraca słownik z przepustowością (transakcje/s),
+    licznikami odrzuceń, przerwań i ponowień oraz rozkładem czasów transakcji.
+    """
+    context = mariadb_prepare(database_name, hot_rows) if engine == 'MariaDB' else \
+        mongodb_prepare(database_name, hot_rows)
+    start_at = time.time() + STARTUP_DELAY
+    deadline = start_at + duration
+    try:
+        with ThreadPoolExecutor(max_workers=clients) as executor:
+            results = list(executor.map(
+                lambda worker_id: oltp_worker(engine, database_name, context, read_ratio,
+                                              worker_id, start_at, deadline),
+                range(clients)
+            ))
+    finally:
+        if engine == 'MariaDB':
+            mariadb_cleanup(database_name)
+        else:
+            mongodb_cleanup(database_name)
+
+    latencies = {kind: [latency for result in results for latency in result['latencies'][kind]]
+                 for kind in TRANSACTION_TYPES}
+    committed = sum(len(values) for values in latencies.values())
+    elapsed = max(result['finished_at'] for result in results) - start_at
+    stats = {
+        'database': engine,
+        'database_name': database_name,
+        'clients': clients,
+        'read_ratio': read_ratio,
+        'hot_appointments': hot_rows,
+        'duration': elapsed,
+        'committed': committed,
+        'tps': committed / elapsed if elapsed > 0 else 0.0,
+        'rejected': sum(result['rejected'] for result in results),
+        'aborted': sum(result['aborted'] for result in results),
+        'retries': sum(result['retries'] for result in results)
+    }
+    for kind in TRANSACTION_TYPES:
+        stats[f'{kind}_committed'] = len(latencies[kind])
+        for p in (50, 99):
+            stats[f'{kind}_p{p}'] = percentile(latencies[kind], p) if latencies[kind] else None
+    stats.update(summarize([latency for values in latencies.values() for latency in values]))
+    return stats
+
+def test_oltp_performance(database_name, client_counts, read_ratios=READ_RATIOS, duration=LOAD_DURATION,
+                          hot_rows=HOT_APPOINTMENTS):
+    """
+    Funkcja do testowania mieszanego obciążenia OLTP bazy Doctors_Appointments.
+    Dla każdego silnika, liczby klientów i udziału odczytów równolegle wykonywane
+    są transakcje historii pacjenta, rezerwacji wizyt i zmian statusu.
+    Wyniki zapisywane są w pliku OLTP_CSV. Transakcje MongoDB wymagają
+    replica setu (także jednowęzłowego).
+    """
+    if database_name != OLTP_DATABASE:
+        raise ValueError(f"OLTP workload is defined only for {OLTP_DATABASE}")
+    for engine in ('MariaDB', 'MongoDB'):
+        for clients in client_counts:
+            for read_ratio in read_ratios:
+                print(f"{engine}: running OLTP workload with {clients} clients, "
+                      f"{read_ratio:.0%} reads for {duration} s")
+                stats = run_oltp_level(engine, database_name, clients, read_ratio, duration, hot_rows)
+                print(f"{engine}: {stats['tps']:.2f} transactions/s, p99 {stats['p99']} s, "
+                      f"rejected {stats['rejected']}, aborted {stats['aborted']}, retries {stats['retries']}")
+                save_to_csv(stats, OLTP_CSV)
+                close_all()
@@ -0,0 +1,145 @@
+"""
+Moduł testu w pętli otwartej - zapytania wysyłane ze stałą częstotliwością niezależnie od odpowiedzi
+"""
+
+import time
+import random
+import asyncio
+import aiomysql
+from pymongo import AsyncMongoClient
+from db_connections import MARIADB_CONFIG, MONGODB_URI
+from testing_functions import save_to_csv
+from latency_stats import summarize
+from query_registry import engine_queries
+
+# Domyślne częstotliwości zapytań (zapytania/s) i czas pomiaru dla każdej z nich
+ARRIVAL_RATES = [10, 25, 50, 100]
+OPEN_LOOP_DURATION = 30
+# Maksymalna liczba połączeń klienta asynchronicznego
+ASYNC_POOL_SIZE = 64
+OPEN_LOOP_CSV = "open_loop_stats.csv"
+
+def arrival_schedule(rate, duration, arrival='constant', seed=None):
+    """
+    Funkcja zwracająca listę momentów wysłania zapytań (w sekundach od startu).
+    arrival='constant' - stałe odstępy 1/rate,
+    arrival='poisson' - odstępy z rozkładu wykładniczego (proces Poissona).
+    """
+    rng = random.Random(seed)
+    schedule = []
+    offset = 0.0
+    while True:
+        offset += rng.expovariate(rate) if arrival == 'poisson' else 1 / rate
+        if offset >= duration:
+            return schedule
+        schedule.append(offset)
+
+async def run_mariadb_async(pool, query):
+    """Funkcja wykonująca zapytanie MariaDB i pobierająca wynik kursorem strumieniowym"""
+    async with pool.acquire() as conn:
+        async with conn.cursor(aiomysql.SSCursor) as cursor:
+            await cursor.execute(query)
+            rows = 0
+            result = await cursor.fetchmany(100)
+            while result:
+                rows += len(result)
+                result = await cursor.fetchmany(100)
+            return rows
+
+async def run_mongodb_async(db, query_set):
+    """Funkcja wykonująca zapytanie MongoDB opisane słownikiem z listy zapytań"""
+    collection = db[query_set['collection']]
+    if query_set.get('pipeline'):
+        cursor = await collection.aggregate(query_set['pipeline'])
+    else:
+        cursor = collection.find(query_set.get('query'), query_set.get('projection'))
+    rows = 0
+    async for _ in cursor:
+        rows += 1
+    return rows
+
+async def _timed_request(request, scheduled_at, latencies, errors):
+    """
+    Funkcja wykonująca pojedyncze zapytanie. Czas liczony jest od zaplanowanego
+    momentu wysłania, a nie od faktycznego startu, więc oczekiwanie na wolne
+    połączenie wliczane jest do opóźnienia (brak coordinated omission).
+    """
+    try:
+        await request
+        latencies.append(time.perf_counter() - scheduled_at)
+    except Exception as e:
+        print(f"Error: {e}")
+        errors.append(e)
+
+async def run_open_loop_level(run_query_for, query_mix, rate, duration, arrival='constant'):
+    """
+    Funkcja wysyłająca zapytania z zadaną częstotliwością przez duration sekund.
+    run_query_for(query) zwraca korutynę wykonującą zapytanie.
+    Zwraca słownik z przepustowością i rozkładem opóźnień.
+    """
+    schedule = arrival_schedule(rate, duration, arrival)
+    latencies = []
+    errors = []
+    tasks = []
+    max_dispatch_lag = 0.0
+
+    start = time.perf_counter()
+    for request_index, offset in enumerate(schedule):
+        scheduled_at = start + offset
+        delay = scheduled_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        max_dispatch_lag = max(max_dispatch_lag, time.perf_counter() - scheduled_at)
+        query = query_mix[request_index % len(query_mix)]
+        tasks.append(asyncio.create_task(
+            _timed_request(run_query_for(query), scheduled_at, latencies, errors)
+        ))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    stats = {
+        'arrival': arrival,
+        'offered_rate': rate,
+        'sent': len(schedule),
+        'completed': len(latencies),
+        'achieved_rate': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'max_dispatch_lag': max_dispatch_lag
+    }
+    stats.update(summarize(latencies))
+    stats['errors'] += len(errors)
+    return stats
+
+async def _test_engine(engine, queries, database_name, rates, duration, arrival):
+    """Funkcja wykonująca wszystkie poziomy obciążenia dla jednego silnika"""
+    if engine == 'MariaDB':
+        pool = await aiomysql.create_pool(minsize=1, maxsize=ASYNC_POOL_SIZE, db=database_name, **MARIADB_CONFIG)
+        run_query_for = lambda query: run_mariadb_async(pool, query)
+    else:
+        client = AsyncMongoClient(MONGODB_URI, maxPoolSize=ASYNC_POOL_SIZE, serverSelectionTimeoutMS=5000)
+        db = client[database_name]
+        run_query_for = lambda query_set: run_mongodb_async(db, query_set)
+
+    query_mix = [entry[engine] for entry in engine_queries(queries, engine)]
+    try:
+        for rate in rates:
+            print(f"{engine}: open loop test at {rate} queries/s ({arrival}) for {duration} s")
+            stats = await run_open_loop_level(run_query_for, query_mix, rate, duration, arrival)
+            stats = {'database': engine, 'database_name': database_name, **stats}
+            print(f"{engine}: achieved {stats['achieved_rate']:.2f} queries/s, p99 {stats['p99']} s")
+            save_to_csv(stats, OPEN_LOOP_CSV)
+    finally:
+        if engine == 'MariaDB':
+            pool.close()
+            await pool.wait_closed()
+        else:
+            await client.close()
+
+def test_open_loop_performance(queries, database_name, rates=ARRIVAL_RATES,
+                               duration=OPEN_LOOP_DURATION, arrival='constant'):
+    """
+    Funkcja do testowania opóźnień baz danych przy zadanym obciążeniu
+    (pętla otwarta). Dla każdego silnika i częstotliwości zapisuje
+    opóźnienia w pliku OPEN_LOOP_CSV, co daje krzywą opóźnienie/obciążenie.
+    """
+    for engine in ('MariaDB', 'MongoDB'):
+        asyncio.run(_test_engine(engine, queries, database_name, rates, duration, arrival))
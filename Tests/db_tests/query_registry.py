@@ -0,0 +1,82 @@
+"""
+Moduł rejestru zapytań - par zapytań MariaDB/MongoDB z identyfikatorem i kategorią
+"""
+
+import math
+
+# Kategorie zapytań w rejestrze
+CATEGORIES = ['simple', 'group', 'join', 'subquery']
+ENGINES = ['MariaDB', 'MongoDB']
+
+def validate_queries(queries):
+    """
+    Funkcja sprawdzająca rejestr zapytań. Każdy wpis musi mieć unikalne 'id',
+    kategorię z listy CATEGORIES i co najmniej jedną implementację
+    ('MariaDB' - tekst SQL, 'MongoDB' - słownik z kolekcją i zapytaniem/potokiem).
+    """
+    seen = set()
+    for entry in queries:
+        if entry['id'] in seen:
+            raise ValueError(f"Duplicate query id '{entry['id']}'")
+        seen.add(entry['id'])
+        if entry['category'] not in CATEGORIES:
+            raise ValueError(f"Unknown category '{entry['category']}' of query '{entry['id']}'")
+        if not any(engine in entry for engine in ENGINES):
+            raise ValueError(f"Query '{entry['id']}' has no engine implementation")
+
+def engine_queries(queries, engine):
+    """
+    Funkcja zwracająca listę wpisów rejestru, które mają implementację dla danego silnika.
+    """
+    return [entry for entry in queries if engine in entry]
+
+def pair_speedups(summaries, equivalent=None):
+    """
+    Funkcja wyliczająca dla każdej pary zapytań stosunek median czasów
+    MongoDB / MariaDB. Wartość powyżej 1 oznacza, że MariaDB była szybsza.
+    summaries to lista podsumowań zapytań z kluczami database, query_id,
+    category i median. Pary bez obu poprawnych pomiarów są pomijane.
+    equivalent to opcjonalny zbiór identyfikatorów par, dla których oba silniki
+    zwracają ten sam wynik (patrz result_integrity) - pozostałe pary są pomijane.
+    """
+    medians = {}
+    categories = {}
+    for summary in summaries:
+        medians[(summary['query_id'], summary['database'])] = summary['median']
+        categories[summary['query_id']] = summary['category']
+
+    speedups = []
+    for query_id, category in categories.items():
+        mariadb_median = medians.get((query_id, 'MariaDB'))
+        mongodb_median = medians.get((query_id, 'MongoDB'))
+        if not mariadb_median or not mongodb_median:
+            continue
+        if equivalent is not None and query_id not in equivalent:
+            continue
+        speedups.append({
+            'query_id': query_id,
+            'category': category,
+            'mariadb_median': mariadb_median,
+            'mongodb_median': mongodb_median,
+            'speedup': mongodb_median / mariadb_median
+        })
+    return speedups
+
+def category_geomeans(speedups):
+    """
+    Funkcja wyliczająca średnią geometryczną stosunków czasów dla każdej
+    kategorii oraz dla wszystkich par razem (kategoria 'all').
+    """
+    groups = {}
+    for pair in speedups:
+        groups.setdefault(pair['category'], []).append(pair['speedup'])
+        groups.setdefault('all', []).append(pair['speedup'])
+
+    return [
+        {
+            'category': category,
+            'pairs': len(values),
+            'geomean_speedup': math.exp(sum(math.log(value) for value in values) / len(values))
+        }
+        for category, values in groups.items()
+    ]
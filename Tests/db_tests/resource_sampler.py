@@ -0,0 +1,100 @@
+"""
+Moduł próbkujący zużycie zasobów systemu w tle podczas wykonywania zapytania
+"""
+
+import time
+import threading
+import psutil
+
+# Odstęp między kolejnymi próbkami w sekundach
+SAMPLE_INTERVAL = 0.05
+
+class ResourceSampler:
+    """
+    Wątek próbkujący CPU, pamięć, odczyty/zapisy dysku i IO wait co interval sekund.
+    Dodatkowo zapisywana jest pamięć (RSS) procesu testującego, aby sprawdzić,
+    czy klient nie zawyża zużycia pamięci mierzonego dla serwera.
+    Użycie:
+
+        with ResourceSampler() as sampler:
+            ... zapytanie ...
+        stats = sampler.summary()
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = []
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._last_disk = None
+        self._last_time = None
+        self._client = psutil.Process()
+        self._client_rss_start = None
+
+    def start(self):
+        """Metoda zerująca liczniki psutil i uruchamiająca wątek próbkujący"""
+        psutil.cpu_percent(interval=None)
+        psutil.cpu_times_percent(interval=None)
+        self._last_disk = psutil.disk_io_counters()
+        self._last_time = time.perf_counter()
+        self._client_rss_start = self._client.memory_info().rss
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Metoda zatrzymująca wątek i dodająca ostatnią próbkę"""
+        self._stop_event.set()
+        self._thread.join()
+        # ostatnia próbka gwarantuje dane także dla zapytań krótszych niż interval
+        self._take_sample()
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self._take_sample()
+
+    def _take_sample(self):
+        now = time.perf_counter()
+        disk = psutil.disk_io_counters()
+        elapsed = now - self._last_time
+        self.samples.append({
+            'timestamp': time.time(),
+            'cpu_percent': psutil.cpu_percent(interval=None),
+            # iowait dostępny jest tylko w systemie Linux
+            'iowait_percent': getattr(psutil.cpu_times_percent(interval=None), 'iowait', 0.0),
+            'memory_percent': psutil.virtual_memory().percent,
+            'disk_read_bytes': disk.read_bytes - self._last_disk.read_bytes,
+            'disk_write_bytes': disk.write_bytes - self._last_disk.write_bytes,
+            'client_rss': self._client.memory_info().rss,
+            'interval': elapsed
+        })
+        self._last_disk = disk
+        self._last_time = now
+
+    def summary(self):
+        """
+        Metoda zwracająca zagregowane wartości z próbek: średnie i szczytowe
+        użycie CPU, IO wait i pamięci oraz sumaryczne i szczytowe (na sekundę)
+        odczyty i zapisy dysku oraz szczytową pamięć procesu testującego
+        i jej przyrost względem startu pomiaru.
+        """
+        stats = {'resource_samples': len(self.samples)}
+        for key in ('cpu_percent', 'iowait_percent', 'memory_percent'):
+            values = [sample[key] for sample in self.samples]
+            stats[f'{key}_mean'] = sum(values) / len(values)
+            stats[f'{key}_peak'] = max(values)
+        for key in ('disk_read_bytes', 'disk_write_bytes'):
+            stats[key] = sum(sample[key] for sample in self.samples)
+            stats[f'{key}_peak_per_s'] = max(
+                sample[key] / sample['interval'] if sample['interval'] > 0 else 0.0
+                for sample in self.samples
+            )
+        stats['client_rss_peak'] = max(sample['client_rss'] for sample in self.samples)
+        stats['client_rss_growth'] = stats['client_rss_peak'] - self._client_rss_start
+        return stats
@@ -0,0 +1,116 @@
+"""
+Moduł sprawdzający, czy MariaDB i MongoDB zwracają równoważne wyniki dla par zapytań
+"""
+
+import mysql.connector
+from db_connections import get_mariadb_connection, get_mongodb_database
+from result_stream import ResultFingerprint
+from query_registry import ENGINES
+
+# Liczba wierszy pobieranych jednym fetchmany przy liczeniu odcisku
+FINGERPRINT_FETCH_SIZE = 1000
+INTEGRITY_CSV = "integrity_summary.csv"
+
+def fingerprint_mariadb_query(database_name, query):
+    """
+    Funkcja wykonująca zapytanie MariaDB i zwracająca odcisk wyniku
+    (patrz ResultFingerprint). Wiersze pobierane są strumieniowo
+    i nie są przechowywane. Przy błędzie zwraca None.
+    """
+    conn = None
+    try:
+        conn, _ = get_mariadb_connection(database_name)
+        cursor = conn.cursor()
+        cursor.execute(query)
+        fingerprint = ResultFingerprint()
+        result = cursor.fetchmany(FINGERPRINT_FETCH_SIZE)
+        while result:
+            for row in result:
+                fingerprint.add_row(row)
+            result = cursor.fetchmany(FINGERPRINT_FETCH_SIZE)
+        cursor.close()
+        return fingerprint.result()
+
+    except mysql.connector.Error as err:
+        print(f"MariaDB Error: {err}")
+
+    except Exception as e:
+        print(f"General error: {e}")
+
+    finally:
+        if conn is not None:
+            conn.close()
+
+    return None
+
+def fingerprint_mongodb_query(database_name, query_set):
+    """
+    Funkcja wykonująca zapytanie MongoDB opisane słownikiem z listy zapytań
+    i zwracająca odcisk wyniku (patrz ResultFingerprint). Przy błędzie zwraca None.
+    """
+    try:
+        db, _ = get_mongodb_database(database_name)
+        collection = db[query_set['collection']]
+        if query_set.get('pipeline'):
+            cursor = collection.aggregate(query_set['pipeline'])
+        else:
+            cursor = collection.find(query_set.get('query'), query_set.get('projection'))
+        fingerprint = ResultFingerprint()
+        for doc in cursor:
+            fingerprint.add_row(doc)
+        return fingerprint.result()
+
+    except Exception as e:
+        print(f"Error: {e}")
+
+    return None
+
+def compare_fingerprints(mariadb, mongodb):
+    """
+    Funkcja porównująca odciski wyników obu silników. Zwraca status:
+    equivalent, row_count_mismatch, content_mismatch lub error.
+    """
+    if mariadb is None or mongodb is None:
+        return 'error'
+    if mariadb['rows'] != mongodb['rows']:
+        return 'row_count_mismatch'
+    if mariadb['fingerprint'] != mongodb['fingerprint']:
+        return 'content_mismatch'
+    return 'equivalent'
+
+def verify_queries(queries, database_name):
+    """
+    Funkcja wykonująca każde zapytanie z rejestru raz w każdym silniku (poza
+    pomiarem czasu) i porównująca odciski wyników. Zwraca listę wierszy
+    z liczbą wierszy, odciskiem każdego silnika i statusem pary
+    (dla zapytań z jedną implementacją status to unpaired).
+    """
+    fingerprint_functions = {
+        'MariaDB': fingerprint_mariadb_query,
+        'MongoDB': fingerprint_mongodb_query
+    }
+
+    results = []
+    for entry in queries:
+        fingerprints = {
+            engine: fingerprint_functions[engine](database_name, entry[engine])
+            for engine in ENGINES if engine in entry
+        }
+        row = {
+            'database_name': database_name,
+            'query_id': entry['id'],
+            'category': entry['category']
+        }
+        for engine in ENGINES:
+            fingerprint = fingerprints.get(engine) or {}
+            row[f'{engine.lower()}_rows'] = fingerprint.get('rows')
+            row[f'{engine.lower()}_fingerprint'] = fingerprint.get('fingerprint')
+
+        if len(fingerprints) < len(ENGINES):
+            row['status'] = 'unpaired'
+        else:
+            row['status'] = compare_fingerprints(fingerprints['MariaDB'], fingerprints['MongoDB'])
+        print(f"Query {entry['id']}: {row['status']} "
+              f"(MariaDB rows {row['mariadb_rows']}, MongoDB rows {row['mongodb_rows']})")
+        results.append(row)
+    return results
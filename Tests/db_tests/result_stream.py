@@ -0,0 +1,114 @@
+"""
+Moduł zliczający wyniki zapytań w locie, bez przechowywania ich w pamięci
+"""
+
+import zlib
+import hashlib
+import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from bson import ObjectId, Decimal128
+
+class ResultDigest:
+    """
+    Licznik wyniku zapytania: liczba wierszy, liczba bajtów i suma kontrolna
+    CRC32 liczona na bieżąco z surowych danych. Pamięć nie rośnie wraz
+    z rozmiarem wyniku, bo wiersze nie są zachowywane.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.bytes = 0
+        self.checksum = 0
+
+    def add_raw_row(self, row):
+        """Metoda dodająca wiersz MariaDB w surowej postaci (krotka bajtów lub None)"""
+        self.rows += 1
+        for value in row:
+            if value is None:
+                # NULL odróżniany od pustego napisu
+                self.checksum = zlib.crc32(b'\x00', self.checksum)
+            else:
+                self.bytes += len(value)
+                self.checksum = zlib.crc32(value, self.checksum)
+            self.checksum = zlib.crc32(b'\x1f', self.checksum)
+
+    def add_raw_document(self, raw):
+        """Metoda dodająca dokument MongoDB w postaci surowego BSON"""
+        self.rows += 1
+        self.bytes += len(raw)
+        self.checksum = zlib.crc32(raw, self.checksum)
+
+    def result(self):
+        """Metoda zwracająca liczniki jako słownik do zapisu z pomiarem"""
+        return {
+            'rows': self.rows,
+            'result_bytes': self.bytes,
+            'result_checksum': f"{self.checksum:08x}"
+        }
+
+# Liczba miejsc po przecinku, do której zaokrąglane są liczby przy porównaniu wyników
+FINGERPRINT_DECIMALS = 3
+# Suma skrótów wierszy liczona modulo 2^64
+FINGERPRINT_MODULUS = 1 << 64
+
+def normalize_value(value):
+    """
+    Funkcja sprowadzająca wartość z MariaDB lub MongoDB do wspólnej postaci tekstowej.
+    Liczby (int, float, Decimal, bool) zaokrąglane są do FINGERPRINT_DECIMALS
+    miejsc, daty zapisywane są w formacie ISO, a zagnieżdżone dokumenty
+    i tablice spłaszczane do listy wartości. Identyfikatory ObjectId są
+    pomijane - nadaje je MongoDB przy imporcie i nie mają odpowiednika w SQL.
+    """
+    if value is None:
+        return ['\x00']
+    if isinstance(value, ObjectId):
+        return []
+    if isinstance(value, dict):
+        return [token for item in value.values() for token in normalize_value(item)]
+    if isinstance(value, (list, tuple)):
+        return [token for item in value for token in normalize_value(item)]
+    if isinstance(value, (bool, int, float, Decimal, Decimal128)):
+        if isinstance(value, Decimal128):
+            value = value.to_decimal()
+        number = Decimal(str(value)) if isinstance(value, float) else Decimal(value)
+        if not number.is_finite():
+            return [str(number)]
+        number = number.quantize(Decimal(1).scaleb(-FINGERPRINT_DECIMALS), rounding=ROUND_HALF_UP)
+        # 0 zamiast -0 oraz 5 zamiast 5.000
+        return [f"{number.normalize() + 0:f}"]
+    if isinstance(value, datetime.datetime):
+        return [value.replace(tzinfo=None).isoformat(sep=' ')]
+    if isinstance(value, (datetime.date, datetime.time)):
+        return [value.isoformat()]
+    if isinstance(value, datetime.timedelta):
+        return [str(value)]
+    if isinstance(value, (bytes, bytearray)):
+        return [bytes(value).decode('utf-8', errors='replace')]
+    return [str(value)]
+
+class ResultFingerprint:
+    """
+    Odcisk wyniku niezależny od kolejności wierszy i kolumn: liczba wierszy
+    i suma (modulo 2^64) skrótów znormalizowanych wierszy. Wartości w wierszu
+    są sortowane, bo nazwy i kolejność pól różnią się między silnikami
+    (np. klucz grupowania to _id w MongoDB). Wiersze nie są zachowywane,
+    więc pamięć nie zależy od rozmiaru wyniku.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.total = 0
+
+    def add_row(self, values):
+        """Metoda dodająca zdekodowany wiersz MariaDB (krotka) lub dokument MongoDB (słownik)"""
+        self.rows += 1
+        tokens = sorted(normalize_value(values))
+        row_hash = hashlib.blake2b('\x1f'.join(tokens).encode('utf-8'), digest_size=8).digest()
+        self.total = (self.total + int.from_bytes(row_hash, 'big')) % FINGERPRINT_MODULUS
+
+    def result(self):
+        """Metoda zwracająca odcisk jako słownik do zapisu"""
+        return {
+            'rows': self.rows,
+            'fingerprint': f"{self.total:016x}"
+        }
@@ -0,0 +1,244 @@
+"""
+Moduł bazy wyników testów (SQLite) z metadanymi przebiegu i eksportem do formatu Parquet
+"""
+
+import os
+import sys
+import json
+import uuid
+import sqlite3
+import platform
+import datetime
+import psutil
+import pandas as pd
+from db_connections import get_mariadb_connection, get_mongodb_database
+
+# Plik bazy wyników i katalog eksportu Parquet
+RESULTS_DB = "benchmark_results.sqlite"
+PARQUET_DIR = "results_parquet"
+# Zmienne konfiguracyjne MariaDB zapisywane z każdym przebiegiem
+MARIADB_CONFIG_VARIABLES = [
+    'innodb_buffer_pool_size',
+    'innodb_buffer_pool_instances',
+    'innodb_log_file_size',
+    'innodb_flush_log_at_trx_commit',
+    'innodb_flush_method',
+    'innodb_io_capacity',
+    'innodb_read_io_threads',
+    'innodb_write_io_threads',
+    'sync_binlog',
+    'query_cache_type',
+    'query_cache_size',
+    'tmp_table_size',
+    'max_heap_table_size',
+    'join_buffer_size',
+    'sort_buffer_size',
+    'max_connections'
+]
+
+RUNS_TABLE = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at TEXT,
+    finished_at TEXT,
+    database_name TEXT,
+    mode TEXT,
+    options TEXT,
+    host TEXT
+)"""
+RUN_ENGINES_TABLE = """
+CREATE TABLE IF NOT EXISTS run_engines (
+    run_id TEXT,
+    engine TEXT,
+    version TEXT,
+    config TEXT,
+    dataset TEXT,
+    PRIMARY KEY (run_id, engine)
+)"""
+
+_store = {'connection': None, 'run_id': None, 'columns': {}}
+
+def _connect(path=RESULTS_DB):
+    """Funkcja otwierająca bazę wyników i tworząca tabele metadanych"""
+    if _store['connection'] is None:
+        connection = sqlite3.connect(path)
+        connection.execute(RUNS_TABLE)
+        connection.execute(RUN_ENGINES_TABLE)
+        _store['connection'] = connection
+    return _store['connection']
+
+def _sql_value(value):
+    """Funkcja zamieniająca wartość na typ obsługiwany przez SQLite (listy i słowniki jako JSON)"""
+    if value is None or isinstance(value, (int, float, str, bytes)):
+        return value
+    if isinstance(value, (list, tuple, dict)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+def host_info():
+    """Funkcja zwracająca opis maszyny testowej: system, procesor, pamięć i wersję Pythona"""
+    return {
+        'hostname': platform.node(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count_logical': psutil.cpu_count(),
+        'cpu_count_physical': psutil.cpu_count(logical=False),
+        'memory_total': psutil.virtual_memory().total,
+        'python': sys.version.split()[0]
+    }
+
+def mariadb_metadata(database_name):
+    """
+    Funkcja zwracająca wersję MariaDB, wartości MARIADB_CONFIG_VARIABLES
+    oraz liczbę wierszy i rozmiar danych i indeksów każdej tabeli bazy.
+    """
+    conn, _ = get_mariadb_connection(database_name)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT VERSION()")
+        version = cursor.fetchone()[0]
+
+        names = ', '.join(f"'{name}'" for name in MARIADB_CONFIG_VARIABLES)
+        cursor.execute(f"SHOW GLOBAL VARIABLES WHERE Variable_name IN ({names})")
+        config = dict(cursor.fetchall())
+
+        # table_rows jest dla InnoDB wartością szacunkową
+        cursor.execute(
+            "SELECT table_name, table_rows, data_length, index_length FROM information_schema.TABLES "
+            "WHERE table_schema = %s", (database_name,)
+        )
+        dataset = {
+            table: {'rows': rows, 'data_bytes': data_length, 'index_bytes': index_length}
+            for table, rows, data_length, index_length in cursor.fetchall()
+        }
+        cursor.close()
+    finally:
+        conn.close()
+    return version, config, dataset
+
+def mongodb_metadata(database_name):
+    """
+    Funkcja zwracająca wersję MongoDB, silnik składowania i rozmiar cache
+    WiredTiger oraz liczbę dokumentów i rozmiar danych i indeksów każdej kolekcji.
+    """
+    db, _ = get_mongodb_database(database_name)
+    version = db.client.server_info()['version']
+    status = db.command('serverStatus')
+    config = {
+        'storage_engine': status.get('storageEngine', {}).get('name'),
+        'wiredtiger_cache_size': status.get('wiredTiger', {}).get('cache', {}).get('maximum bytes configured')
+    }
+    try:
+        config['options'] = db.client.admin.command('getCmdLineOpts')['parsed']
+    except Exception as e:
+        print(f"MongoDB: cannot read command line options: {e}")
+
+    dataset = {}
+    for name in db.list_collection_names():
+        for stats in db[name].aggregate([{'$collStats': {'storageStats': {}}}]):
+            storage = stats['storageStats']
+            dataset[name] = {
+                'rows': storage.get('count'),
+                'data_bytes': storage.get('size'),
+                'storage_bytes': storage.get('storageSize'),
+                'index_bytes': storage.get('totalIndexSize')
+            }
+    return version, config, dataset
+
+def start_run(database_name, mode, options, path=RESULTS_DB):
+    """
+    Funkcja rozpoczynająca nowy przebieg testów. Zapisuje w bazie wyników
+    identyfikator przebiegu, parametry uruchomienia, opis maszyny oraz dla
+    każdego silnika wersję, konfigurację i rozmiary danych. Od tej chwili
+    save_record dopisuje run_id do każdego wiersza. Zwraca run_id.
+    """
+    connection = _connect(path)
+    run_id = uuid.uuid4().hex
+    _store['run_id'] = run_id
+    connection.execute(
+        "INSERT INTO runs (run_id, started_at, database_name, mode, options, host) VALUES (?, ?, ?, ?, ?, ?)",
+        (run_id, datetime.datetime.now().isoformat(), database_name, mode,
+         _sql_value(options), _sql_value(host_info()))
+    )
+    for engine, metadata in (('MariaDB', mariadb_metadata), ('MongoDB', mongodb_metadata)):
+        try:
+            version, config, dataset = metadata(database_name)
+        except Exception as e:
+            print(f"{engine}: cannot read run metadata: {e}")
+            version, config, dataset = None, None, None
+        connection.execute(
+            "INSERT INTO run_engines (run_id, engine, version, config, dataset) VALUES (?, ?, ?, ?, ?)",
+            (run_id, engine, version, _sql_value(config), _sql_value(dataset))
+        )
+    connection.commit()
+    print(f"Run {run_id} started")
+    return run_id
+
+def finish_run():
+    """Funkcja zapisująca czas zakończenia bieżącego przebiegu i zamykająca bazę wyników"""
+    connection = _store['connection']
+    if connection is None:
+        return
+    if _store['run_id'] is not None:
+        connection.execute("UPDATE runs SET finished_at = ? WHERE run_id = ?",
+                           (datetime.datetime.now().isoformat(), _store['run_id']))
+    connection.commit()
+    connection.close()
+    _store['connection'] = None
+    _store['run_id'] = None
+    _store['columns'] = {}
+
+def current_run_id():
+    """Funkcja zwracająca identyfikator bieżącego przebiegu (None poza przebiegiem)"""
+    return _store['run_id']
+
+def save_record(table, row):
+    """
+    Funkcja zapisująca wiersz wyników w tabeli bazy wyników razem z run_id
+    bieżącego przebiegu. Tabela tworzona jest przy pierwszym zapisie,
+    a brakujące kolumny dodawane są na bieżąco, więc wiersze mogą mieć
+    różne zestawy kluczy. Poza przebiegiem (bez start_run) nic nie zapisuje.
+    """
+    connection = _store['connection']
+    if connection is None or _store['run_id'] is None:
+        return
+
+    row = {'run_id': _store['run_id'], **row}
+    columns = _store['columns'].get(table)
+    if columns is None:
+        connection.execute(f'CREATE TABLE IF NOT EXISTS "{table}" (run_id TEXT)')
+        connection.execute(f'CREATE INDEX IF NOT EXISTS "idx_{table}_run_id" ON "{table}" (run_id)')
+        columns = {info[1] for info in connection.execute(f'PRAGMA table_info("{table}")')}
+        _store['columns'][table] = columns
+    for column in row:
+        if column not in columns:
+            connection.execute(f'ALTER TABLE "{table}" ADD COLUMN "{column}"')
+            columns.add(column)
+
+    names = ', '.join(f'"{column}"' for column in row)
+    placeholders = ', '.join('?' for _ in row)
+    connection.execute(f'INSERT INTO "{table}" ({names}) VALUES ({placeholders})',
+                       [_sql_value(value) for value in row.values()])
+    connection.commit()
+
+def export_parquet(path=RESULTS_DB, directory=PARQUET_DIR):
+    """
+    Funkcja eksportująca wszystkie tabele bazy wyników do plików Parquet
+    (jeden plik na tabelę) do szybkiej analizy historii wyników, np. w pandas.
+    """
+    os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(path)
+    try:
+        tables = [name for (name,) in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )]
+        for table in tables:
+            data = pd.read_sql_query(f'SELECT * FROM "{table}"', connection)
+            file_path = os.path.join(directory, f"{table}.parquet")
+            data.to_parquet(file_path, index=False)
+            print(f"Exported {len(data)} rows of table {table} to {file_path}")
+    finally:
+        connection.close()
+
+if __name__ == "__main__":
+    export_parquet()
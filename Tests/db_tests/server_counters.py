@@ -0,0 +1,136 @@
+"""
+Moduł zbierający liczniki pracy serwera dla zapytań (SHOW SESSION STATUS w MariaDB, explain w MongoDB)
+"""
+
+# Liczniki MariaDB odczytywane przed i po zapytaniu
+MARIADB_STATUS_COUNTERS = [
+    'Handler_read_first',
+    'Handler_read_key',
+    'Handler_read_last',
+    'Handler_read_next',
+    'Handler_read_prev',
+    'Handler_read_rnd',
+    'Handler_read_rnd_next',
+    'Innodb_rows_read',
+    'Created_tmp_tables',
+    'Created_tmp_disk_tables',
+    'Sort_merge_passes',
+    'Sort_rows',
+    'Select_scan',
+    'Select_full_join'
+]
+# Wartości odczytywane z explain("executionStats") w MongoDB
+MONGODB_EXPLAIN_COUNTERS = [
+    'n_returned',
+    'execution_time_ms',
+    'total_keys_examined',
+    'total_docs_examined',
+    'collection_scans',
+    'stages',
+    'used_disk',
+    'spills'
+]
+# Części wyniku explain powielające plan wykonania lub treść polecenia
+EXPLAIN_SKIPPED_KEYS = ('queryPlanner', 'command', 'allPlansExecution', 'rejectedPlans')
+
+def empty_server_counters():
+    """
+    Funkcja zwracająca słownik wszystkich liczników obu silników z wartością None,
+    aby wiersze MariaDB i MongoDB miały te same kolumny w pliku CSV.
+    """
+    counters = {f'mariadb_{name.lower()}': None for name in MARIADB_STATUS_COUNTERS}
+    counters.update({f'mongodb_{name}': None for name in MONGODB_EXPLAIN_COUNTERS})
+    return counters
+
+def mariadb_status(conn):
+    """Funkcja odczytująca wybrane liczniki SHOW SESSION STATUS dla połączenia"""
+    cursor = conn.cursor()
+    names = ', '.join(f"'{name}'" for name in MARIADB_STATUS_COUNTERS)
+    cursor.execute(f"SHOW SESSION STATUS WHERE Variable_name IN ({names})")
+    status = {name: int(value) for name, value in cursor.fetchall()}
+    cursor.close()
+    return status
+
+def mariadb_status_delta(before, after, overhead=None):
+    """
+    Funkcja wyliczająca przyrost liczników MariaDB w trakcie zapytania.
+    overhead to przyrost zmierzony między dwoma odczytami bez zapytania -
+    samo SHOW STATUS korzysta z tabel tymczasowych i zwiększa część liczników.
+    Innodb_rows_read jest licznikiem globalnym, więc obejmuje też inne sesje.
+    """
+    overhead = overhead or {}
+    delta = {}
+    for name in MARIADB_STATUS_COUNTERS:
+        if name in before and name in after:
+            delta[f'mariadb_{name.lower()}'] = max(0, after[name] - before[name] - overhead.get(name, 0))
+    return delta
+
+def _walk_explain(node, counters):
+    """Funkcja przechodząca rekurencyjnie wynik explain i sumująca liczniki"""
+    if isinstance(node, list):
+        for item in node:
+            _walk_explain(item, counters)
+        return
+    if not isinstance(node, dict):
+        return
+
+    for key, value in node.items():
+        if key in EXPLAIN_SKIPPED_KEYS:
+            continue
+        if key == 'totalDocsExamined':
+            counters['total_docs_examined'] += value
+        elif key == 'totalKeysExamined':
+            counters['total_keys_examined'] += value
+        elif key == 'collectionScans':
+            counters['collection_scans'] += value
+        elif key == 'stage' and isinstance(value, str):
+            counters['stages'].append(value)
+            if value == 'COLLSCAN':
+                counters['collection_scans'] += 1
+        elif key == 'stages' and isinstance(value, list):
+            # etapy agregacji mają postać {'$nazwa': {...}, statystyki...}
+            for stage in value:
+                counters['stages'].extend(name for name in stage if name.startswith('$'))
+        elif key == 'usedDisk' and value:
+            counters['used_disk'] = True
+        elif key == 'spills' and isinstance(value, (int, float)):
+            counters['spills'] += value
+        _walk_explain(value, counters)
+
+def mongodb_explain(db, collection_name, query=None, pipeline=None, projection=None):
+    """
+    Funkcja wykonująca explain("executionStats") dla zapytania find lub
+    agregacji i zwracająca liczbę przejrzanych dokumentów i kluczy, drzewo
+    etapów planu oraz informację o użyciu dysku. explain wykonuje zapytanie
+    ponownie, dlatego należy go wywoływać poza pomiarem czasu.
+    """
+    if pipeline:
+        command = {'aggregate': collection_name, 'pipeline': pipeline, 'cursor': {}}
+    else:
+        command = {'find': collection_name, 'filter': query or {}}
+        if projection:
+            command['projection'] = projection
+    explain = db.command({'explain': command, 'verbosity': 'executionStats'})
+
+    counters = {
+        'total_docs_examined': 0,
+        'total_keys_examined': 0,
+        'collection_scans': 0,
+        'stages': [],
+        'used_disk': False,
+        'spills': 0
+    }
+    _walk_explain(explain, counters)
+
+    execution_stats = explain.get('executionStats', {})
+    if not execution_stats:
+        # agregacja z etapem $cursor - statystyki części find są w pierwszym etapie
+        for stage in explain.get('stages', []):
+            if '$cursor' in stage:
+                execution_stats = stage['$cursor'].get('executionStats', {})
+
+    result = {f'mongodb_{name}': value for name, value in counters.items()}
+    result['mongodb_stages'] = '>'.join(counters['stages'])
+    result['mongodb_n_returned'] = execution_stats.get('nReturned')
+    result['mongodb_execution_time_ms'] = execution_stats.get('executionTimeMillis')
+    return result
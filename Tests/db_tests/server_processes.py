@@ -0,0 +1,97 @@
+"""
+Moduł zbierający zużycie zasobów przez procesy serwerów baz danych (mariadbd / mongod)
+"""
+
+import psutil
+
+# Nazwy procesów serwera dla każdego silnika
+SERVER_PROCESS_NAMES = {
+    'MariaDB': ('mariadbd', 'mysqld'),
+    'MongoDB': ('mongod',)
+}
+
+_server_processes = {}
+# Silniki, dla których wypisano już brak procesu serwera (komunikat tylko raz, np. serwer zdalny)
+_missing_reported = set()
+
+def find_server_process(engine):
+    """
+    Funkcja wyszukująca proces serwera danego silnika.
+    Znaleziony proces jest zapamiętywany, a po jego zakończeniu
+    (np. restart serwera) wyszukiwany ponownie. Zwraca None, gdy brak procesu -
+    komunikat o braku wypisywany jest raz, do ponownego znalezienia procesu.
+    """
+    process = _server_processes.get(engine)
+    if process is not None and process.is_running():
+        return process
+
+    for candidate in psutil.process_iter(['name']):
+        if candidate.info['name'] in SERVER_PROCESS_NAMES[engine]:
+            _server_processes[engine] = candidate
+            _missing_reported.discard(engine)
+            return candidate
+
+    if engine not in _missing_reported:
+        print(f"{engine}: server process {'/'.join(SERVER_PROCESS_NAMES[engine])} not found, "
+              f"server counters are skipped")
+        _missing_reported.add(engine)
+    _server_processes.pop(engine, None)
+    return None
+
+def process_snapshot(engine):
+    """
+    Funkcja zwracająca liczniki procesu serwera: czas CPU, RSS, bajty
+    odczytane/zapisane, liczbę wątków i przełączeń kontekstu.
+    Liczniki niedostępne (np. io_counters bez uprawnień roota) mają wartość None.
+    """
+    process = find_server_process(engine)
+    if process is None:
+        return None
+
+    try:
+        with process.oneshot():
+            cpu_times = process.cpu_times()
+            ctx_switches = process.num_ctx_switches()
+            snapshot = {
+                'cpu_time': cpu_times.user + cpu_times.system,
+                'rss': process.memory_info().rss,
+                'threads': process.num_threads(),
+                'ctx_switches_voluntary': ctx_switches.voluntary,
+                'ctx_switches_involuntary': ctx_switches.involuntary,
+                'read_bytes': None,
+                'write_bytes': None
+            }
+            try:
+                io_counters = process.io_counters()
+                snapshot['read_bytes'] = io_counters.read_bytes
+                snapshot['write_bytes'] = io_counters.write_bytes
+            except psutil.AccessDenied:
+                pass
+        snapshot['pid'] = process.pid
+        return snapshot
+
+    except psutil.NoSuchProcess:
+        _server_processes.pop(engine, None)
+        return None
+
+def process_delta(before, after):
+    """
+    Funkcja wyliczająca różnice liczników procesu serwera między dwoma
+    migawkami. Klucze mają prefiks server_. RSS i liczba wątków podawane
+    są po zapytaniu, pozostałe wartości jako przyrost w trakcie zapytania.
+    """
+    keys = ['pid', 'cpu_time', 'rss', 'rss_delta', 'threads', 'read_bytes', 'write_bytes',
+            'ctx_switches_voluntary', 'ctx_switches_involuntary']
+    delta = {f'server_{key}': None for key in keys}
+    # brak procesu lub restart serwera w trakcie zapytania
+    if before is None or after is None or before['pid'] != after['pid']:
+        return delta
+
+    delta['server_pid'] = after['pid']
+    delta['server_rss'] = after['rss']
+    delta['server_rss_delta'] = after['rss'] - before['rss']
+    delta['server_threads'] = after['threads']
+    for key in ('cpu_time', 'read_bytes', 'write_bytes', 'ctx_switches_voluntary', 'ctx_switches_involuntary'):
+        if before[key] is not None and after[key] is not None:
+            delta[f'server_{key}'] = after[key] - before[key]
+    return delta
@@ -2,23 +2,154 @@
 Moduł testujący dla bazy Airports
 """
 
-from testing_functions import test_database_performance
+from testing_functions import run_tests
 
 def main():
     db_name = "Airports"
-    queries = {
-        'MariaDB': [
-            # zapytania
-            "SELECT FLIGHT_ID, FLIGHT_NUMBER, ARRIVAL_DELAY FROM Flights WHERE ARRIVAL_DELAY > 60;",
-            "SELECT AIRLINE FROM Airlines WHERE IATA_CODE = 'AA';",
-            "SELECT AIRPORT, CITY FROM Airports WHERE STATE = 'CA';",
-            # grupowanie
-            "SELECT DAY_OF_WEEK, AVG(ARRIVAL_DELAY) AS avg_arrival_delay FROM Flights GROUP BY DAY_OF_WEEK;",
-            "SELECT CANCELLATION_REASON, COUNT(*) AS cancel_count FROM Flights WHERE CANCELLED = 1 GROUP BY CANCELLATION_REASON;", 
-            "SELECT YEAR, MONTH, DAY, COUNT(*) AS flight_count FROM Flights WHERE AIRLINE = 'UA' GROUP BY YEAR, MONTH, DAY;",
-            # joiny
-            "SELECT a.AIRLINE, COUNT(f.FLIGHT_NUMBER) AS flight_count FROM Flights f JOIN Airlines a ON f.AIRLINE = a.IATA_CODE GROUP BY a.AIRLINE;",
-            """SELECT 
+    queries = [
+        # zapytania
+        {
+            'id': 'flights_delay_over_60',
+            'category': 'simple',
+            'MariaDB': "SELECT FLIGHT_ID, FLIGHT_NUMBER, ARRIVAL_DELAY FROM Flights WHERE ARRIVAL_DELAY > 60;",
+            'MongoDB': {
+                'collection': 'Flights',
+                'query': {"ARRIVAL_DELAY": {"$gt": 60}},
+                'projection': {"_id": 0, "FLIGHT_NUMBER": 1, "ARRIVAL_DELAY": 1}
+            }
+        },
+        {
+            'id': 'airline_by_iata_code',
+            'category': 'simple',
+            'MariaDB': "SELECT AIRLINE FROM Airlines WHERE IATA_CODE = 'AA';",
+            'MongoDB': {
+                'collection': 'Airlines',
+                'query': {"IATA_CODE": "AA"},
+                'projection': {"_id": 0, "AIRLINE": 1}
+            }
+        },
+        {
+            'id': 'airports_in_california',
+            'category': 'simple',
+            'MariaDB': "SELECT AIRPORT, CITY FROM Airports WHERE STATE = 'CA';",
+            'MongoDB': {
+                'collection': 'Airports',
+                'query': { "STATE": "CA" },
+                'projection': {"_id": 0, "AIRPORT": 1, "CITY": 1}
+            }
+        },
+        # grupowanie
+        {
+            'id': 'avg_delay_by_day_of_week',
+            'category': 'group',
+            'MariaDB': "SELECT DAY_OF_WEEK, AVG(ARRIVAL_DELAY) AS avg_arrival_delay FROM Flights GROUP BY DAY_OF_WEEK;",
+            'MongoDB': {
+                'collection': 'Flights',
+                'pipeline': [
+                    {
+                        "$group": {
+                            "_id": "$DAY_OF_WEEK",
+                            "avg_arrival_delay": { "$avg": "$ARRIVAL_DELAY" }
+                        }
+                    }
+                ]
+            }
+        },
+        {
+            'id': 'cancellations_by_reason',
+            'category': 'group',
+            'MariaDB': "SELECT CANCELLATION_REASON, COUNT(*) AS cancel_count FROM Flights WHERE CANCELLED = 1 GROUP BY CANCELLATION_REASON;",
+            'MongoDB': {
+                'collection': 'Flights',
+                'pipeline': [
+                    {
+                        "$match": {
+                            "CANCELLED": 1,
+                            "CANCELLATION_REASON": { "$exists": True }
+                        }
+                    },
+                    {
+                        "$group": {
+                            "_id": "$CANCELLATION_REASON",
+                            "cancel_count": { "$sum": 1 }
+                        }
+                    }
+                ]
+            }
+        },
+        {
+            'id': 'ua_flights_per_day',
+            'category': 'group',
+            'MariaDB': "SELECT YEAR, MONTH, DAY, COUNT(*) AS flight_count FROM Flights WHERE AIRLINE = 'UA' GROUP BY YEAR, MONTH, DAY;",
+            'MongoDB': {
+                'collection': 'Flights',
+                'pipeline': [
+                                            {
+                        "$match": {
+                            "AIRLINE": "UA",
+                            "YEAR": { "$exists": True },
+                            "MONTH": { "$exists": True },
+                            "DAY": { "$exists": True }
+                        }
+                    },
+                    {
+                        "$group": {
+                            "_id": {
+                                "year": "$YEAR",
+                                "month": "$MONTH",
+                                "day": "$DAY"
+                            },
+                            "flight_count": { "$sum": 1 }
+                        }
+                    }
+                ],
+                'projection': None
+            }
+        },
+        # joiny
+        {
+            'id': 'flights_per_airline',
+            'category': 'join',
+            'MariaDB': "SELECT a.AIRLINE, COUNT(f.FLIGHT_NUMBER) AS flight_count FROM Flights f JOIN Airlines a ON f.AIRLINE = a.IATA_CODE GROUP BY a.AIRLINE;",
+            'MongoDB': {
+                'collection': 'Flights',
+                'pipeline': [
+                    {
+                        "$group": {
+                            "_id": "$AIRLINE",
+                            "flight_count": {"$sum": 1}
+                        }
+                    },
+                    {
+                        "$lookup": {
+                            "from": "Airlines",
+                            "localField": "_id",
+                            "foreignField": "IATA_CODE",
+                            "as": "airline_info",
+                            "pipeline": [
+                                { "$project": { "AIRLINE": 1, "_id": 0 } }
+                            ]
+                        }
+                    },
+                    {
+                        "$set": {
+                            "airline_info": { "$arrayElemAt": ["$airline_info", 0] }
+                        }
+                    },
+                    {
+                        "$project": {
+                            "airline": "$airline_info.AIRLINE",
+                            "flight_count": 1,
+                            "_id": 0
+                        }
+                    }
+                ]
+            }
+        },
+        {
+            'id': 'delays_over_100_with_airports',
+            'category': 'join',
+            'MariaDB': """SELECT
                 a.AIRLINE as airline_name,
                 orig.AIRPORT as origin_airport,
                 dest.AIRPORT as destination_airport,
@@ -30,9 +161,157 @@ def main():
             WHERE f.ARRIVAL_DELAY > 100
             ORDER BY f.ARRIVAL_DELAY DESC;
             """,
-            "SELECT ap.AIRPORT AS destination_airport, a.AIRLINE AS airline_name FROM Flights f JOIN Airlines a ON f.AIRLINE = a.IATA_CODE JOIN Airports ap ON f.DESTINATION_AIRPORT = ap.IATA_CODE WHERE f.ARRIVAL_DELAY > 120;",
-            # podzapytania
-            """SELECT 
+            'MongoDB': {
+                'collection': 'Flights',
+                'pipeline': [
+                    {
+                        "$match": {
+                            "ARRIVAL_DELAY": {"$gt": 100}
+                        }
+                    },
+                    {
+                        "$lookup": {
+                            "from": "Airlines",
+                            "localField": "AIRLINE",
+                            "foreignField": "IATA_CODE",
+                            "as": "airline_info",
+                            "pipeline": [
+                                { "$project": { "AIRLINE": 1, "_id": 0 } }
+                            ]
+                        }
+                    },
+                    {
+                        "$set": {
+                            "airline_info": { "$arrayElemAt": ["$airline_info", 0] }
+                        }
+                    },
+                    {
+                        "$lookup": {
+                            "from": "Airports",
+                            "localField": "ORIGIN_AIRPORT",
+                            "foreignField": "IATA_CODE",
+                            "as": "origin_airport",
+                            "pipeline": [
+                                { "$project": { "AIRPORT": 1, "_id": 0 } }
+                            ]
+                        }
+                    },
+                    {
+                        "$set": {
+                            "origin_airport": { "$arrayElemAt": ["$origin_airport", 0] }
+                        }
+                    },
+                    {
+                        "$lookup": {
+                            "from": "Airports",
+                            "localField": "DESTINATION_AIRPORT",
+                            "foreignField": "IATA_CODE",
+                            "as": "destination_airport",
+                            "pipeline": [
+                                { "$project": { "AIRPORT": 1, "_id": 0 } }
+                            ]
+                        }
+                    },
+                    {
+                        "$set": {
+                            "destination_airport": { "$arrayElemAt": ["$destination_airport", 0] }
+                        }
+                    },
+                    {
+                        "$project": {
+                            "airline_name": "$airline_info.AIRLINE",
+                            "origin_airport": "$origin_airport.AIRPORT",
+                            "destination_airport": "$destination_airport.AIRPORT",
+                            "arrival_delay": "$ARRIVAL_DELAY",
+                            "_id": 0
+                        }
+                    },
+                    {
+                        "$sort": {"arrival_delay": -1}
+                    }
+                ]
+            }
+        },
+        {
+            'id': 'delays_over_120_with_airports',
+            'category': 'join',
+            'MariaDB': "SELECT ap.AIRPORT AS destination_airport, a.AIRLINE AS airline_name FROM Flights f JOIN Airlines a ON f.AIRLINE = a.IATA_CODE JOIN Airports ap ON f.DESTINATION_AIRPORT = ap.IATA_CODE WHERE f.ARRIVAL_DELAY > 120;",
+            'MongoDB': {
+                'collection': 'Flights',
+                'pipeline': [
+                    {
+                        "$match": {
+                            "ARRIVAL_DELAY": {"$gt": 120}
+                        }
+                    },
+                    {
+                        "$lookup": {
+                            "from": "Airlines",
+                            "localField": "AIRLINE",
+                            "foreignField": "IATA_CODE",
+                            "as": "airline_info",
+                            "pipeline": [
+                                { "$project": { "AIRLINE": 1, "_id": 0 } }
+                            ]
+                        }
+                    },
+                    {
+                        "$set": {
+                            "airline_info": { "$arrayElemAt": ["$airline_info", 0] }
+                        }
+                    },
+                    {
+                        "$lookup": {
+                            "from": "Airports",
+                            "localField": "ORIGIN_AIRPORT",
+                            "foreignField": "IATA_CODE",
+                            "as": "origin_airport",
+                            "pipeline": [
+                                { "$project": { "AIRPORT": 1, "_id": 0 } }
+                            ]
+                        }
+                    },
+                    {
+                        "$set": {
+                            "origin_airport": { "$arrayElemAt": ["$origin_airport", 0] }
+                        }
+                    },
+                    {
+                        "$lookup": {
+                            "from": "Airports",
+                            "localField": "DESTINATION_AIRPORT",
+                            "foreignField": "IATA_CODE",
+                            "as": "destination_airport",
+                            "pipeline": [
+                                { "$project": { "AIRPORT": 1, "_id": 0 } }
+                            ]
+                        }
+                    },
+                    {
+                        "$set": {
+                            "destination_airport": { "$arrayElemAt": ["$destination_airport", 0] }
+                        }
+                    },
+                    {
+                        "$project": {
+                            "airline_name": "$airline_info.AIRLINE",
+                            "origin_airport": "$origin_airport.AIRPORT",
+                            "destination_airport": "$destination_airport.AIRPORT",
+                            "arrival_delay": "$ARRIVAL_DELAY",
+                            "_id": 0
+                        }
+                    },
+                    {
+                        "$sort": {"arrival_delay": -1}
+                    }
+                ]
+            }
+        },
+        # podzapytania
+        {
+            'id': 'airlines_above_avg_delay',
+            'category': 'subquery',
+            'MariaDB': """SELECT
             f.AIRLINE,
             a.AIRLINE as AIRLINE_NAME,
             ROUND(AVG(f.ARRIVAL_DELAY), 2) as AVG_DELAY
@@ -40,23 +319,95 @@ def main():
             JOIN Airlines a ON f.AIRLINE = a.IATA_CODE
             GROUP BY f.AIRLINE
             HAVING AVG_DELAY > (
-                SELECT AVG(ARRIVAL_DELAY) 
+                SELECT AVG(ARRIVAL_DELAY)
                 FROM Flights
             )
             ORDER BY AVG_DELAY DESC;
             """,
-            """SELECT 
+            'MongoDB': {
+                'collection': 'Flights',
+                'pipeline': [
+                    {
+                        "$facet": {
+                            "totalAvgDelay": [
+                                {
+                                    "$group": {
+                                        "_id": 1,
+                                        "avg": { "$avg": "$ARRIVAL_DELAY" }
+                                    }
+                                }
+                            ],
+                            "airlineDelays": [
+                                {
+                                    "$group": {
+                                        "_id": "$AIRLINE",
+                                        "avgDelay": { "$avg": "$ARRIVAL_DELAY" }
+                                    }
+                                },
+                                {
+                                    "$lookup": {
+                                        "from": "Airlines",
+                                        "localField": "_id",
+                                        "foreignField": "IATA_CODE",
+                                        "as": "airline_info"
+                                    }
+                                },
+                                {
+                                    "$unwind": "$airline_info"
+                                }
+                            ]
+                        }
+                    },
+                    {
+                        "$unwind": "$totalAvgDelay"
+                    },
+                    {
+                        "$project": {
+                            "results": {
+                                "$filter": {
+                                    "input": "$airlineDelays",
+                                    "as": "airline",
+                                    "cond": { "$gt": ["$$airline.avgDelay", "$totalAvgDelay.avg"] }
+                                }
+                            }
+                        }
+                    },
+                    {
+                        "$unwind": "$results"
+                    },
+                    {
+                        "$project": {
+                            "_id": "$results._id",
+                            "airlineName": "$results.airline_info.AIRLINE",
+                            "avgDelay": { "$round": ["$results.avgDelay", 2] }
+                        }
+                    },
+                    {
+                        "$sort": { "avgDelay": -1 }
+                    }
+                ],
+            }
+        },
+        {
+            'id': 'airports_with_above_avg_distance',
+            'category': 'subquery',
+            # brak odpowiednika w MongoDB
+            'MariaDB': """SELECT
             DISTINCT a.AIRPORT,
             a.CITY,
             a.STATE
             FROM Airports a
             JOIN Flights f ON a.IATA_CODE = f.ORIGIN_AIRPORT
             WHERE f.DISTANCE > (
-                SELECT AVG(DISTANCE) 
+                SELECT AVG(DISTANCE)
                 FROM Flights
             )
-            ORDER BY a.STATE, a.CITY; """,
-            """SELECT 
+            ORDER BY a.STATE, a.CITY; """
+        },
+        {
+            'id': 'top_delayed_airline_per_month',
+            'category': 'subquery',
+            'MariaDB': """SELECT
             f.MONTH,
             a.AIRLINE as AIRLINE_NAME,
             COUNT(*) as DELAYED_FLIGHTS
@@ -65,407 +416,102 @@ def main():
             WHERE f.ARRIVAL_DELAY > 0
             GROUP BY f.MONTH, f.AIRLINE
             HAVING DELAYED_FLIGHTS = (
-                SELECT COUNT(*) 
-                FROM Flights f2 
-                WHERE f2.MONTH = f.MONTH 
-                AND f2.ARRIVAL_DELAY > 0 
-                GROUP BY f2.AIRLINE 
-                ORDER BY COUNT(*) DESC 
+                SELECT COUNT(*)
+                FROM Flights f2
+                WHERE f2.MONTH = f.MONTH
+                AND f2.ARRIVAL_DELAY > 0
+                GROUP BY f2.AIRLINE
+                ORDER BY COUNT(*) DESC
                 LIMIT 1
             )
-            ORDER BY f.MONTH; """
-        ],
-        'MongoDB': [
-                # zapytania
-                {
-                    'collection': 'Flights',
-                    'query': {"ARRIVAL_DELAY": {"$gt": 60}},
-                    'projection': {"_id": 0, "FLIGHT_NUMBER": 1, "ARRIVAL_DELAY": 1}
-                },
-                {
-                    'collection': 'Airlines',
-                    'query': {"IATA_CODE": "AA"},
-                    'projection': {"_id": 0, "AIRLINE": 1}
-                },
-                {
-                    'collection': 'Airports',
-                    'query': { "STATE": "CA" },
-                    'projection': {"_id": 0, "AIRPORT": 1, "CITY": 1}
-                },
-                # grupowanie
-                {
-                    'collection': 'Flights',
-                    'pipeline': [
-                        {
-                            "$group": {
-                                "_id": "$DAY_OF_WEEK",  
-                                "avg_arrival_delay": { "$avg": "$ARRIVAL_DELAY" }
-                            }
+            ORDER BY f.MONTH; """,
+            'MongoDB': {
+                'collection': 'Flights',
+                'pipeline': [
+                    {
+                        "$match": {
+                            "ARRIVAL_DELAY": { "$gt": 0 }
                         }
-                    ]
-                },
-                {
-                    'collection': 'Flights',
-                    'pipeline': [
-                        {
-                            "$match": {
-                                "CANCELLED": 1,
-                                "CANCELLATION_REASON": { "$exists": True }
-                            }
-                        },
-                        {
-                            "$group": {
-                                "_id": "$CANCELLATION_REASON", 
-                                "cancel_count": { "$sum": 1 }  
-                            }
+                    },
+                    {
+                        "$group": {
+                            "_id": {
+                                "month": "$MONTH",
+                                "airline": "$AIRLINE"
+                            },
+                            "delayed_flights": { "$sum": 1 }
                         }
-                    ]
-                },
-                {
-                    'collection': 'Flights',
-                    'pipeline': [
-                                                {
-                            "$match": {
-                                "AIRLINE": "UA",
-                                "YEAR": { "$exists": True },
-                                "MONTH": { "$exists": True },
-                                "DAY": { "$exists": True }
-                            }
-                        },
-                        {
-                            "$group": {
-                                "_id": {
-                                    "year": "$YEAR",  
-                                    "month": "$MONTH",  
-                                    "day": "$DAY"  
-                                },
-                                "flight_count": { "$sum": 1 } 
+                    },
+                    {
+                        "$group": {
+                            "_id": "$_id.month",
+                            "maxDelays": { "$max": "$delayed_flights" },
+                            "allData": {
+                                "$push": {
+                                    "airline": "$_id.airline",
+                                    "delayed_flights": "$delayed_flights"
+                                }
                             }
                         }
-                    ],
-                    'projection': None
-                },
-                # joiny
-                {
-                    'collection': 'Flights',
-                    'pipeline': [
-                        {
-                            "$group": {
-                                "_id": "$AIRLINE",
-                                "flight_count": {"$sum": 1}
-                            }
-                        },
-                        {
-                            "$lookup": {
-                                "from": "Airlines",
-                                "localField": "_id",
-                                "foreignField": "IATA_CODE",
-                                "as": "airline_info",
-                                "pipeline": [
-                                    { "$project": { "AIRLINE": 1, "_id": 0 } }
-                                ]
-                            }
-                        },
-                        {
-                            "$set": {
-                                "airline_info": { "$arrayElemAt": ["$airline_info", 0] }
-                            }
-                        },
-                        {
-                            "$project": {
-                                "airline": "$airline_info.AIRLINE",
-                                "flight_count": 1,
-                                "_id": 0
+                    },
+                    {
+                        "$project": {
+                            "airline_data": {
+                                "$filter": {
+                                    "input": "$allData",
+                                    "as": "item",
+                                    "cond": { "$eq": ["$$item.delayed_flights", "$maxDelays"] }
+                                }
                             }
                         }
-                    ]
-                },
-                {
-                    'collection': 'Flights',
-                    'pipeline': [
-                        {
-                            "$match": {
-                                "ARRIVAL_DELAY": {"$gt": 100}
-                            }
-                        },
-                        {
-                            "$lookup": {
-                                "from": "Airlines",
-                                "localField": "AIRLINE",
-                                "foreignField": "IATA_CODE",
-                                "as": "airline_info",
-                                "pipeline": [
-                                    { "$project": { "AIRLINE": 1, "_id": 0 } }
-                                ]
-                            }
-                        },
-                        {
-                            "$set": {
-                                "airline_info": { "$arrayElemAt": ["$airline_info", 0] }
-                            }
-                        },
-                        {
-                            "$lookup": {
-                                "from": "Airports",
-                                "localField": "ORIGIN_AIRPORT",
-                                "foreignField": "IATA_CODE",
-                                "as": "origin_airport",
-                                "pipeline": [
-                                    { "$project": { "AIRPORT": 1, "_id": 0 } }
-                                ]
-                            }
-                        },
-                        {
-                            "$set": {
-                                "origin_airport": { "$arrayElemAt": ["$origin_airport", 0] }
-                            }
-                        },
-                        {
-                            "$lookup": {
-                                "from": "Airports",
-                                "localField": "DESTINATION_AIRPORT",
-                                "foreignField": "IATA_CODE",
-                                "as": "destination_airport",
-                                "pipeline": [
-                                    { "$project": { "AIRPORT": 1, "_id": 0 } }
-                                ]
-                            }
-                        },
-                        {
-                            "$set": {
-                                "destination_airport": { "$arrayElemAt": ["$destination_airport", 0] }
-                            }
-                        },
-                        {
-                            "$project": {
-                                "airline_name": "$airline_info.AIRLINE",
-                                "origin_airport": "$origin_airport.AIRPORT",
-                                "destination_airport": "$destination_airport.AIRPORT",
-                                "arrival_delay": "$ARRIVAL_DELAY",
-                                "_id": 0
-                            }
-                        },
-                        {
-                            "$sort": {"arrival_delay": -1}
-                        }
-                    ]
-                },
-                {
-                    'collection': 'Flights',
-                    'pipeline': [
-                        {
-                            "$match": {
-                                "ARRIVAL_DELAY": {"$gt": 120}
-                            }
-                        },
-                        {
-                            "$lookup": {
-                                "from": "Airlines",
-                                "localField": "AIRLINE",
-                                "foreignField": "IATA_CODE",
-                                "as": "airline_info",
-                                "pipeline": [
-                                    { "$project": { "AIRLINE": 1, "_id": 0 } }
-                                ]
-                            }
-                        },
-                        {
-                            "$set": {
-                                "airline_info": { "$arrayElemAt": ["$airline_info", 0] }
-                            }
-                        },
-                        {
-                            "$lookup": {
-                                "from": "Airports",
-                                "localField": "ORIGIN_AIRPORT",
-                                "foreignField": "IATA_CODE",
-                                "as": "origin_airport",
-                                "pipeline": [
-                                    { "$project": { "AIRPORT": 1, "_id": 0 } }
-                                ]
-                            }
-                        },
-                        {
-                            "$set": {
-                                "origin_airport": { "$arrayElemAt": ["$origin_airport", 0] }
-                            }
-                        },
-                        {
-                            "$lookup": {
-                                "from": "Airports",
-                                "localField": "DESTINATION_AIRPORT",
-                                "foreignField": "IATA_CODE",
-                                "as": "destination_airport",
-                                "pipeline": [
-                                    { "$project": { "AIRPORT": 1, "_id": 0 } }
-                                ]
-                            }
-                        },
-                        {
-                            "$set": {
-                                "destination_airport": { "$arrayElemAt": ["$destination_airport", 0] }
-                            }
-                        },
-                        {
-                            "$project": {
-                                "airline_name": "$airline_info.AIRLINE",
-                                "origin_airport": "$origin_airport.AIRPORT",
-                                "destination_airport": "$destination_airport.AIRPORT",
-                                "arrival_delay": "$ARRIVAL_DELAY",
-                                "_id": 0
-                            }
-                        },
-                        {
-                            "$sort": {"arrival_delay": -1}
-                        }
-                    ]
-                },
-                # podzapytania
-                {
-                    'collection': 'Flights',
-                    'pipeline': [
-                        {
-                            "$group": {
-                                "_id": "$DAY_OF_WEEK",  
-                                "avg_arrival_delay": { "$avg": "$ARRIVAL_DELAY" }
-                            }
+                    },
+                    {
+                        "$unwind": "$airline_data"
+                    },
+                    {
+                        "$lookup": {
+                            "from": "Airlines",
+                            "localField": "airline_data.airline",
+                            "foreignField": "IATA_CODE",
+                            "as": "airline_info"
                         }
-                    ]
-                },
-                {
-                    'collection': 'Flights',
-                    'pipeline': [
-                        {
-                            "$facet": {
-                                "totalAvgDelay": [
-                                    {
-                                        "$group": {
-                                            "_id": 1,
-                                            "avg": { "$avg": "$ARRIVAL_DELAY" }
-                                        }
-                                    }
-                                ],
-                                "airlineDelays": [
-                                    {
-                                        "$group": {
-                                            "_id": "$AIRLINE",
-                                            "avgDelay": { "$avg": "$ARRIVAL_DELAY" }
-                                        }
-                                    },
-                                    {
-                                        "$lookup": {
-                                            "from": "Airlines",
-                                            "localField": "_id",
-                                            "foreignField": "IATA_CODE",
-                                            "as": "airline_info"
-                                        }
-                                    },
-                                    {
-                                        "$unwind": "$airline_info"
-                                    }
-                                ]
-                            }
-                        },
-                        {
-                            "$unwind": "$totalAvgDelay"
-                        },
-                        {
-                            "$project": {
-                                "results": {
-                                    "$filter": {
-                                        "input": "$airlineDelays",
-                                        "as": "airline",
-                                        "cond": { "$gt": ["$$airline.avgDelay", "$totalAvgDelay.avg"] }
-                                    }
-                                }
-                            }
-                        },
-                        {
-                            "$unwind": "$results"
-                        },
-                        {
-                            "$project": {
-                                "_id": "$results._id",
-                                "airlineName": "$results.airline_info.AIRLINE",
-                                "avgDelay": { "$round": ["$results.avgDelay", 2] }
-                            }
-                        },
-                        {
-                            "$sort": { "avgDelay": -1 }
-                        }
-                    ],
-                },
-                {
-                    'collection': 'Flights',
-                    'pipeline': [
-                        {
-                            "$match": {
-                                "ARRIVAL_DELAY": { "$gt": 0 }
-                            }
-                        },
-                        {
-                            "$group": {
-                                "_id": {
-                                    "month": "$MONTH",
-                                    "airline": "$AIRLINE"
-                                },
-                                "delayed_flights": { "$sum": 1 }
-                            }
-                        },
-                        {
-                            "$group": {
-                                "_id": "$_id.month",
-                                "maxDelays": { "$max": "$delayed_flights" },
-                                "allData": {
-                                    "$push": {
-                                        "airline": "$_id.airline",
-                                        "delayed_flights": "$delayed_flights"
-                                    }
-                                }
-                            }
-                        },
-                        {
-                            "$project": {
-                                "airline_data": {
-                                    "$filter": {
-                                        "input": "$allData",
-                                        "as": "item",
-                                        "cond": { "$eq": ["$$item.delayed_flights", "$maxDelays"] }
-                                    }
-                                }
-                            }
-                        },
-                        {
-                            "$unwind": "$airline_data"
-                        },
-                        {
-                            "$lookup": {
-                                "from": "Airlines",
-                                "localField": "airline_data.airline",
-                                "foreignField": "IATA_CODE",
-                                "as": "airline_info"
-                            }
-                        },
-                        {
-                            "$unwind": "$airline_info"
-                        },
-                        {
-                            "$project": {
-                                "_id": 0,
-                                "month": "$_id",
-                                "airline_name": "$airline_info.AIRLINE",
-                                "delayed_flights": "$airline_data.delayed_flights"
-                            }
-                        },
-                        {
-                            "$sort": { "month": 1 }
-                        }
-                    ]
-                },
-            ]
-    }
+                    },
+                    {
+                        "$unwind": "$airline_info"
+                    },
+                    {
+                        "$project": {
+                            "_id": 0,
+                            "month": "$_id",
+                            "airline_name": "$airline_info.AIRLINE",
+                            "delayed_flights": "$airline_data.delayed_flights"
+                        }
+                    },
+                    {
+                        "$sort": { "month": 1 }
+                    }
+                ]
+            }
+        },
+        {
+            'id': 'avg_delay_by_day_of_week_repeated',
+            'category': 'subquery',
+            # brak odpowiednika w MariaDB - powtórzenie avg_delay_by_day_of_week
+            'MongoDB': {
+                'collection': 'Flights',
+                'pipeline': [
+                    {
+                        "$group": {
+                            "_id": "$DAY_OF_WEEK",
+                            "avg_arrival_delay": { "$avg": "$ARRIVAL_DELAY" }
+                        }
+                    }
+                ]
+            }
+        }
+    ]
 
-    test_database_performance(queries, db_name)
+    run_tests(queries, db_name)
 
 if __name__ == "__main__":
     main()
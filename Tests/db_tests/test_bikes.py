@@ -2,73 +2,60 @@
 Moduł testujący dla bazy Bikes
 """
 
-from testing_functions import test_database_performance
+from testing_functions import run_tests
 
 def main():
     db_name = "Bikes"
-    queries = {
-        'MariaDB': [
-            # zapytania
-            "SELECT * FROM TripUsers WHERE tripduration > 30 * 60;",
-            "SELECT * FROM TripUsers WHERE end_station_name = 'Newport Pkwy';",
-            "SELECT DISTINCT usertype FROM TripUsers;",
-            # grupowanie
-            "SELECT usertype, COUNT(*) AS trip_count FROM TripUsers GROUP BY usertype;",
-            "SELECT birth_year, SUM(tripduration) AS total_tripduration FROM TripUsers GROUP BY birth_year;", 
-            "SELECT gender, AVG(tripduration) AS average_tripduration FROM TripUsers GROUP BY gender;",
-            # joiny
-            """SELECT 
-            t.trip_id, t.tripduration, s.station_name AS start_stat_name, e.station_name AS end_stat_name 
-            FROM TripUsers t JOIN Stations s ON t.start_station_id = s.station_id 
-            JOIN Stations e ON t.end_station_id = e.station_id 
-            WHERE t.tripduration > 20;""",
-            """SELECT 
-            t.trip_id, t.tripduration, start_stations.station_name AS start_station_name, end_stations.station_name AS end_station_name 
-            FROM TripUsers t JOIN  Stations AS start_stations ON t.start_station_id = start_stations.station_id 
-            JOIN Stations AS end_stations ON t.end_station_id = end_stations.station_id 
-            WHERE t.tripduration > 20;""",
-            """SELECT 
-            t.trip_id, t.tripduration, t.starttime, start_station.station_name AS start_station, end_station.station_name AS end_station 
-            FROM TripUsers t JOIN Stations start_station ON t.start_station_id = start_station.station_id 
-            JOIN Stations end_station ON t.end_station_id = end_station.station_id;""",
-            # podzapytania
-            "SELECT * FROM TripUsers WHERE tripduration > (SELECT AVG(tripduration) FROM TripUsers);",
-            "SELECT * FROM Stations WHERE station_id IN (SELECT DISTINCT end_station_id FROM TripUsers);",
-            """SELECT * 
-            FROM TripUsers
-            WHERE birth_year < 1980 AND tripduration > (SELECT AVG(tripduration) FROM TripUsers WHERE birth_year < 1980);"""
-        ],
-        'MongoDB': [
-            # zapytania
-            {
+    queries = [
+        # zapytania
+        {
+            'id': 'trips_over_30_minutes',
+            'category': 'simple',
+            'MariaDB': "SELECT * FROM TripUsers WHERE tripduration > 30 * 60;",
+            'MongoDB': {
                 'collection': 'TripUsers',
                 'query': {"tripduration": { "$gt": 1800 } },
-                'projection': None 
-            },
-            {
+                'projection': None
+            }
+        },
+        {
+            'id': 'trips_ending_at_newport_pkwy',
+            'category': 'simple',
+            'MariaDB': "SELECT * FROM TripUsers WHERE end_station_name = 'Newport Pkwy';",
+            'MongoDB': {
                 'collection': 'TripUsers',
                 'query': {"end_station_name": "Newport Pkwy" },
                 'projection': None
-            },
-            { 
+            }
+        },
+        {
+            'id': 'distinct_user_types',
+            'category': 'simple',
+            'MariaDB': "SELECT DISTINCT usertype FROM TripUsers;",
+            'MongoDB': {
                 'collection': 'TripUsers',
                 'pipeline': [
                     {
                         "$group": {"_id": "$usertype"}
-                    },  
+                    },
                     {
                         "$project": {"usertype": "$_id", "_id": 0}
-                    }  
+                    }
                 ]
-            },
-            # grupowanie
-            {
+            }
+        },
+        # grupowanie
+        {
+            'id': 'trips_by_user_type',
+            'category': 'group',
+            'MariaDB': "SELECT usertype, COUNT(*) AS trip_count FROM TripUsers GROUP BY usertype;",
+            'MongoDB': {
                 'collection': 'TripUsers',
                 'pipeline': [
                     {
                         "$group": {
                             "_id": "$usertype",
-                            "trip_count": {"$sum": 1}  
+                            "trip_count": {"$sum": 1}
                         }
                     },
                     {
@@ -79,11 +66,16 @@ def main():
                         }
                     },
                     {
-                        "$sort": {"usertype": 1} 
+                        "$sort": {"usertype": 1}
                     }
                 ]
-            },
-            {
+            }
+        },
+        {
+            'id': 'tripduration_by_birth_year',
+            'category': 'group',
+            'MariaDB': "SELECT birth_year, SUM(tripduration) AS total_tripduration FROM TripUsers GROUP BY birth_year;",
+            'MongoDB': {
                 'collection': 'TripUsers',
                 'pipeline': [
                     {
@@ -100,16 +92,21 @@ def main():
                         }
                     },
                     {
-                        "$sort": {"birth_year": 1}  
+                        "$sort": {"birth_year": 1}
                     },
                     {
-                        "$match": {  
+                        "$match": {
                             "birth_year": {"$ne": None}
                         }
                     }
                 ]
-            },
-            {
+            }
+        },
+        {
+            'id': 'avg_tripduration_by_gender',
+            'category': 'group',
+            'MariaDB': "SELECT gender, AVG(tripduration) AS average_tripduration FROM TripUsers GROUP BY gender;",
+            'MongoDB': {
                 'collection': 'TripUsers',
                 'pipeline': [
                     {
@@ -136,14 +133,23 @@ def main():
                         }
                     }
                 ]
-            },
-            # joiny
-            {
+            }
+        },
+        # joiny
+        {
+            'id': 'trips_with_station_names',
+            'category': 'join',
+            'MariaDB': """SELECT
+            t.trip_id, t.tripduration, s.station_name AS start_stat_name, e.station_name AS end_stat_name
+            FROM TripUsers t JOIN Stations s ON t.start_station_id = s.station_id
+            JOIN Stations e ON t.end_station_id = e.station_id
+            WHERE t.tripduration > 20;""",
+            'MongoDB': {
                 'collection': 'TripUsers',
                 'pipeline': [
                     {
                         "$match": {
-                            "tripduration": {"$gt": 20}  
+                            "tripduration": {"$gt": 20}
                         }
                     },
                     {
@@ -181,8 +187,17 @@ def main():
                         "$sort": {"trip_id": 1}
                     },
                 ]
-            },
-            {
+            }
+        },
+        {
+            'id': 'trips_with_station_names_aliased',
+            'category': 'join',
+            'MariaDB': """SELECT
+            t.trip_id, t.tripduration, start_stations.station_name AS start_station_name, end_stations.station_name AS end_station_name
+            FROM TripUsers t JOIN  Stations AS start_stations ON t.start_station_id = start_stations.station_id
+            JOIN Stations AS end_stations ON t.end_station_id = end_stations.station_id
+            WHERE t.tripduration > 20;""",
+            'MongoDB': {
                 'collection': 'TripUsers',
                 'pipeline': [
                     {
@@ -215,8 +230,16 @@ def main():
                         }
                     }
                 ]
-            },
-            {
+            }
+        },
+        {
+            'id': 'all_trips_with_station_names',
+            'category': 'join',
+            'MariaDB': """SELECT
+            t.trip_id, t.tripduration, t.starttime, start_station.station_name AS start_station, end_station.station_name AS end_station
+            FROM TripUsers t JOIN Stations start_station ON t.start_station_id = start_station.station_id
+            JOIN Stations end_station ON t.end_station_id = end_station.station_id;""",
+            'MongoDB': {
                 'collection': 'TripUsers',
                 'pipeline': [
                     {
@@ -244,11 +267,16 @@ def main():
                             'end_station': {'$arrayElemAt': ['$end_station.station_name', 0]}
                         }
                     }
-                    
+
                 ]
-            },
-            # podzapytania
-            {
+            }
+        },
+        # podzapytania
+        {
+            'id': 'trips_above_avg_duration',
+            'category': 'subquery',
+            'MariaDB': "SELECT * FROM TripUsers WHERE tripduration > (SELECT AVG(tripduration) FROM TripUsers);",
+            'MongoDB': {
                 'collection': 'TripUsers',
                 'query': None,
                 'pipeline': [
@@ -264,7 +292,7 @@ def main():
                             ],
                             'allTrips': [
                                 {
-                                    '$match': {}  
+                                    '$match': {}
                                 }
                             ]
                         }
@@ -294,8 +322,13 @@ def main():
                         }
                     }
                 ]
-            },
-            {
+            }
+        },
+        {
+            'id': 'stations_used_as_trip_end',
+            'category': 'subquery',
+            'MariaDB': "SELECT * FROM Stations WHERE station_id IN (SELECT DISTINCT end_station_id FROM TripUsers);",
+            'MongoDB': {
                 'collection': 'Stations',
                 'pipeline': [
                     {
@@ -340,11 +373,19 @@ def main():
                         }
                     }
                 ]
-            },
-        ]
-    }
+            }
+        },
+        {
+            'id': 'pre_1980_trips_above_avg_duration',
+            'category': 'subquery',
+            # brak odpowiednika w MongoDB
+            'MariaDB': """SELECT *
+            FROM TripUsers
+            WHERE birth_year < 1980 AND tripduration > (SELECT AVG(tripduration) FROM TripUsers WHERE birth_year < 1980);"""
+        }
+    ]
 
-    test_database_performance(queries, db_name)
+    run_tests(queries, db_name)
 
 if __name__ == "__main__":
     main()
@@ -2,129 +2,63 @@
 Moduł testujący dla bazy Doctors_Appointments
 """
 
-from testing_functions import test_database_performance
+from testing_functions import run_tests
 
 def main():
     db_name = "Doctors_Appointments"
-    queries = {
-        'MariaDB': [
-            # zapytania
-            "SELECT * FROM Doctors WHERE specialization = 'Cardiology';",
-            "SELECT * FROM Patients WHERE birthdate < '1980-01-01';",
-            "SELECT * FROM Appointments WHERE diagnosis = 'Hypertension';",
-            # grupowanie
-            "SELECT YEAR(birthdate) AS birth_year, COUNT(*) AS patient_count FROM Patients GROUP BY birth_year;",
-            "SELECT patient_id, COUNT(DISTINCT doctor_id) AS doctor_count FROM Appointments GROUP BY patient_id HAVING doctor_count > 1;", 
-            "SELECT diagnosis, COUNT(*) AS diagnosis_count FROM Appointments GROUP BY diagnosis;",
-            # joiny
-            """SELECT 
-                a.appointment_id,
-                CONCAT(d.first_name, ' ', d.last_name) AS doctor_name,
-                CONCAT(p.first_name, ' ', p.last_name) AS patient_name,
-                a.diagnosis,
-                a.treatment
-            FROM 
-                Appointments a
-            JOIN 
-                Doctors d ON a.doctor_id = d.doctor_id
-            JOIN 
-                Patients p ON a.patient_id = p.patient_id
-            WHERE 
-                d.doctor_id = 6970;
-            """,
-            """SELECT 
-                a.appointment_date,
-                d.first_name as doctor_first_name,
-                d.last_name as doctor_last_name,
-                p.first_name as patient_first_name,
-                p.last_name as patient_last_name,
-                a.diagnosis
-            FROM Appointments a
-            JOIN Doctors d ON a.doctor_id = d.doctor_id
-            JOIN Patients p ON a.patient_id = p.patient_id
-            LIMIT 10;""",
-            """SELECT 
-                p.first_name,
-                p.last_name,
-                COUNT(*) as total_appointments
-            FROM Appointments a
-            JOIN Patients p ON a.patient_id = p.patient_id
-            GROUP BY a.patient_id, p.first_name, p.last_name
-            HAVING COUNT(*) > 7
-            LIMIT 10;""",
-            # podzapytania
-            """WITH DoctorWithMostPatients AS (
-                SELECT 
-                    doctor_id,
-                    COUNT(*) as patient_count
-                FROM Appointments
-                GROUP BY doctor_id
-                ORDER BY COUNT(*) DESC
-                LIMIT 1
-            )
-            SELECT DISTINCT
-                p.first_name,
-                p.last_name
-            FROM Appointments a
-            JOIN Patients p ON a.patient_id = p.patient_id
-            JOIN DoctorWithMostPatients d ON a.doctor_id = d.doctor_id
-            LIMIT 10;
-            """,
-            """SELECT first_name, last_name
-            FROM Patients
-            WHERE patient_id IN (
-                SELECT patient_id
-                FROM Appointments
-                GROUP BY patient_id, diagnosis
-                HAVING COUNT(appointment_id) >= 2
-            );
-            """,
-            """SELECT DISTINCT 
-                first_name, 
-                last_name
-            FROM Patients
-            WHERE patient_id IN (
-                SELECT a.patient_id
-                FROM Appointments a
-                JOIN Doctors d ON a.doctor_id = d.doctor_id
-                WHERE d.specialization = 'Cardiology'
-            )
-            LIMIT 10;"""
-        ],
-        'MongoDB': [
-            # zapytania
-            {
+    queries = [
+        # zapytania
+        {
+            'id': 'cardiologists',
+            'category': 'simple',
+            'MariaDB': "SELECT * FROM Doctors WHERE specialization = 'Cardiology';",
+            'MongoDB': {
                 'collection': 'Doctors',
                 'query': { "specialization": 'Cardiology' },
-                'projection': None 
-            },
-            {
+                'projection': None
+            }
+        },
+        {
+            'id': 'patients_born_before_1980',
+            'category': 'simple',
+            'MariaDB': "SELECT * FROM Patients WHERE birthdate < '1980-01-01';",
+            'MongoDB': {
                 'collection': 'Patients',
                 'query': { 'birthdate': {'$lt': '1980-01-01'} },
                 'projection': None
-            },
-            { 
+            }
+        },
+        {
+            'id': 'hypertension_appointments',
+            'category': 'simple',
+            'MariaDB': "SELECT * FROM Appointments WHERE diagnosis = 'Hypertension';",
+            'MongoDB': {
                 'collection': 'Appointments',
                 'query': None,
                 'pipeline': [
                     {
-                        '$match': 
+                        '$match':
                         {'diagnosis': 'Hypertension'}
                     },
                     {
                         '$project': {'_id': 0}
                     }
                 ]
-            },
-            # grupowanie
-            {
+            }
+        },
+        # grupowanie
+        {
+            'id': 'patients_by_birth_year',
+            'category': 'group',
+            'MariaDB': "SELECT YEAR(birthdate) AS birth_year, COUNT(*) AS patient_count FROM Patients GROUP BY birth_year;",
+            'MongoDB': {
                 'collection': 'Patients',
                 'pipeline': [
                     {
                         '$addFields': {
                             'converted_date': {
                                 '$cond': {
-                                    'if': {'$type': '$birthdate'}, 
+                                    'if': {'$type': '$birthdate'},
                                     'then': {
                                         '$cond': {
                                             'if': {'$eq': [{'$type': '$birthdate'}, 'string']},
@@ -156,8 +90,13 @@ def main():
                         }
                     }
                 ]
-            },
-            {
+            }
+        },
+        {
+            'id': 'patients_with_multiple_doctors',
+            'category': 'group',
+            'MariaDB': "SELECT patient_id, COUNT(DISTINCT doctor_id) AS doctor_count FROM Appointments GROUP BY patient_id HAVING doctor_count > 1;",
+            'MongoDB': {
                 'collection': 'Appointments',
                 'pipeline': [
                     {
@@ -185,8 +124,13 @@ def main():
                         }
                     }
                 ]
-            },
-            {
+            }
+        },
+        {
+            'id': 'appointments_by_diagnosis',
+            'category': 'group',
+            'MariaDB': "SELECT diagnosis, COUNT(*) AS diagnosis_count FROM Appointments GROUP BY diagnosis;",
+            'MongoDB': {
                 'collection': 'Appointments',
                 'pipeline': [
                     {
@@ -203,15 +147,34 @@ def main():
                         }
                     }
                 ]
-            },
-            # joiny
-            {
+            }
+        },
+        # joiny
+        {
+            'id': 'appointments_of_doctor_6970',
+            'category': 'join',
+            'MariaDB': """SELECT
+                a.appointment_id,
+                CONCAT(d.first_name, ' ', d.last_name) AS doctor_name,
+                CONCAT(p.first_name, ' ', p.last_name) AS patient_name,
+                a.diagnosis,
+                a.treatment
+            FROM
+                Appointments a
+            JOIN
+                Doctors d ON a.doctor_id = d.doctor_id
+            JOIN
+                Patients p ON a.patient_id = p.patient_id
+            WHERE
+                d.doctor_id = 6970;
+            """,
+            'MongoDB': {
                 'collection': 'Appointments',
                 'pipeline': [
                     {
                         '$match': {
                             'doctor_id' : 6970
-                        }  
+                        }
                     },
                     {
                         '$lookup': {
@@ -241,8 +204,8 @@ def main():
                             'appointment_id': 1,
                             'doctor_name': {
                                 '$concat': [
-                                    '$doctor.first_name', 
-                                    ' ', 
+                                    '$doctor.first_name',
+                                    ' ',
                                     '$doctor.last_name'
                                 ]
                             },
@@ -258,8 +221,23 @@ def main():
                         }
                     }
                 ]
-            },
-            {
+            }
+        },
+        {
+            'id': 'appointments_with_names',
+            'category': 'join',
+            'MariaDB': """SELECT
+                a.appointment_date,
+                d.first_name as doctor_first_name,
+                d.last_name as doctor_last_name,
+                p.first_name as patient_first_name,
+                p.last_name as patient_last_name,
+                a.diagnosis
+            FROM Appointments a
+            JOIN Doctors d ON a.doctor_id = d.doctor_id
+            JOIN Patients p ON a.patient_id = p.patient_id
+            LIMIT 10;""",
+            'MongoDB': {
                 'collection': 'Appointments',
                 'pipeline': [
                     {
@@ -298,8 +276,21 @@ def main():
                         '$limit': 10
                     }
                 ]
-            },
-            {
+            }
+        },
+        {
+            'id': 'patients_with_many_appointments',
+            'category': 'join',
+            'MariaDB': """SELECT
+                p.first_name,
+                p.last_name,
+                COUNT(*) as total_appointments
+            FROM Appointments a
+            JOIN Patients p ON a.patient_id = p.patient_id
+            GROUP BY a.patient_id, p.first_name, p.last_name
+            HAVING COUNT(*) > 7
+            LIMIT 10;""",
+            'MongoDB': {
                 'collection': 'Appointments',
                 'pipeline': [
                     {
@@ -333,9 +324,30 @@ def main():
                         '$limit': 10
                     }
                 ]
-            },
-            # podzapytania
-            {
+            }
+        },
+        # podzapytania
+        {
+            'id': 'patients_of_busiest_doctor',
+            'category': 'subquery',
+            'MariaDB': """WITH DoctorWithMostPatients AS (
+                SELECT
+                    doctor_id,
+                    COUNT(*) as patient_count
+                FROM Appointments
+                GROUP BY doctor_id
+                ORDER BY COUNT(*) DESC
+                LIMIT 1
+            )
+            SELECT DISTINCT
+                p.first_name,
+                p.last_name
+            FROM Appointments a
+            JOIN Patients p ON a.patient_id = p.patient_id
+            JOIN DoctorWithMostPatients d ON a.doctor_id = d.doctor_id
+            LIMIT 10;
+            """,
+            'MongoDB': {
                 'collection': 'Appointments',
                 'pipeline': [
                     {
@@ -404,8 +416,21 @@ def main():
                         '$limit': 10
                     }
                 ]
-            },
-            {
+            }
+        },
+        {
+            'id': 'patients_with_repeated_diagnosis',
+            'category': 'subquery',
+            'MariaDB': """SELECT first_name, last_name
+            FROM Patients
+            WHERE patient_id IN (
+                SELECT patient_id
+                FROM Appointments
+                GROUP BY patient_id, diagnosis
+                HAVING COUNT(appointment_id) >= 2
+            );
+            """,
+            'MongoDB': {
                 'collection': 'Appointments',
                 'pipeline': [
                     {
@@ -444,11 +469,27 @@ def main():
                         '$limit': 10
                     }
                 ]
-            },
-        ]
-    }
+            }
+        },
+        {
+            'id': 'cardiology_patients',
+            'category': 'subquery',
+            # brak odpowiednika w MongoDB
+            'MariaDB': """SELECT DISTINCT
+                first_name,
+                last_name
+            FROM Patients
+            WHERE patient_id IN (
+                SELECT a.patient_id
+                FROM Appointments a
+                JOIN Doctors d ON a.doctor_id = d.doctor_id
+                WHERE d.specialization = 'Cardiology'
+            )
+            LIMIT 10;"""
+        }
+    ]
 
-    test_database_performance(queries, db_name)
+    run_tests(queries, db_name)
 
 if __name__ == "__main__":
 
@@ -2,18 +2,49 @@
 Moduł zawierający funkcje testujące silniki baz danych
 """
 
+import os
 import time
 import csv
+import argparse
 import psutil
 import mysql.connector
-from pymongo import MongoClient
+from mysql.connector.conversion import MySQLConverter
+import bson
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from db_connections import get_mariadb_connection, get_mongodb_database, close_all
+from cache_control import CACHE_MODES, make_cold, engine_cache_size
+from latency_stats import summarize
+from resource_sampler import ResourceSampler
+from result_stream import ResultDigest
+from results_store import start_run, finish_run, current_run_id, save_record
+from result_integrity import INTEGRITY_CSV, verify_queries
+from query_registry import validate_queries, engine_queries, pair_speedups, category_geomeans
+from server_processes import process_snapshot, process_delta
+from server_counters import empty_server_counters, mariadb_status, mariadb_status_delta, mongodb_explain
+
+# Domyślna liczba przebiegów rozgrzewających i mierzonych dla każdego zapytania
+WARMUP_RUNS = 1
+MEASURED_RUNS = 5
+# Sposoby pobierania wyników:
+# stream - kursor strumieniowy, wiersze dekodowane na bieżąco,
+# buffered - cały wynik pobierany do pamięci klienta, dekodowany na końcu,
+# count - wiersze tylko zliczane, bez dekodowania (surowe bajty / RawBSONDocument)
+DRAIN_MODES = ['stream', 'buffered', 'count']
+MARIADB_FETCH_SIZE = 100
+# None - domyślny rozmiar paczki serwera MongoDB
+MONGODB_BATCH_SIZE = None
+SUMMARY_CSV = "query_summary.csv"
+SPEEDUP_CSV = "speedup_summary.csv"
+RESOURCE_SERIES_CSV = "resource_series.csv"
 
 def collect_system_stats():
-    """Funkcja zbierająca statystyki systemowe, w tym użycie dysku"""
+    """
+    Funkcja zbierająca statystyki systemowe, w tym użycie dysku.
+    Użycie CPU i pamięci w trakcie zapytania zbiera ResourceSampler.
+    """
     process = psutil.Process()
     stats = {
-        'cpu_percent': psutil.cpu_percent(interval=1),
-        'memory_percent': psutil.virtual_memory().percent,
         'write_bytes': process.io_counters().write_bytes,
         'disk_usage_percent': psutil.disk_usage('/').percent,
         'disk_total': psutil.disk_usage('/').total,
@@ -22,111 +53,456 @@ def collect_system_stats():
     }
     return stats
 
-def test_mariadb_query(database_name, query):
-    """Funkcja do testowania zapytań w MariaDB"""
+def empty_timings():
+    """
+    Funkcja zwracająca słownik z fazami pomiaru zapytania.
+    Czasy faz podawane są w nanosekundach (time.perf_counter_ns):
+    * connect_ns - uzyskanie połączenia,
+    * execute_ns - od wysłania zapytania do powrotu z execute/find/aggregate,
+    * first_row_ns - od wysłania zapytania do otrzymania pierwszego wiersza,
+    * drain_ns - pobieranie wszystkich wierszy (bez dekodowania),
+    * decode_ns - dekodowanie wierszy do typów Pythona po stronie klienta.
+    Wynik opisują liczba wierszy, bajtów i suma kontrolna (patrz ResultDigest).
+    """
+    return {
+        'query_time': None,
+        'connect_ns': 0,
+        'execute_ns': 0,
+        'first_row_ns': 0,
+        'drain_ns': 0,
+        'decode_ns': 0,
+        'rows': 0,
+        'result_bytes': 0,
+        'result_checksum': None
+    }
+
+def test_mariadb_query(database_name, query, pool_name=None, verbose=True, collect_counters=False,
+                       drain_mode='stream', fetch_size=MARIADB_FETCH_SIZE):
+    """
+    Funkcja do testowania zapytań w MariaDB.
+    Wiersze pobierane są w surowej postaci i dekodowane osobno,
+    dzięki czemu czas dekodowania po stronie klienta mierzony jest oddzielnie.
+    drain_mode wybiera sposób pobierania wyniku (patrz DRAIN_MODES) - dla
+    buffered cały wynik odczytywany jest już w execute, a fetch_size
+    określa liczbę wierszy pobieranych jednym fetchmany.
+    pool_name pozwala pobrać połączenie z wydzielonej puli (np. jednej na wątek).
+    Przy collect_counters=True do wyniku dodawane są przyrosty liczników
+    SHOW SESSION STATUS odczytane poza pomiarem czasu.
+    Zwraca słownik faz pomiaru (patrz empty_timings).
+    """
+    timings = empty_timings()
+    conn = None
     try:
-        conn = mysql.connector.connect(
-            host='localhost',
-            user='bot',
-            password='P@ssw0rd',
-            database=database_name
-        )
-        cursor = conn.cursor()
+        conn, timings['connect_ns'] = get_mariadb_connection(database_name, pool_name)
+        cursor = conn.cursor(raw=True, buffered=(drain_mode == 'buffered'))
+        converter = MySQLConverter(conn.charset, True)
+        if collect_counters:
+            status_overhead = mariadb_status(conn)
+            status_before = mariadb_status(conn)
 
-        start_time = time.time()
-        print(f"MariaDB: Executing query: {query}")
+        if verbose:
+            print(f"MariaDB: Executing query: {query}")
+        start_ns = time.perf_counter_ns()
         cursor.execute(query)
+        timings['execute_ns'] = time.perf_counter_ns() - start_ns
 
-        total_rows = 0
-        result = cursor.fetchmany(100)
+        fetch_ns = time.perf_counter_ns()
+        digest = ResultDigest()
+        result = cursor.fetchmany(fetch_size)
+        timings['first_row_ns'] = time.perf_counter_ns() - start_ns
         while result:
-            total_rows += len(result)
-            result = cursor.fetchmany(100)
+            for row in result:
+                digest.add_raw_row(row)
+            if drain_mode != 'count':
+                decode_start_ns = time.perf_counter_ns()
+                for row in result:
+                    converter.row_to_python(row, cursor.description)
+                timings['decode_ns'] += time.perf_counter_ns() - decode_start_ns
+            result = cursor.fetchmany(fetch_size)
 
-        end_time = time.time()
-        query_time = end_time - start_time
-        print(f"Query executed in {query_time} seconds. Total rows returned: {total_rows}")
+        end_ns = time.perf_counter_ns()
+        timings['drain_ns'] = end_ns - fetch_ns - timings['decode_ns']
+        timings['query_time'] = (end_ns - start_ns) / 1e9
+        timings.update(digest.result())
+        if verbose:
+            print(f"Query executed in {timings['query_time']} seconds. Total rows returned: {timings['rows']}")
 
-        cursor.close()
-        conn.close()
+        if collect_counters:
+            status_after = mariadb_status(conn)
+            overhead = {name: status_before[name] - status_overhead[name] for name in status_before}
+            timings.update(mariadb_status_delta(status_before, status_after, overhead))
 
-        return query_time
+        cursor.close()
 
     except mysql.connector.Error as err:
         print(f"MariaDB Error: {err}")
-        return None, 0
 
     except Exception as e:
         print(f"General error: {e}")
-        return None, 0
 
-def test_mongodb_query(database_name, collection_name, query=None, pipeline=None, projection=None):
+    finally:
+        # zwrócenie połączenia do puli
+        if conn is not None:
+            conn.close()
+
+    return timings
+
+def test_mongodb_query(database_name, collection_name, query=None, pipeline=None, projection=None,
+                       verbose=True, drain_mode='stream', batch_size=MONGODB_BATCH_SIZE):
     """
     Funkcja do testowania zapytań w MongoDB (z obsługą agregacji i klasycznych zapytań).
+    Dokumenty odbierane są jako RawBSONDocument i dekodowane osobno.
+    drain_mode wybiera sposób pobierania wyniku (patrz DRAIN_MODES) - dla
+    buffered wszystkie dokumenty trafiają najpierw do listy, a dla count
+    pozostają nierozkodowanym BSON. batch_size ustala rozmiar paczek kursora.
+    find() jest leniwe - zapytanie trafia do serwera dopiero przy pobraniu
+    pierwszego dokumentu, więc czas serwera widoczny jest w first_row_ns.
+    Zwraca słownik faz pomiaru (patrz empty_timings).
     """
+    timings = empty_timings()
     try:
-        client = MongoClient('mongodb://localhost:27017/', serverSelectionTimeoutMS=5000)
-        db = client[database_name]
-        collection = db[collection_name]
-
-        start_time = time.time()
+        db, timings['connect_ns'] = get_mongodb_database(database_name)
+        collection = db[collection_name].with_options(
+            codec_options=CodecOptions(document_class=RawBSONDocument)
+        )
 
-        if pipeline:
+        if not pipeline and not query:
+            raise ValueError("Either 'query' or 'pipeline' must be provided")
+        if verbose and pipeline:
             print(f"MongoDB: Executing aggregation pipeline on collection '{collection_name}'")
-            cursor = collection.aggregate(pipeline)
-        elif query:
+        elif verbose:
             print(f"MongoDB: Executing query on collection '{collection_name}': {query}")
-            cursor = collection.find(query, projection) if projection else collection.find(query)
-        else:
-            raise ValueError("Either 'query' or 'pipeline' must be provided")
 
-        all_results = [doc for doc in cursor]
+        batch_options = {'batchSize': batch_size} if batch_size else {}
+        start_ns = time.perf_counter_ns()
+        if pipeline:
+            cursor = collection.aggregate(pipeline, **batch_options)
+        else:
+            cursor = collection.find(query, projection) if projection else collection.find(query)
+            if batch_size:
+                cursor = cursor.batch_size(batch_size)
+        timings['execute_ns'] = time.perf_counter_ns() - start_ns
 
-        end_time = time.time()
-        query_time = end_time - start_time
-        print(f"Query executed in {query_time} seconds. Total fetched: {len(all_results)}")
+        fetch_ns = time.perf_counter_ns()
+        digest = ResultDigest()
+        documents = []
+        for doc in cursor:
+            if digest.rows == 0:
+                timings['first_row_ns'] = time.perf_counter_ns() - start_ns
+            digest.add_raw_document(doc.raw)
+            if drain_mode == 'stream':
+                decode_start_ns = time.perf_counter_ns()
+                bson.decode(doc.raw)
+                timings['decode_ns'] += time.perf_counter_ns() - decode_start_ns
+            elif drain_mode == 'buffered':
+                documents.append(doc)
 
-        client.close()
+        if documents:
+            decode_start_ns = time.perf_counter_ns()
+            for doc in documents:
+                bson.decode(doc.raw)
+            timings['decode_ns'] += time.perf_counter_ns() - decode_start_ns
 
-        return query_time
+        end_ns = time.perf_counter_ns()
+        timings['drain_ns'] = end_ns - fetch_ns - timings['decode_ns']
+        timings['query_time'] = (end_ns - start_ns) / 1e9
+        timings.update(digest.result())
+        if verbose:
+            print(f"Query executed in {timings['query_time']} seconds. Total fetched: {timings['rows']}")
 
     except Exception as e:
         print(f"Error: {e}")
-        return None
+
+    return timings
 
 def save_to_csv(data, filename="system_stats.csv"):
-    """Funkcja zapisująca wyniki do pliku CSV"""
+    """
+    Funkcja zapisująca wyniki do pliku CSV. W trakcie przebiegu (patrz
+    results_store.start_run) wiersz dostaje run_id i trafia także do tabeli
+    bazy wyników o nazwie pliku bez rozszerzenia.
+    """
+    run_id = current_run_id()
+    if run_id is not None:
+        data = {'run_id': run_id, **data}
+        save_record(os.path.splitext(os.path.basename(filename))[0], {
+            key: value for key, value in data.items() if key != 'run_id'
+        })
     with open(filename, mode='a', newline='') as file:
         writer = csv.DictWriter(file, fieldnames=data.keys())
         if file.tell() == 0:
             writer.writeheader()
         writer.writerow(data)
 
-def test_database_performance(queries, database_name):
-    """
-    Funkcja do testowania wydajności bazy danych.
-    Wykonuje zapytania do baz danych, zbiera statystyki systemowe
-    i zapisuje wynik w pliku CSV.
-    """
-
-    for query in queries['MariaDB']:
-        mariadb_query_time = test_mariadb_query(database_name, query)
-        system_stats = collect_system_stats()
-        system_stats['database'] = 'MariaDB'
-        system_stats['database_name'] = database_name  
-        system_stats['query_time'] = mariadb_query_time
-        save_to_csv(system_stats)
-
-    for query_set in queries['MongoDB']:
-        mongodb_query_time = test_mongodb_query(
-            database_name=database_name,
-            collection_name=query_set['collection'],
+def run_mongodb_query_set(database_name, query_set, verbose=True, drain_mode='stream',
+                          batch_size=MONGODB_BATCH_SIZE):
+    """Funkcja uruchamiająca zapytanie MongoDB opisane słownikiem z listy zapytań"""
+    return test_mongodb_query(
+        database_name=database_name,
+        collection_name=query_set['collection'],
+        query=query_set.get('query'),
+        pipeline=query_set.get('pipeline'),
+        projection=query_set.get('projection'),
+        verbose=verbose,
+        drain_mode=drain_mode,
+        batch_size=batch_size
+    )
+
+def run_mongodb_explain(database_name, query_set):
+    """Funkcja zbierająca statystyki explain dla zapytania MongoDB z listy zapytań"""
+    try:
+        db, _ = get_mongodb_database(database_name)
+        return mongodb_explain(
+            db,
+            query_set['collection'],
             query=query_set.get('query'),
             pipeline=query_set.get('pipeline'),
             projection=query_set.get('projection')
         )
-        system_stats = collect_system_stats()
-        system_stats['database'] = 'MongoDB'
-        system_stats['database_name'] = database_name  
-        system_stats['query_time'] = mongodb_query_time
-        save_to_csv(system_stats)
+    except Exception as e:
+        print(f"Explain error: {e}")
+        return {}
+
+def test_database_performance(queries, database_name, warmup=WARMUP_RUNS, repetitions=MEASURED_RUNS,
+                              server_counters=True, drain_mode='stream', fetch_size=MARIADB_FETCH_SIZE,
+                              batch_size=MONGODB_BATCH_SIZE, verify=False,
+                              cache_mode='warm'):
+    """
+    Funkcja do testowania wydajności bazy danych.
+    Wykonuje zapytania z rejestru queries (patrz query_registry) w obu
+    silnikach, zbiera statystyki systemowe i zapisuje wynik w pliku CSV.
+    Połączenia są współdzielone przez cały test, a dla każdego zapytania
+    zapisywane są czasy poszczególnych faz (patrz empty_timings).
+    Każde zapytanie wykonywane jest najpierw warmup razy bez zapisu,
+    a następnie repetitions razy z zapisem każdego pomiaru. Statystyki
+    z pomiarów zapisywane są w pliku SUMMARY_CSV.
+    W trakcie zapytania zasoby próbkowane są w tle - wartości średnie
+    i szczytowe trafiają do wiersza pomiaru, a pełny przebieg do
+    pliku RESOURCE_SERIES_CSV. Zużycie zasobów przez proces serwera
+    (mariadbd / mongod) zapisywane jest w kolumnach server_*.
+    Przy server_counters=True zapisywane są też liczniki pracy serwera:
+    przyrosty SHOW SESSION STATUS (mariadb_*) i explain executionStats (mongodb_*).
+    drain_mode, fetch_size i batch_size określają sposób pobierania wyników,
+    a decode_share to część czasu zapytania zajęta dekodowaniem po stronie klienta.
+    Na koniec dla każdej pary zapytań zapisywany jest stosunek median
+    MongoDB / MariaDB oraz średnie geometryczne dla kategorii (SPEEDUP_CSV).
+    Przy verify=True przed pomiarami porównywane są wyniki obu silników
+    (patrz test_result_integrity), a stosunki czasów zapisywane są
+    tylko dla par zwracających równoważne wyniki.
+    cache_mode (patrz CACHE_MODES) określa stan pamięci podręcznych: w trybie
+    warm zapytanie jest najpierw wykonywane warmup razy, a w trybie cold
+    przed każdym pomiarem serwer jest restartowany i opróżniany jest cache
+    stron systemu (patrz cache_control.make_cold). Tryb zapisywany jest
+    w kolumnie cache_mode razem z rozmiarem cache silnika (engine_cache_bytes).
+    """
+    validate_queries(queries)
+    equivalent = None
+    if verify:
+        equivalent = {row['query_id'] for row in test_result_integrity(queries, database_name)
+                      if row['status'] == 'equivalent'}
+    engines = [
+        ('MariaDB', lambda query: test_mariadb_query(
+            database_name, query, collect_counters=server_counters, drain_mode=drain_mode, fetch_size=fetch_size
+        )),
+        ('MongoDB', lambda query_set: run_mongodb_query_set(
+            database_name, query_set, drain_mode=drain_mode, batch_size=batch_size
+        ))
+    ]
+
+    if cache_mode == 'cold':
+        warmup = 0
+
+    summaries = []
+    for engine, run_query in engines:
+        cache_bytes = engine_cache_size(engine, database_name)
+        print(f"{engine}: cache mode {cache_mode}, engine cache size {cache_bytes} bytes")
+        for entry in engine_queries(queries, engine):
+            query = entry[engine]
+            for _ in range(warmup):
+                run_query(query)
+
+            # explain wykonuje zapytanie ponownie, więc statystyki MongoDB
+            # zbierane są raz na zapytanie, przed mierzonymi przebiegami
+            explain_counters = {}
+            if server_counters and engine == 'MongoDB':
+                explain_counters = run_mongodb_explain(database_name, query)
+
+            samples = []
+            for iteration in range(repetitions):
+                cold_start_time = make_cold(engine, database_name) if cache_mode == 'cold' else None
+                server_before = process_snapshot(engine)
+                with ResourceSampler() as sampler:
+                    timings = run_query(query)
+                server_after = process_snapshot(engine)
+                system_stats = collect_system_stats()
+                system_stats['database'] = engine
+                system_stats['database_name'] = database_name
+                system_stats['query_id'] = entry['id']
+                system_stats['category'] = entry['category']
+                system_stats['iteration'] = iteration
+                system_stats['cache_mode'] = cache_mode
+                system_stats['cold_start_time'] = cold_start_time
+                system_stats['drain_mode'] = drain_mode
+                system_stats['fetch_size'] = fetch_size if engine == 'MariaDB' else batch_size
+                system_stats.update(empty_server_counters())
+                system_stats.update(timings)
+                system_stats['decode_share'] = (
+                    timings['decode_ns'] / (timings['query_time'] * 1e9) if timings['query_time'] else None
+                )
+                system_stats.update(explain_counters)
+                system_stats.update(sampler.summary())
+                system_stats.update(process_delta(server_before, server_after))
+                save_to_csv(system_stats)
+                samples.append(timings['query_time'])
+
+                for sample in sampler.samples:
+                    save_to_csv({
+                        'database': engine,
+                        'database_name': database_name,
+                        'query_id': entry['id'],
+                        'iteration': iteration,
+                        **sample
+                    }, RESOURCE_SERIES_CSV)
+
+            summary = {
+                'database': engine,
+                'database_name': database_name,
+                'query_id': entry['id'],
+                'category': entry['category'],
+                'cache_mode': cache_mode,
+                'engine_cache_bytes': cache_bytes,
+                'drain_mode': drain_mode,
+                'warmup': warmup
+            }
+            summary.update(summarize(samples))
+            print(f"{engine} query {entry['id']}: median {summary['median']} s, p95 {summary['p95']} s")
+            save_to_csv(summary, SUMMARY_CSV)
+            summaries.append(summary)
+
+    close_all()
+
+    speedups = pair_speedups(summaries, equivalent)
+    for pair in speedups:
+        save_to_csv({'database_name': database_name, 'cache_mode': cache_mode, 'row_type': 'pair', **pair},
+                    SPEEDUP_CSV)
+    for category in category_geomeans(speedups):
+        print(f"{category['category']}: MongoDB/MariaDB median time ratio {category['geomean_speedup']:.2f} "
+              f"({category['pairs']} pairs)")
+        save_to_csv({
+            'database_name': database_name,
+            'cache_mode': cache_mode,
+            'row_type': 'category',
+            'query_id': None,
+            'category': category['category'],
+            'mariadb_median': None,
+            'mongodb_median': None,
+            'speedup': category['geomean_speedup']
+        }, SPEEDUP_CSV)
+
+def test_result_integrity(queries, database_name):
+    """
+    Funkcja sprawdzająca, czy pary zapytań zwracają w obu silnikach ten sam wynik.
+    Dla każdego zapytania liczony jest odcisk znormalizowanego wyniku niezależny
+    od kolejności wierszy (patrz result_integrity), a status pary zapisywany
+    jest w pliku INTEGRITY_CSV. Zwraca listę zapisanych wierszy.
+    """
+    validate_queries(queries)
+    results = verify_queries(queries, database_name)
+    for row in results:
+        save_to_csv(row, INTEGRITY_CSV)
+    mismatched = [row['query_id'] for row in results if row['status'] not in ('equivalent', 'unpaired')]
+    if mismatched:
+        print(f"Pairs returning different results: {', '.join(mismatched)}")
+    close_all()
+    return results
+
+def run_tests(queries, database_name, argv=None):
+    """
+    Funkcja uruchamiająca testy z parametrami podanymi w linii poleceń.
+    Tryb sequential mierzy pojedyncze zapytania, tryb load wykonuje
+    test obciążeniowy z wieloma równoległymi klientami (moduł load_test),
+    a tryb open-loop wysyła zapytania z zadaną częstotliwością (moduł open_loop).
+    Tryb verify tylko porównuje wyniki obu silników (test_result_integrity),
+    a tryb write mierzy zapisy przy różnych ustawieniach trwałości (moduł write_benchmark).
+    Tryb oltp wykonuje równoległe transakcje odczytu i zapisu (moduł oltp_workload),
+    a tryb advise proponuje i mierzy brakujące indeksy (moduł index_advisor).
+    """
+    # import wewnątrz funkcji - moduły testów obciążeniowych korzystają z funkcji tego modułu
+    from load_test import CLIENT_COUNTS, LOAD_DURATION, test_load_performance
+    from open_loop import ARRIVAL_RATES, test_open_loop_performance
+    from write_benchmark import WRITE_ROWS, BATCH_SIZES, FLUSH_LOG_VALUES, WRITE_CONCERNS, test_write_performance
+    from oltp_workload import READ_RATIOS, HOT_APPOINTMENTS, test_oltp_performance
+    from index_advisor import test_index_advice
+
+    parser = argparse.ArgumentParser(description=f"Test wydajności bazy {database_name}")
+    parser.add_argument('--mode', choices=['sequential', 'load', 'open-loop', 'verify', 'write', 'oltp', 'advise'], default='sequential',
+                        help="rodzaj testu")
+    parser.add_argument('--warmup', type=int, default=WARMUP_RUNS,
+                        help="liczba przebiegów rozgrzewających na zapytanie")
+    parser.add_argument('--repetitions', type=int, default=MEASURED_RUNS,
+                        help="liczba mierzonych przebiegów na zapytanie")
+    parser.add_argument('--cache-mode', choices=CACHE_MODES, default='warm',
+                        help="warm - przebiegi rozgrzewające przed pomiarami, cold - restart serwera "
+                             "i opróżnienie cache przed każdym pomiarem (wymaga roota)")
+    parser.add_argument('--drain-mode', choices=DRAIN_MODES, default='stream',
+                        help="sposób pobierania wyników w trybie sequential")
+    parser.add_argument('--fetch-size', type=int, default=MARIADB_FETCH_SIZE,
+                        help="liczba wierszy pobieranych jednym fetchmany w MariaDB")
+    parser.add_argument('--batch-size', type=int, default=MONGODB_BATCH_SIZE,
+                        help="rozmiar paczki kursora MongoDB (domyślnie ustalany przez serwer)")
+    parser.add_argument('--no-server-counters', dest='server_counters', action='store_false',
+                        help="nie zbieraj SHOW SESSION STATUS i explain w trybie sequential")
+    parser.add_argument('--verify', action='store_true',
+                        help="w trybie sequential zapisz stosunki czasów tylko dla par o równoważnych wynikach")
+    parser.add_argument('--dataset-label', default=None,
+                        help="opis zbioru danych zapisywany z przebiegiem, np. parametry generatora (uniform, zipf-1.1)")
+    parser.add_argument('--clients', type=int, nargs='+', default=CLIENT_COUNTS,
+                        help="liczby równoległych klientów w trybach load i oltp")
+    parser.add_argument('--duration', type=float, default=LOAD_DURATION,
+                        help="czas pomiaru w sekundach dla każdego poziomu obciążenia w trybach load, open-loop i oltp")
+    parser.add_argument('--workers', choices=['thread', 'process'], default='thread',
+                        help="czy klienci w trybie load są wątkami czy procesami")
+    parser.add_argument('--rates', type=float, nargs='+', default=ARRIVAL_RATES,
+                        help="częstotliwości zapytań (zapytania/s) w trybie open-loop")
+    parser.add_argument('--arrival', choices=['constant', 'poisson'], default='constant',
+                        help="rozkład odstępów między zapytaniami w trybie open-loop")
+    parser.add_argument('--write-rows', type=int, default=WRITE_ROWS,
+                        help="liczba wierszy na operację w trybie write")
+    parser.add_argument('--write-batch-sizes', type=int, nargs='+', default=BATCH_SIZES,
+                        help="rozmiary paczek (wierszy na transakcję) w trybie write")
+    parser.add_argument('--flush-log', type=int, nargs='+', choices=[0, 1, 2], default=FLUSH_LOG_VALUES,
+                        help="badane wartości innodb_flush_log_at_trx_commit w trybie write (wymaga SUPER)")
+    parser.add_argument('--write-concerns', nargs='+', choices=list(WRITE_CONCERNS), default=list(WRITE_CONCERNS),
+                        help="badane poziomy write concern MongoDB w trybie write")
+    parser.add_argument('--read-ratios', type=float, nargs='+', default=READ_RATIOS,
+                        help="udziały transakcji odczytu w trybie oltp (0.8 = 80%% odczytów, 20%% zapisów)")
+    parser.add_argument('--hot-appointments', type=int, default=HOT_APPOINTMENTS,
+                        help="liczba wizyt, których status zmieniają transakcje w trybie oltp (mniej - większa rywalizacja)")
+    args = parser.parse_args(argv)
+
+    # wszystkie wiersze wyników dostają run_id i trafiają do bazy wyników (results_store)
+    start_run(database_name, args.mode, {**vars(args), 'queries': [entry['id'] for entry in queries]})
+    try:
+        if args.mode == 'load':
+            test_load_performance(queries, database_name, client_counts=args.clients,
+                                  duration=args.duration, worker_type=args.workers)
+        elif args.mode == 'verify':
+            test_result_integrity(queries, database_name)
+        elif args.mode == 'write':
+            test_write_performance(database_name, rows=args.write_rows, batch_sizes=args.write_batch_sizes,
+                                   flush_log_values=args.flush_log, write_concerns=args.write_concerns)
+        elif args.mode == 'advise':
+            validate_queries(queries)
+            test_index_advice(queries, database_name, warmup=args.warmup, repetitions=args.repetitions)
+        elif args.mode == 'oltp':
+            test_oltp_performance(database_name, client_counts=args.clients, read_ratios=args.read_ratios,
+                                  duration=args.duration, hot_rows=args.hot_appointments)
+        elif args.mode == 'open-loop':
+            test_open_loop_performance(queries, database_name, rates=args.rates,
+                                       duration=args.duration, arrival=args.arrival)
+        else:
+            test_database_performance(queries, database_name, warmup=args.warmup, repetitions=args.repetitions,
+                                      server_counters=args.server_counters, drain_mode=args.drain_mode,
+                                      fetch_size=args.fetch_size, batch_size=args.batch_size,
+                                      verify=args.verify, cache_mode=args.cache_mode)
+    finally:
+        finish_run()
@@ -0,0 +1,365 @@
+"""
+Moduł testu zapisu - wstawianie, modyfikacja i usuwanie wierszy przy różnych ustawieniach trwałości zapisu
+"""
+
+import time
+import random
+import datetime
+import mysql.connector
+from pymongo import ASCENDING
+from pymongo.write_concern import WriteConcern
+from db_connections import get_mariadb_connection, get_mongodb_database, close_all
+from testing_functions import save_to_csv
+from latency_stats import summarize, percentile
+
+# Domyślna liczba wierszy na operację i badane rozmiary paczek (wierszy w jednej transakcji)
+WRITE_ROWS = 10000
+BATCH_SIZES = [1, 100, 1000]
+# Badane wartości innodb_flush_log_at_trx_commit: 1 - zapis i fsync logu przy każdym commit,
+# 2 - zapis przy commit i fsync raz na sekundę, 0 - zapis i fsync raz na sekundę
+FLUSH_LOG_VALUES = [1, 2, 0]
+# Badane poziomy write concern MongoDB (j - potwierdzenie po zapisie do dziennika)
+WRITE_CONCERNS = {
+    'w1': {'w': 1, 'j': False},
+    'w1_journal': {'w': 1, 'j': True},
+    'majority_journal': {'w': 'majority', 'j': True}
+}
+# Wiersze wstawiane przez test mają daty od tej chwili - po nich są odnajdywane i usuwane
+WRITE_MARKER = datetime.datetime(2100, 1, 1)
+REFERENCE_LIMIT = 1000
+WRITE_SEED = 2024
+WRITE_CSV = "write_stats.csv"
+
+def appointment_row(index, references, rng):
+    """Funkcja zwracająca wizytę wstawianą przez test (unikalna data dla każdego wiersza)"""
+    return {
+        'doctor_id': rng.choice(references['doctor_id']),
+        'patient_id': rng.choice(references['patient_id']),
+        'appointment_date': (WRITE_MARKER + datetime.timedelta(minutes=index)).strftime('%Y-%m-%d %H:%M:%S'),
+        'appointment_status': 'scheduled',
+        'diagnosis': 'Benchmark',
+        'treatment': 'Benchmark'
+    }
+
+def trip_row(index, references, rng):
+    """Funkcja zwracająca przejazd dopisywany przez test"""
+    start = WRITE_MARKER + datetime.timedelta(seconds=index)
+    duration = rng.randint(60, 3600)
+    return {
+        'tripduration': duration,
+        'starttime': start.strftime('%Y-%m-%d %H:%M:%S'),
+        'stoptime': (start + datetime.timedelta(seconds=duration)).strftime('%Y-%m-%d %H:%M:%S'),
+        'start_station_id': rng.choice(references['station_id']),
+        'end_station_id': rng.choice(references['station_id']),
+        'bikeid': rng.randint(10000, 40000),
+        'birth_year': rng.randint(1950, 2005),
+        'gender': rng.randint(0, 2),
+        'usertype': rng.choice(['Subscriber', 'Customer'])
+    }
+
+# Obciążenia zapisu dla poszczególnych baz:
+# insert/delete - wstawienie wierszy i ich usunięcie (tabela wraca do stanu wyjściowego),
+# update - dwukrotna zmiana kolumny statusu (status_column = 1 - status_column) tych samych wierszy
+WRITE_WORKLOADS = {
+    'Doctors_Appointments': {
+        'table': 'Appointments',
+        'primary_key': 'appointment_id',
+        'operations': ['insert', 'delete'],
+        'marker_column': 'appointment_date',
+        'references': {'doctor_id': ('Doctors', 'doctor_id'), 'patient_id': ('Patients', 'patient_id')},
+        'row': appointment_row
+    },
+    'Bikes': {
+        'table': 'TripUsers',
+        'primary_key': 'trip_id',
+        'operations': ['insert', 'delete'],
+        'marker_column': 'starttime',
+        'references': {'station_id': ('Stations', 'station_id')},
+        'row': trip_row
+    },
+    'Airports': {
+        'table': 'Flights',
+        'primary_key': 'FLIGHT_ID',
+        'operations': ['update'],
+        'status_column': 'CANCELLED'
+    }
+}
+
+def batches(items, batch_size):
+    """Funkcja dzieląca listę na kolejne paczki po batch_size elementów"""
+    return [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+
+def generate_rows(workload, references, rows):
+    """Funkcja generująca wiersze do wstawienia (ten sam seed - te same dane w obu silnikach)"""
+    rng = random.Random(WRITE_SEED)
+    return [workload['row'](index, references, rng) for index in range(rows)]
+
+def write_stats(engine, database_name, workload, operation, rows, latencies, commit_latencies, elapsed, settings):
+    """Funkcja tworząca wiersz wyników jednej operacji: przepustowość i rozkład czasów transakcji"""
+    stats = {
+        'database': engine,
+        'database_name': database_name,
+        'table': workload['table'],
+        'operation': operation,
+        'batch_size': settings['batch_size'],
+        'autocommit': settings.get('autocommit'),
+        'flush_log_at_trx_commit': settings.get('flush_log_at_trx_commit'),
+        'write_concern': settings.get('write_concern'),
+        'rows': rows,
+        'transactions': len(latencies),
+        'duration': elapsed,
+        'rows_per_s': rows / elapsed if elapsed > 0 else 0.0
+    }
+    stats.update(summarize(latencies))
+    # czas samego polecenia COMMIT (tylko MariaDB z autocommit=0)
+    for p in (50, 95, 99):
+        stats[f'commit_p{p}'] = percentile(commit_latencies, p) if commit_latencies else None
+    return stats
+
+def mariadb_flush_log(cursor):
+    """Funkcja zwracająca bieżącą wartość innodb_flush_log_at_trx_commit"""
+    cursor.execute("SELECT @@GLOBAL.innodb_flush_log_at_trx_commit")
+    return int(cursor.fetchone()[0])
+
+def mariadb_set_flush_log(cursor, value):
+    """
+    Funkcja ustawiająca innodb_flush_log_at_trx_commit (wymaga uprawnienia SUPER).
+    Brak uprawnień nie przerywa testu - zwracana jest rzeczywista wartość,
+    która trafia do wyników.
+    """
+    try:
+        cursor.execute(f"SET GLOBAL innodb_flush_log_at_trx_commit = {int(value)}")
+    except mysql.connector.Error as err:
+        print(f"MariaDB Warning: cannot set innodb_flush_log_at_trx_commit = {value}: {err}")
+    return mariadb_flush_log(cursor)
+
+def mariadb_references(cursor, workload):
+    """Funkcja pobierająca identyfikatory wierszy, do których odwołują się wstawiane wiersze"""
+    references = {}
+    for key, (table, column) in workload.get('references', {}).items():
+        cursor.execute(f"SELECT `{column}` FROM `{table}` LIMIT {REFERENCE_LIMIT}")
+        references[key] = [row[0] for row in cursor.fetchall()]
+        if not references[key]:
+            raise ValueError(f"MariaDB: table {table} is empty, load the data first")
+    return references
+
+def mariadb_targets(cursor, workload, rows=None):
+    """
+    Funkcja zwracająca klucze wierszy modyfikowanych lub usuwanych przez test:
+    wierszy wstawionych przez test (rows=None) lub pierwszych rows wierszy tabeli.
+    """
+    table, key = workload['table'], workload['primary_key']
+    if rows is None:
+        cursor.execute(f"SELECT `{key}` FROM `{table}` WHERE `{workload['marker_column']}` >= %s ORDER BY `{key}`",
+                       (WRITE_MARKER,))
+    else:
+        cursor.execute(f"SELECT `{key}` FROM `{table}` ORDER BY `{key}` LIMIT {int(rows)}")
+    return [row[0] for row in cursor.fetchall()]
+
+def mariadb_statement(workload, operation, batch):
+    """Funkcja budująca polecenie SQL (z parametrami) dla jednej paczki wierszy lub kluczy"""
+    table, key = workload['table'], workload['primary_key']
+    placeholders = ', '.join(['%s'] * len(batch))
+    if operation == 'insert':
+        columns = list(batch[0])
+        row_placeholders = '(' + ', '.join(['%s'] * len(columns)) + ')'
+        return (f"INSERT INTO `{table}` ({', '.join(f'`{column}`' for column in columns)}) "
+                f"VALUES {', '.join([row_placeholders] * len(batch))}",
+                [row[column] for row in batch for column in columns])
+    if operation == 'delete':
+        return f"DELETE FROM `{table}` WHERE `{key}` IN ({placeholders})", batch
+    status = workload['status_column']
+    return f"UPDATE `{table}` SET `{status}` = 1 - `{status}` WHERE `{key}` IN ({placeholders})", batch
+
+def operation_batches(operation, items, batch_size):
+    """
+    Funkcja dzieląca wiersze lub klucze operacji na paczki. Zmiana statusu
+    wykonywana jest dwukrotnie dla tych samych paczek, co przywraca stan wierszy.
+    """
+    if operation == 'update':
+        return batches(items, batch_size) * 2
+    return batches(items, batch_size)
+
+def run_mariadb_operation(conn, workload, operation, batch_list, autocommit):
+    """
+    Funkcja wykonująca jedną operację zapisu w MariaDB. Każda paczka jest
+    jednym poleceniem - przy autocommit=1 zatwierdzanym przez serwer,
+    przy autocommit=0 w jawnie zatwierdzanej transakcji.
+    Zwraca krotkę (czasy transakcji, czasy COMMIT, czas całkowity).
+    Transakcja zakończona błędem jest wycofywana, a jej czas ma wartość None.
+    """
+    cursor = conn.cursor()
+    latencies, commit_latencies = [], []
+    start = time.perf_counter()
+    for batch in batch_list:
+        statement, params = mariadb_statement(workload, operation, batch)
+        transaction_start = time.perf_counter()
+        try:
+            cursor.execute(statement, params)
+            if not autocommit:
+                commit_start = time.perf_counter()
+                conn.commit()
+                commit_latencies.append(time.perf_counter() - commit_start)
+            latencies.append(time.perf_counter() - transaction_start)
+        except mysql.connector.Error as err:
+            print(f"MariaDB Error: {err}")
+            conn.rollback()
+            latencies.append(None)
+    elapsed = time.perf_counter() - start
+    cursor.close()
+    return latencies, commit_latencies, elapsed
+
+def run_mariadb_workload(database_name, workload, rows, batch_size, autocommit, flush_log):
+    """
+    Funkcja wykonująca wszystkie operacje obciążenia zapisu w MariaDB
+    dla jednego ustawienia. Przy autocommit=1 każdy wiersz jest osobną
+    transakcją (batch_size jest pomijany). Wiersze pozostałe po przerwanym
+    teście są usuwane przed pomiarem. Zwraca listę wierszy wyników.
+    """
+    conn, _ = get_mariadb_connection(database_name, f"{database_name}_write", pool_size=1)
+    conn.autocommit = True
+    cursor = conn.cursor()
+    if 'insert' in workload['operations']:
+        cursor.execute(f"DELETE FROM `{workload['table']}` WHERE `{workload['marker_column']}` >= %s",
+                       (WRITE_MARKER,))
+        references = mariadb_references(cursor, workload)
+    conn.autocommit = bool(autocommit)
+
+    batch_size = 1 if autocommit else batch_size
+    settings = {'batch_size': batch_size, 'autocommit': autocommit, 'flush_log_at_trx_commit': flush_log}
+    results = []
+    for operation in workload['operations']:
+        if operation == 'insert':
+            items = generate_rows(workload, references, rows)
+        elif operation == 'delete':
+            items = mariadb_targets(cursor, workload)
+        else:
+            items = mariadb_targets(cursor, workload, rows)
+        batch_list = operation_batches(operation, items, batch_size)
+        latencies, commit_latencies, elapsed = run_mariadb_operation(conn, workload, operation, batch_list,
+                                                                     autocommit)
+        results.append(write_stats('MariaDB', database_name, workload, operation,
+                                   sum(len(batch) for batch in batch_list),
+                                   latencies, commit_latencies, elapsed, settings))
+    cursor.close()
+    conn.autocommit = True
+    conn.close()
+    return results
+
+def mongodb_references(db, workload):
+    """Funkcja pobierająca identyfikatory dokumentów, do których odwołują się wstawiane dokumenty"""
+    references = {}
+    for key, (collection, field) in workload.get('references', {}).items():
+        references[key] = [document[field] for document in
+                           db[collection].find({}, {field: 1, '_id': 0}).limit(REFERENCE_LIMIT) if field in document]
+        if not references[key]:
+            raise ValueError(f"MongoDB: collection {collection} is empty, load the data first")
+    return references
+
+def mongodb_targets(collection, workload, rows=None):
+    """Funkcja zwracająca _id dokumentów modyfikowanych lub usuwanych przez test (jak mariadb_targets)"""
+    if rows is None:
+        cursor = collection.find({workload['marker_column']: {'$gte': WRITE_MARKER.strftime('%Y-%m-%d %H:%M:%S')}},
+                                 {'_id': 1})
+    else:
+        cursor = collection.find({}, {'_id': 1}).sort('_id', ASCENDING).limit(int(rows))
+    return [document['_id'] for document in cursor]
+
+def run_mongodb_operation(collection, workload, operation, batch_list):
+    """
+    Funkcja wykonująca jedną operację zapisu w MongoDB - jedno polecenie
+    (insert_many, update_many lub delete_many) na paczkę dokumentów.
+    Czas polecenia obejmuje potwierdzenie zgodne z write concern kolekcji.
+    Zwraca krotkę (czasy poleceń, czas całkowity).
+    """
+    status = workload.get('status_column')
+    latencies = []
+    start = time.perf_counter()
+    for batch in batch_list:
+        operation_start = time.perf_counter()
+        try:
+            if operation == 'insert':
+                # insert_many dopisuje _id do dokumentów - wstawiane są kopie
+                collection.insert_many([dict(document) for document in batch])
+            elif operation == 'delete':
+                collection.delete_many({'_id': {'$in': batch}})
+            else:
+                collection.update_many({'_id': {'$in': batch}},
+                                       [{'$set': {status: {'$subtract': [1, f'${status}']}}}])
+            latencies.append(time.perf_counter() - operation_start)
+        except Exception as e:
+            print(f"MongoDB Error: {e}")
+            latencies.append(None)
+    return latencies, time.perf_counter() - start
+
+def run_mongodb_workload(database_name, workload, rows, batch_size, write_concern):
+    """
+    Funkcja wykonująca wszystkie operacje obciążenia zapisu w MongoDB
+    z podanym write concern (klucz WRITE_CONCERNS). Zwraca listę wierszy wyników.
+    """
+    db, _ = get_mongodb_database(database_name)
+    collection = db.get_collection(workload['table'], write_concern=WriteConcern(**WRITE_CONCERNS[write_concern]))
+    if 'insert' in workload['operations']:
+        collection.delete_many({workload['marker_column']: {'$gte': WRITE_MARKER.strftime('%Y-%m-%d %H:%M:%S')}})
+        references = mongodb_references(db, workload)
+
+    settings = {'batch_size': batch_size, 'write_concern': write_concern}
+    results = []
+    for operation in workload['operations']:
+        if operation == 'insert':
+            items = generate_rows(workload, references, rows)
+        elif operation == 'delete':
+            items = mongodb_targets(collection, workload)
+        else:
+            items = mongodb_targets(collection, workload, rows)
+        batch_list = operation_batches(operation, items, batch_size)
+        latencies, elapsed = run_mongodb_operation(collection, workload, operation, batch_list)
+        results.append(write_stats('MongoDB', database_name, workload, operation,
+                                   sum(len(batch) for batch in batch_list), latencies, [], elapsed, settings))
+    return results
+
+def print_write_stats(stats):
+    """Funkcja wypisująca podsumowanie jednej operacji zapisu"""
+    if stats['database'] == 'MariaDB':
+        setting = f"flush_log_at_trx_commit={stats['flush_log_at_trx_commit']}, autocommit={stats['autocommit']}"
+    else:
+        setting = f"write concern {stats['write_concern']}"
+    print(f"{stats['database']} {stats['operation']} ({setting}, batch {stats['batch_size']}): "
+          f"{stats['rows_per_s']:.0f} rows/s, p50 {stats['median']} s, p99 {stats['p99']} s, "
+          f"errors {stats['errors']}")
+
+def test_write_performance(database_name, rows=WRITE_ROWS, batch_sizes=BATCH_SIZES,
+                           flush_log_values=FLUSH_LOG_VALUES, write_concerns=WRITE_CONCERNS):
+    """
+    Funkcja do testowania wydajności zapisu. Dla MariaDB wykonuje obciążenie
+    bazy (WRITE_WORKLOADS) dla każdej wartości innodb_flush_log_at_trx_commit
+    z autocommit=1 (wiersz po wierszu) oraz z autocommit=0 dla każdego
+    rozmiaru paczki, a dla MongoDB - dla każdego write concern i rozmiaru
+    paczki. Pierwotna wartość innodb_flush_log_at_trx_commit jest
+    przywracana po teście. Wyniki zapisywane są w pliku WRITE_CSV.
+    """
+    workload = WRITE_WORKLOADS.get(database_name)
+    if workload is None:
+        raise ValueError(f"No write workload for database {database_name}")
+
+    conn, _ = get_mariadb_connection(database_name)
+    cursor = conn.cursor()
+    original_flush_log = mariadb_flush_log(cursor)
+    try:
+        for value in flush_log_values:
+            flush_log = mariadb_set_flush_log(cursor, value)
+            for autocommit, batch_size in [(1, 1)] + [(0, batch_size) for batch_size in batch_sizes]:
+                for stats in run_mariadb_workload(database_name, workload, rows, batch_size, autocommit, flush_log):
+                    print_write_stats(stats)
+                    save_to_csv(stats, WRITE_CSV)
+    finally:
+        mariadb_set_flush_log(cursor, original_flush_log)
+        cursor.close()
+        conn.close()
+
+    for write_concern in write_concerns:
+        for batch_size in batch_sizes:
+            for stats in run_mongodb_workload(database_name, workload, rows, batch_size, write_concern):
+                print_write_stats(stats)
+                save_to_csv(stats, WRITE_CSV)
+    close_all()
@@ -27,7 +27,7 @@ source .venv/bin/activate
 # Instalacja zależności
 echo "Instalacja zależności..."
 pip install --upgrade pip
-pip install pandas pymongo psutil mysql-connector-python openpyxl
+pip install pandas pymongo psutil mysql-connector-python openpyxl aiomysql pyarrow
 
 # Sprawdzenie instalacji zależności
 if [ $? -eq 0 ]; then
@@ -49,6 +49,8 @@ if [ ${#test_files[@]} -eq 0 ]; then
 fi
 
 echo "Znaleziono następujące testy: ${test_files[*]}"
+# Czas rozpoczęcia serii - do eksportu przebiegów z bazy wyników
+series_start=$(date +%Y-%m-%dT%H:%M:%S)
 for test_file in "${test_files[@]}"; do
     echo "Uruchamianie testu: $test_file"
     python3 "$test_file"
@@ -61,8 +63,9 @@ for test_file in "${test_files[@]}"; do
     fi
 done
 
-# Uruchomienie importu csv do xlsx
-python3 ./csv_to_xlsx.py
+# Uruchomienie eksportu wyników do xlsx i parquet
+python3 ./csv_to_xlsx.py --since "$series_start"
+python3 ./db_tests/results_store.py
 
 # Dezaktywacja środowiska wirtualnego
 deactivate